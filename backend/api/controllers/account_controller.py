@@ -1,6 +1,7 @@
 from flask import request, jsonify, g
 from werkzeug.exceptions import BadRequest, NotFound
-from backend.models import Account, db
+from backend.models import Account, Transaction, User, db
+from backend.services.analyzers.recurring_series import refresh_recurring_series
 
 def get_accounts():
     """Get all accounts for the authenticated user."""
@@ -71,6 +72,7 @@ def create_account():
         )
         
         db.session.add(new_account)
+        User.bump_data_version(g.user_id)
         db.session.commit()
         
         return jsonify({
@@ -114,6 +116,7 @@ def update_account(account_id):
         if 'is_active' in data:
             account.is_active = data['is_active']
         
+        User.bump_data_version(g.user_id)
         db.session.commit()
         
         return jsonify({
@@ -141,7 +144,17 @@ def delete_account(account_id):
         if not account:
             raise NotFound("Account not found")
         
+        # Series that lose transactions along with the account
+        series_ids = [
+            series_id for (series_id,) in db.session.query(Transaction.recurring_series_id).filter(
+                Transaction.account_id == account.id,
+                Transaction.recurring_series_id.isnot(None)
+            ).distinct()
+        ]
+        
         db.session.delete(account)
+        refresh_recurring_series(series_ids)
+        User.bump_data_version(g.user_id)
         db.session.commit()
         
         return jsonify({'message': 'Account deleted successfully'}), 200
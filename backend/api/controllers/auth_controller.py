@@ -1,10 +1,10 @@
 from flask import request, jsonify, g
-from werkzeug.exceptions import BadRequest, Unauthorized
-import jwt
+from werkzeug.exceptions import BadRequest
 import datetime
-import os
 import re
 from backend.models import User, db
+from backend.services.cache.token_cache import token_cache
+from backend.services.auth.password_hasher import HashingBusy
 import logging  
 
 
@@ -107,6 +107,9 @@ def register_user():
         
     except BadRequest as e:
         return jsonify({"error": str(e)}), 400
+    except HashingBusy as e:
+        db.session.rollback()
+        return jsonify({"error": e.description}), 503
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": "Server error", "details": str(e)}), 500
@@ -116,14 +119,6 @@ import logging
 def login_user():
     """Authenticate a user and return a token."""
     try:
-        # Log the full request details for debugging
-        logging.info(f"Received login request")
-        logging.info(f"Request headers: {request.headers}")
-        logging.info(f"Request method: {request.method}")
-        
-        # Print request data for debugging
-        print("Request data:", request.get_json())
-        
         # Handle potential JSON parsing errors
         try:
             data = request.get_json()
@@ -160,6 +155,11 @@ def login_user():
             logging.warning(f"Invalid password attempt for user: {username}")
             return jsonify({"error": "Invalid credentials"}), 401
         
+        # Upgrade hashes made with outdated parameters while the password is at hand
+        if user.needs_rehash():
+            user.set_password(password)
+            db.session.commit()
+        
         # Generate token
         token = generate_auth_token(user.id)
         
@@ -177,10 +177,13 @@ def login_user():
             }
         }), 200
         
+    except HashingBusy as e:
+        db.session.rollback()
+        logging.warning("Login rejected, password hashing queue is full")
+        return jsonify({"error": e.description}), 503
     except Exception as e:
         # Comprehensive error logging
         logging.error(f"Unexpected login error: {str(e)}")
-        print(f"Full login error details: {str(e)}")
         return jsonify({"error": "Server error", "details": str(e)}), 500
 
 def generate_auth_token(user_id):
@@ -190,25 +193,16 @@ def generate_auth_token(user_id):
         'iat': datetime.datetime.utcnow(),
         'sub': user_id
     }
-    return jwt.encode(
-        payload,
-        os.getenv('JWT_SECRET_KEY', 'dev_key'),
-        algorithm='HS256'
-    )
+    return token_cache.encode(payload)
 
 def authenticate_token(token):
-    """Verify and decode a JWT token."""
-    try:
-        payload = jwt.decode(
-            token,
-            os.getenv('JWT_SECRET_KEY', 'dev_key'),
-            algorithms=['HS256']
-        )
-        return payload['sub']  # User ID
-    except jwt.ExpiredSignatureError:
-        raise Unauthorized("Token expired. Please log in again.")
-    except jwt.InvalidTokenError:
-        raise Unauthorized("Invalid token. Please log in again.")
+    """Verify a JWT token and return its user ID, using the verified-token cache."""
+    return token_cache.verify(token)
+
+def logout_user():
+    """Revoke the token used for this request."""
+    token_cache.revoke(g.auth_token)
+    return jsonify({'message': 'Logged out successfully'}), 200
 
 def get_user_profile():
     """Retrieve the current user's profile information."""
@@ -306,6 +300,9 @@ def change_user_password():
         
         return jsonify({'message': 'Password changed successfully'}), 200
     
+    except HashingBusy as e:
+        db.session.rollback()
+        return jsonify({'error': e.description}), 503
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Failed to change password', 'details': str(e)}), 500
\ No newline at end of file
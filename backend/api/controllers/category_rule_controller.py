@@ -0,0 +1,118 @@
+from flask import request, jsonify, g
+from werkzeug.exceptions import BadRequest, NotFound
+from backend.models import Category, CategoryRule, User, db
+from backend.services.importers.transaction_importer import normalize_description
+
+def _serialize_rule(rule):
+    """Convert a category rule to its JSON format."""
+    return {
+        'id': rule.id,
+        'pattern': rule.pattern,
+        'category_id': rule.category_id,
+        'created_at': rule.created_at.isoformat(),
+        'updated_at': rule.updated_at.isoformat()
+    }
+
+def _validate_pattern(pattern):
+    """Return a rule pattern, rejecting ones that are empty once normalized."""
+    if not isinstance(pattern, str) or not normalize_description(pattern):
+        raise BadRequest("Pattern must be a non-empty string")
+    return pattern.strip()
+
+def _validate_category(category_id):
+    """Check that a category belongs to the authenticated user."""
+    if not Category.query.filter_by(id=category_id, user_id=g.user_id).first():
+        raise BadRequest("Invalid category ID")
+    return category_id
+
+def get_category_rules():
+    """Get all merchant categorization rules for the authenticated user."""
+    try:
+        rules = CategoryRule.query.filter_by(user_id=g.user_id).order_by(
+            CategoryRule.created_at, CategoryRule.id
+        ).all()
+        
+        return jsonify({'rules': [_serialize_rule(rule) for rule in rules]}), 200
+    
+    except Exception as e:
+        return jsonify({'error': 'Failed to retrieve category rules', 'details': str(e)}), 500
+
+def create_category_rule():
+    """Create a rule assigning a category to imported descriptions containing a pattern."""
+    try:
+        data = request.get_json()
+        
+        # Validate required fields
+        required_fields = ['pattern', 'category_id']
+        for field in required_fields:
+            if field not in data:
+                raise BadRequest(f"Missing required field: {field}")
+        
+        new_rule = CategoryRule(
+            pattern=_validate_pattern(data['pattern']),
+            category_id=_validate_category(data['category_id']),
+            user_id=g.user_id
+        )
+        
+        db.session.add(new_rule)
+        User.bump_data_version(g.user_id)
+        User.bump_rules_version(g.user_id)
+        db.session.commit()
+        
+        return jsonify(_serialize_rule(new_rule)), 201
+    
+    except BadRequest as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to create category rule', 'details': str(e)}), 500
+
+def update_category_rule(rule_id):
+    """Update an existing category rule."""
+    try:
+        rule = CategoryRule.query.filter_by(id=rule_id, user_id=g.user_id).first()
+        
+        if not rule:
+            raise NotFound("Category rule not found")
+        
+        data = request.get_json()
+        
+        if 'pattern' in data:
+            rule.pattern = _validate_pattern(data['pattern'])
+        if 'category_id' in data:
+            rule.category_id = _validate_category(data['category_id'])
+        
+        User.bump_data_version(g.user_id)
+        User.bump_rules_version(g.user_id)
+        db.session.commit()
+        
+        return jsonify(_serialize_rule(rule)), 200
+    
+    except NotFound as e:
+        return jsonify({'error': str(e)}), 404
+    except BadRequest as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to update category rule', 'details': str(e)}), 500
+
+def delete_category_rule(rule_id):
+    """Delete a category rule."""
+    try:
+        rule = CategoryRule.query.filter_by(id=rule_id, user_id=g.user_id).first()
+        
+        if not rule:
+            raise NotFound("Category rule not found")
+        
+        db.session.delete(rule)
+        User.bump_data_version(g.user_id)
+        User.bump_rules_version(g.user_id)
+        db.session.commit()
+        
+        return jsonify({'message': 'Category rule deleted successfully'}), 200
+    
+    except NotFound as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to delete category rule', 'details': str(e)}), 500
@@ -0,0 +1,32 @@
+from flask import request, jsonify, g
+from werkzeug.exceptions import BadRequest
+from backend.services.analyzers.dashboard_summary import build_dashboard_summary
+from backend.services.cache.analysis_cache import analysis_cache
+
+MAX_SUMMARY_MONTHS = 24
+MAX_RECENT_TRANSACTIONS = 50
+
+def get_dashboard_summary():
+    """Get accounts, recent transactions, spending, trends and recommendations in one response."""
+    try:
+        # Get query parameters
+        months = request.args.get('months', default=6, type=int)
+        recent_limit = request.args.get('recent', default=10, type=int)
+        
+        if months is None or not 1 <= months <= MAX_SUMMARY_MONTHS:
+            raise BadRequest(f"months must be between 1 and {MAX_SUMMARY_MONTHS}")
+        
+        if recent_limit is None or not 0 <= recent_limit <= MAX_RECENT_TRANSACTIONS:
+            raise BadRequest(f"recent must be between 0 and {MAX_RECENT_TRANSACTIONS}")
+        
+        summary = analysis_cache.get_or_compute(g.user_id, 'dashboard-summary', {
+            'months': months,
+            'recent': recent_limit
+        }, lambda: build_dashboard_summary(g.user_id, months, recent_limit))
+        
+        return jsonify(summary), 200
+    
+    except BadRequest as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Failed to build dashboard summary', 'details': str(e)}), 500
@@ -1,15 +1,92 @@
-from flask import request, jsonify, g
+from flask import request, jsonify, g, current_app
 from werkzeug.exceptions import BadRequest, NotFound
 from datetime import datetime
-from backend.models import Transaction, Account, Category, db
+import base64
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import aliased
+from backend.models import Transaction, Account, Category, User, db
+from backend.services.analyzers.monthly_totals import (
+    apply_expense_totals, add_transaction_to_totals, remove_transaction_from_totals
+)
+from backend.services.analyzers.recurring_series import update_transaction_series, refresh_recurring_series
+from backend.services.importers.transaction_importer import fingerprint_fields, next_transaction_fingerprint
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def _encode_cursor(transaction):
+    """Encode the (transaction_date, id) position of a transaction as an opaque cursor."""
+    raw = f"{transaction.transaction_date.isoformat()}|{transaction.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def _decode_cursor(cursor):
+    """Decode a cursor back into a (transaction_date, id) tuple."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        date_str, transaction_id = raw.split('|', 1)
+        return datetime.fromisoformat(date_str), transaction_id
+    except (ValueError, UnicodeError):
+        raise BadRequest("Invalid cursor")
+
+def _get_page_size():
+    """Read the requested page size, bounded by the configured maximum."""
+    default_size = current_app.config.get('TRANSACTIONS_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+    max_size = current_app.config.get('TRANSACTIONS_MAX_PAGE_SIZE', MAX_PAGE_SIZE)
+    
+    limit = request.args.get('limit', default=default_size, type=int)
+    if limit is None or limit < 1:
+        raise BadRequest("limit must be a positive integer")
+    
+    return min(limit, max_size)
+
+def _transaction_query():
+    """
+    Build a query returning the user's transactions together with the names
+    of their account, category and transfer account.
+    
+    Names are resolved through joins, so serializing a page of results costs a
+    single round trip regardless of how many rows it contains.
+    """
+    TransferAccount = aliased(Account)
+    
+    return db.session.query(
+        Transaction,
+        Account.name.label('account_name'),
+        Category.name.label('category_name'),
+        TransferAccount.name.label('transfer_account_name')
+    ).join(
+        Account, Transaction.account_id == Account.id
+    ).outerjoin(
+        Category, Transaction.category_id == Category.id
+    ).outerjoin(
+        TransferAccount, Transaction.transfer_account_id == TransferAccount.id
+    ).filter(
+        Account.user_id == g.user_id
+    )
+
+def _serialize_transaction(trans, account_name, category_name, transfer_account_name):
+    """Convert a transaction row and its joined names to a JSON-friendly dict."""
+    return {
+        'id': trans.id,
+        'amount': trans.amount,
+        'description': trans.description,
+        'transaction_date': trans.transaction_date.isoformat(),
+        'is_recurring': trans.is_recurring,
+        'recurrence_pattern': trans.recurrence_pattern,
+        'notes': trans.notes,
+        'account_id': trans.account_id,
+        'account_name': account_name or 'Unknown Account',
+        'category_id': trans.category_id,
+        'category_name': category_name,
+        'transfer_account_id': trans.transfer_account_id,
+        'transfer_account_name': transfer_account_name,
+        'transaction_type': trans.transaction_type,
+        'created_at': trans.created_at.isoformat()
+    }
 
 def get_transactions():
-    """Get all transactions for the authenticated user."""
+    """Get a page of transactions for the authenticated user."""
     try:
-        # Get account IDs for the current user
-        user_accounts = Account.query.filter_by(user_id=g.user_id).all()
-        account_ids = [account.id for account in user_accounts]
-        
         # Get query parameters for filtering
         account_id = request.args.get('account_id')
         category_id = request.args.get('category_id')
@@ -18,16 +95,18 @@ def get_transactions():
         min_amount = request.args.get('min_amount')
         max_amount = request.args.get('max_amount')
         transaction_type = request.args.get('type')
+        cursor = request.args.get('cursor')
+        limit = _get_page_size()
         
-        # Base query
-        query = Transaction.query.filter(Transaction.account_id.in_(account_ids))
+        # Base query, restricted to the user's accounts
+        query = _transaction_query()
         
         # Apply filters
         if account_id:
-            query = query.filter_by(account_id=account_id)
+            query = query.filter(Transaction.account_id == account_id)
         
         if category_id:
-            query = query.filter_by(category_id=category_id)
+            query = query.filter(Transaction.category_id == category_id)
         
         if start_date:
             start_date = datetime.strptime(start_date, '%Y-%m-%d')
@@ -51,97 +130,48 @@ def get_transactions():
             elif transaction_type == 'transfer':
                 query = query.filter(Transaction.transfer_account_id.isnot(None))
         
-        # Order by date, newest first
-        query = query.order_by(Transaction.transaction_date.desc())
+        # Resume after the last row of the previous page
+        if cursor:
+            cursor_date, cursor_id = _decode_cursor(cursor)
+            query = query.filter(or_(
+                Transaction.transaction_date < cursor_date,
+                and_(Transaction.transaction_date == cursor_date, Transaction.id < cursor_id)
+            ))
         
-        # Get results
-        transactions = query.all()
+        # Order by date, newest first, with id as a tie-breaker for a stable keyset
+        query = query.order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
         
-        result = []
-        for trans in transactions:
-            category_name = None
-            if trans.category_id:
-                category = Category.query.get(trans.category_id)
-                if category:
-                    category_name = category.name
-            
-            account = Account.query.get(trans.account_id)
-            account_name = account.name if account else 'Unknown Account'
-            
-            transfer_account_name = None
-            if trans.transfer_account_id:
-                transfer_account = Account.query.get(trans.transfer_account_id)
-                if transfer_account:
-                    transfer_account_name = transfer_account.name
-            
-            result.append({
-                'id': trans.id,
-                'amount': trans.amount,
-                'description': trans.description,
-                'transaction_date': trans.transaction_date.isoformat(),
-                'is_recurring': trans.is_recurring,
-                'recurrence_pattern': trans.recurrence_pattern,
-                'notes': trans.notes,
-                'account_id': trans.account_id,
-                'account_name': account_name,
-                'category_id': trans.category_id,
-                'category_name': category_name,
-                'transfer_account_id': trans.transfer_account_id,
-                'transfer_account_name': transfer_account_name,
-                'transaction_type': trans.transaction_type,
-                'created_at': trans.created_at.isoformat()
-            })
+        # Fetch one extra row to find out whether another page exists
+        rows = query.limit(limit + 1).all()
         
-        return jsonify(result), 200
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1].Transaction)
+        
+        result = [_serialize_transaction(*row) for row in rows]
+        
+        return jsonify({
+            'transactions': result,
+            'next_cursor': next_cursor,
+            'limit': limit
+        }), 200
     
+    except BadRequest as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': 'Failed to retrieve transactions', 'details': str(e)}), 500
 
 def get_transaction(transaction_id):
     """Get a specific transaction by ID."""
     try:
-        # Get account IDs for the current user
-        user_accounts = Account.query.filter_by(user_id=g.user_id).all()
-        account_ids = [account.id for account in user_accounts]
-        
-        transaction = Transaction.query.filter_by(id=transaction_id).first()
+        row = _transaction_query().filter(Transaction.id == transaction_id).first()
         
-        if not transaction or transaction.account_id not in account_ids:
+        if not row:
             raise NotFound("Transaction not found")
         
-        category_name = None
-        if transaction.category_id:
-            category = Category.query.get(transaction.category_id)
-            if category:
-                category_name = category.name
-        
-        account = Account.query.get(transaction.account_id)
-        account_name = account.name if account else 'Unknown Account'
-        
-        transfer_account_name = None
-        if transaction.transfer_account_id:
-            transfer_account = Account.query.get(transaction.transfer_account_id)
-            if transfer_account:
-                transfer_account_name = transfer_account.name
-        
-        result = {
-            'id': transaction.id,
-            'amount': transaction.amount,
-            'description': transaction.description,
-            'transaction_date': transaction.transaction_date.isoformat(),
-            'is_recurring': transaction.is_recurring,
-            'recurrence_pattern': transaction.recurrence_pattern,
-            'notes': transaction.notes,
-            'account_id': transaction.account_id,
-            'account_name': account_name,
-            'category_id': transaction.category_id,
-            'category_name': category_name,
-            'transfer_account_id': transaction.transfer_account_id,
-            'transfer_account_name': transfer_account_name,
-            'transaction_type': transaction.transaction_type,
-            'created_at': transaction.created_at.isoformat(),
-            'updated_at': transaction.updated_at.isoformat()
-        }
+        result = _serialize_transaction(*row)
+        result['updated_at'] = row.Transaction.updated_at.isoformat()
         
         return jsonify(result), 200
     
@@ -191,7 +221,11 @@ def create_transaction():
             is_recurring=data.get('is_recurring', False),
             recurrence_pattern=data.get('recurrence_pattern'),
             notes=data.get('notes'),
-            transfer_account_id=data.get('transfer_account_id')
+            transfer_account_id=data.get('transfer_account_id'),
+            # Fingerprinted like imported rows, so a later import of the same charge is skipped
+            fingerprint=next_transaction_fingerprint(
+                data['account_id'], transaction_date, float(data['amount']), data.get('description')
+            )
         )
         
         db.session.add(new_transaction)
@@ -199,11 +233,16 @@ def create_transaction():
         # Update account balance
         account.update_balance(float(data['amount']))
         
+        # Update the monthly spending rollup and recurring series
+        add_transaction_to_totals(g.user_id, new_transaction)
+        update_transaction_series(g.user_id, new_transaction)
+        
         # Update transfer account balance if applicable
         if data.get('transfer_account_id'):
             transfer_account = Account.query.get(data['transfer_account_id'])
             transfer_account.update_balance(-float(data['amount']))
         
+        User.bump_data_version(g.user_id)
         db.session.commit()
         
         return jsonify({
@@ -241,6 +280,12 @@ def update_transaction(transaction_id):
         original_amount = transaction.amount
         original_account_id = transaction.account_id
         original_transfer_account_id = transaction.transfer_account_id
+        original_transaction_date = transaction.transaction_date
+        original_category_id = transaction.category_id
+        original_series_id = transaction.recurring_series_id
+        original_fingerprint_fields = fingerprint_fields(
+            transaction.account_id, transaction.transaction_date, transaction.amount, transaction.description
+        )
         
         # Update transaction fields
         if 'amount' in data:
@@ -281,6 +326,18 @@ def update_transaction(transaction_id):
                     raise BadRequest("Invalid transfer account ID")
             transaction.transfer_account_id = data['transfer_account_id']
         
+        # An edited account, date, amount or description makes it a different
+        # charge, so a later import of the original row is not skipped
+        if fingerprint_fields(
+            transaction.account_id, transaction.transaction_date, transaction.amount, transaction.description
+        ) != original_fingerprint_fields:
+            # Release the old fingerprint first so it is free to be reused
+            transaction.fingerprint = None
+            db.session.flush()
+            transaction.fingerprint = next_transaction_fingerprint(
+                transaction.account_id, transaction.transaction_date, transaction.amount, transaction.description
+            )
+        
         # Adjust account balances
         if original_account_id == transaction.account_id:
             # Same account, just update the difference
@@ -310,6 +367,19 @@ def update_transaction(transaction_id):
             transfer_account = Account.query.get(transaction.transfer_account_id)
             transfer_account.update_balance(-(transaction.amount - original_amount))
         
+        # Move the transaction's contribution in the monthly spending rollup
+        apply_expense_totals(g.user_id, original_account_id, [(
+            original_transaction_date,
+            original_category_id,
+            original_amount,
+            original_transfer_account_id
+        )], sign=-1)
+        add_transaction_to_totals(g.user_id, transaction)
+        
+        # Rematch the transaction, refreshing its old and new series
+        update_transaction_series(g.user_id, transaction, original_series_id)
+        
+        User.bump_data_version(g.user_id)
         db.session.commit()
         
         return jsonify({
@@ -353,7 +423,13 @@ def delete_transaction(transaction_id):
             transfer_account = Account.query.get(transaction.transfer_account_id)
             transfer_account.update_balance(transaction.amount)
         
+        # Remove the transaction from the monthly spending rollup
+        remove_transaction_from_totals(g.user_id, transaction)
+        
+        series_id = transaction.recurring_series_id
         db.session.delete(transaction)
+        refresh_recurring_series([series_id])
+        User.bump_data_version(g.user_id)
         db.session.commit()
         
         return jsonify({'message': 'Transaction deleted successfully'}), 200
@@ -1,14 +1,17 @@
 from flask import Blueprint, request, jsonify, g
 from datetime import datetime, timedelta
 from backend.api.routes.auth_routes import token_required
+from backend.api.routes.etags import conditional_get
 from backend.services.analyzers.spending_analyzer import SpendingAnalyzer
 from backend.services.recommendations.budget_recommendations import BudgetRecommendationService
+from backend.services.cache.analysis_cache import analysis_cache
 
 # Create a Blueprint for analysis routes
 analysis_bp = Blueprint('analysis', __name__, url_prefix='/api/analysis')
 
 @analysis_bp.route('/spending-by-category', methods=['GET'])
 @token_required
+@conditional_get
 def get_spending_by_category():
     """Get spending breakdown by category."""
     try:
@@ -28,18 +31,25 @@ def get_spending_by_category():
         else:
             end_date = datetime.now()
         
-        # Get spending breakdown
-        analyzer = SpendingAnalyzer(g.user_id)
-        category_spending = analyzer.get_spending_by_category(start_date, end_date, account_id)
-        
-        # Convert DataFrame to JSON-friendly format
-        result = category_spending.to_dict('records')
-        
-        return jsonify({
+        def compute():
+            # Get spending breakdown
+            analyzer = SpendingAnalyzer(g.user_id)
+            category_spending = analyzer.get_spending_by_category(start_date, end_date, account_id)
+            
+            # Convert DataFrame to JSON-friendly format
+            return {
+                'start_date': start_date.strftime('%Y-%m-%d'),
+                'end_date': end_date.strftime('%Y-%m-%d'),
+                'categories': category_spending.to_dict('records')
+            }
+        
+        result = analysis_cache.get_or_compute(g.user_id, 'spending-by-category', {
             'start_date': start_date.strftime('%Y-%m-%d'),
             'end_date': end_date.strftime('%Y-%m-%d'),
-            'categories': result
-        }), 200
+            'account_id': account_id
+        }, compute)
+        
+        return jsonify(result), 200
     
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
@@ -48,32 +58,34 @@ def get_spending_by_category():
 
 @analysis_bp.route('/monthly-trends', methods=['GET'])
 @token_required
+@conditional_get
 def get_monthly_trends():
     """Get monthly spending trends."""
     try:
         # Get query parameters
         months = request.args.get('months', default=6, type=int)
         
-        # Get monthly trends
-        analyzer = SpendingAnalyzer(g.user_id)
-        monthly_trends = analyzer.get_monthly_spending_trends(months)
+        def compute():
+            # Get monthly trends
+            analyzer = SpendingAnalyzer(g.user_id)
+            monthly_trends = analyzer.get_monthly_spending_trends(months)
+            
+            # Convert DataFrame to JSON-friendly format
+            return {
+                'months': months,
+                'trends': [] if monthly_trends.empty else monthly_trends.to_dict('records')
+            }
         
-        # Convert DataFrame to JSON-friendly format
-        if monthly_trends.empty:
-            result = []
-        else:
-            result = monthly_trends.to_dict('records')
+        result = analysis_cache.get_or_compute(g.user_id, 'monthly-trends', {'months': months}, compute)
         
-        return jsonify({
-            'months': months,
-            'trends': result
-        }), 200
+        return jsonify(result), 200
     
     except Exception as e:
         return jsonify({'error': 'Failed to analyze monthly trends', 'details': str(e)}), 500
 
 @analysis_bp.route('/largest-expenses', methods=['GET'])
 @token_required
+@conditional_get
 def get_largest_expenses():
     """Get largest individual expenses."""
     try:
@@ -93,44 +105,49 @@ def get_largest_expenses():
         else:
             end_date = datetime.now()
         
-        # Get largest expenses
-        analyzer = SpendingAnalyzer(g.user_id)
-        expenses = analyzer.get_largest_expenses(start_date, end_date, limit)
-        
-        # Convert DataFrame to JSON-friendly format
-        if expenses.empty:
-            result = []
-        else:
-            result = expenses.to_dict('records')
-        
-        return jsonify({
+        def compute():
+            # Get largest expenses
+            analyzer = SpendingAnalyzer(g.user_id)
+            expenses = analyzer.get_largest_expenses(start_date, end_date, limit)
+            
+            # Convert DataFrame to JSON-friendly format
+            return {
+                'start_date': start_date.strftime('%Y-%m-%d'),
+                'end_date': end_date.strftime('%Y-%m-%d'),
+                'expenses': [] if expenses.empty else expenses.to_dict('records')
+            }
+        
+        result = analysis_cache.get_or_compute(g.user_id, 'largest-expenses', {
             'start_date': start_date.strftime('%Y-%m-%d'),
             'end_date': end_date.strftime('%Y-%m-%d'),
-            'expenses': result
-        }), 200
+            'limit': limit
+        }, compute)
+        
+        return jsonify(result), 200
     
     except Exception as e:
         return jsonify({'error': 'Failed to retrieve largest expenses', 'details': str(e)}), 500
 
 @analysis_bp.route('/budget-comparison/<budget_id>', methods=['GET'])
 @token_required
+@conditional_get
 def get_budget_comparison(budget_id):
     """Compare actual spending with budget allocations."""
     try:
-        # Get budget comparison
-        analyzer = SpendingAnalyzer(g.user_id)
-        comparison = analyzer.get_monthly_budget_comparison(budget_id)
-        
-        # Convert DataFrame to JSON-friendly format
-        if comparison.empty:
-            result = []
-        else:
-            result = comparison.to_dict('records')
-        
-        return jsonify({
-            'budget_id': budget_id,
-            'comparison': result
-        }), 200
+        def compute():
+            # Get budget comparison
+            analyzer = SpendingAnalyzer(g.user_id)
+            comparison = analyzer.get_monthly_budget_comparison(budget_id)
+            
+            # Convert DataFrame to JSON-friendly format
+            return {
+                'budget_id': budget_id,
+                'comparison': [] if comparison.empty else comparison.to_dict('records')
+            }
+        
+        result = analysis_cache.get_or_compute(g.user_id, 'budget-comparison', {'budget_id': budget_id}, compute)
+        
+        return jsonify(result), 200
     
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
@@ -139,15 +156,21 @@ def get_budget_comparison(budget_id):
 
 @analysis_bp.route('/recommendations/spending', methods=['GET'])
 @token_required
+@conditional_get
 def get_spending_recommendations():
     """Get spending recommendations."""
     try:
         # Get query parameters
         months = request.args.get('months', default=3, type=int)
         
-        # Get recommendations
-        analyzer = SpendingAnalyzer(g.user_id)
-        recommendations = analyzer.get_spending_recommendations(months)
+        def compute():
+            # Get recommendations
+            analyzer = SpendingAnalyzer(g.user_id)
+            return analyzer.get_spending_recommendations(months)
+        
+        recommendations = analysis_cache.get_or_compute(
+            g.user_id, 'recommendations/spending', {'months': months}, compute
+        )
         
         return jsonify(recommendations), 200
     
@@ -156,6 +179,7 @@ def get_spending_recommendations():
 
 @analysis_bp.route('/recommendations/budget-plan', methods=['GET'])
 @token_required
+@conditional_get
 def get_budget_plan():
     """Get recommended budget plan."""
     try:
@@ -163,9 +187,15 @@ def get_budget_plan():
         income = request.args.get('income', type=float)
         savings_goal = request.args.get('savings_goal', default=20, type=float)
         
-        # Get budget plan
-        recommendation_service = BudgetRecommendationService(g.user_id)
-        budget_plan = recommendation_service.generate_budget_plan(income, savings_goal)
+        def compute():
+            # Get budget plan
+            recommendation_service = BudgetRecommendationService(g.user_id)
+            return recommendation_service.generate_budget_plan(income, savings_goal)
+        
+        budget_plan = analysis_cache.get_or_compute(g.user_id, 'recommendations/budget-plan', {
+            'income': income,
+            'savings_goal': savings_goal
+        }, compute)
         
         return jsonify(budget_plan), 200
     
@@ -174,14 +204,18 @@ def get_budget_plan():
 
 @analysis_bp.route('/recommendations/cost-cutting', methods=['GET'])
 @token_required
+@conditional_get
 def get_cost_cutting_opportunities():
     """Get cost-cutting opportunities."""
     try:
-        # Get opportunities
-        recommendation_service = BudgetRecommendationService(g.user_id)
-        opportunities = recommendation_service.identify_cost_cutting_opportunities()
+        def compute():
+            # Get opportunities
+            recommendation_service = BudgetRecommendationService(g.user_id)
+            return recommendation_service.identify_cost_cutting_opportunities()
+        
+        opportunities = analysis_cache.get_or_compute(g.user_id, 'recommendations/cost-cutting', {}, compute)
         
         return jsonify(opportunities), 200
     
     except Exception as e:
-        return jsonify({'error': 'Failed to identify cost-cutting opportunities', 'details': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': 'Failed to identify cost-cutting opportunities', 'details': str(e)}), 500
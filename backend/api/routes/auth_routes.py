@@ -4,6 +4,7 @@ from backend.api.controllers.auth_controller import (
     register_user, 
     login_user, 
     authenticate_token, 
+    logout_user,
     get_user_profile, 
     update_user_profile, 
     change_user_password
@@ -33,8 +34,9 @@ def token_required(f):
         try:
             # Verify token and get user ID
             user_id = authenticate_token(token)
-            # Store the user ID for use in the route function
+            # Store the user ID and token for use in the route function
             g.user_id = user_id
+            g.auth_token = token
         except Unauthorized as e:
             return jsonify({
                 'error': str(e), 
@@ -54,6 +56,12 @@ def token_required(f):
 auth_bp.route('/register', methods=['POST'])(register_user)
 auth_bp.route('/login', methods=['POST'])(login_user)
 
+@auth_bp.route('/logout', methods=['POST'])
+@token_required
+def logout():
+    """Revoke the current token."""
+    return logout_user()
+
 # Protected profile routes
 @auth_bp.route('/profile', methods=['GET'])
 @token_required
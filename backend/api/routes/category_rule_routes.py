@@ -0,0 +1,14 @@
+from flask import Blueprint
+from backend.api.controllers.category_rule_controller import (
+    get_category_rules, create_category_rule, update_category_rule, delete_category_rule
+)
+from backend.api.routes.auth_routes import token_required
+
+# Create a Blueprint for merchant categorization rule routes
+category_rule_bp = Blueprint('category_rule', __name__, url_prefix='/api/category-rules')
+
+# Register routes
+category_rule_bp.route('', methods=['GET'])(token_required(get_category_rules))
+category_rule_bp.route('', methods=['POST'])(token_required(create_category_rule))
+category_rule_bp.route('/<rule_id>', methods=['PUT'])(token_required(update_category_rule))
+category_rule_bp.route('/<rule_id>', methods=['DELETE'])(token_required(delete_category_rule))
@@ -0,0 +1,10 @@
+from flask import Blueprint
+from backend.api.controllers.dashboard_controller import get_dashboard_summary
+from backend.api.routes.auth_routes import token_required
+from backend.api.routes.etags import conditional_get
+
+# Create a Blueprint for dashboard routes
+dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
+
+# Register routes
+dashboard_bp.route('/summary', methods=['GET'])(token_required(conditional_get(get_dashboard_summary)))
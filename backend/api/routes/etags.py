@@ -0,0 +1,65 @@
+import hashlib
+import json
+from datetime import date
+from functools import wraps
+from flask import g, request, make_response
+from backend.services.cache.analysis_cache import analysis_cache
+from backend.services.http.compression import available_encodings, encoded_etag
+
+def compute_etag(user_id, data_version, endpoint, view_args, query_args):
+    """
+    Hash everything a read response depends on into a strong ETag.
+    
+    Today's date is included because analyses default to date ranges
+    relative to now, so their results change from one day to the next
+    even when the data does not.
+    """
+    payload = json.dumps([
+        user_id,
+        data_version,
+        endpoint,
+        sorted((view_args or {}).items()),
+        sorted(query_args.items(multi=True)),
+        date.today().isoformat()
+    ], default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+def conditional_get(f):
+    """
+    Answer repeat GET requests for unchanged data with 304 Not Modified.
+    
+    The ETag comes from the user's data version, which every write to
+    their accounts or transactions increments, plus the endpoint and its
+    parameters. A matching If-None-Match is answered after a single
+    primary key lookup, before the view runs any query or analysis. The
+    view's analysis cache lookup reuses the version read here, so a body
+    is never served under an ETag of a different version.
+    Clients holding a compressed representation send its ETag, which
+    carries the content coding as a suffix, and get that ETag back.
+    Must be applied inside token_required.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        data_version = analysis_cache.data_version(g.user_id)
+        etag = compute_etag(g.user_id, data_version, request.endpoint, request.view_args, request.args)
+        
+        matched = next((
+            tag for tag in [etag] + [encoded_etag(etag, encoding) for encoding in available_encodings()]
+            if request.if_none_match.contains_weak(tag)
+        ), None)
+        
+        if matched:
+            response = make_response('', 304)
+            etag = matched
+        else:
+            response = make_response(f(*args, **kwargs))
+            # Errors are not cacheable
+            if response.status_code != 200:
+                return response
+        
+        response.set_etag(etag)
+        # Browsers may keep the response but must revalidate it on every use
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    
+    return decorated
@@ -0,0 +1,71 @@
+import hmac
+from functools import wraps
+from flask import Blueprint, Response, request, jsonify, current_app
+from backend.models import db
+from backend.services.monitoring.metrics import metrics
+from backend.services.monitoring.pool_metrics import pool_metrics
+from backend.services.monitoring.sql_profiler import sql_profiler
+
+# Create a Blueprint for operational endpoints that are not part of the public API
+internal_bp = Blueprint('internal', __name__, url_prefix='/api/internal')
+
+LOOPBACK_ADDRESSES = {'127.0.0.1', '::1'}
+
+def internal_only(f):
+    """
+    Restrict a route to operators.
+    
+    With INTERNAL_API_TOKEN set, requests must send it in the
+    X-Internal-Token header; otherwise only loopback clients are allowed.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        expected_token = current_app.config.get('INTERNAL_API_TOKEN')
+        
+        if expected_token:
+            allowed = hmac.compare_digest(request.headers.get('X-Internal-Token', ''), expected_token)
+        else:
+            allowed = request.remote_addr in LOOPBACK_ADDRESSES
+        
+        if not allowed:
+            return jsonify({'error': 'Not found'}), 404
+        
+        return f(*args, **kwargs)
+    
+    return decorated
+
+@internal_bp.route('/pool', methods=['GET'])
+@internal_only
+def get_pool_stats():
+    """Report this worker's database connection pool state and checkout wait times."""
+    try:
+        return jsonify(pool_metrics.snapshot(db.engine)), 200
+    
+    except Exception as e:
+        return jsonify({'error': 'Failed to read pool stats', 'details': str(e)}), 500
+
+@internal_bp.route('/sql-profiles', methods=['GET'])
+@internal_only
+def get_sql_profiles():
+    """List this worker's most recent profiled requests, optionally for one endpoint."""
+    try:
+        if not sql_profiler.enabled:
+            return jsonify({'error': 'SQL profiling is disabled; set SQL_PROFILING=true'}), 404
+        
+        limit = request.args.get('limit', default=20, type=int)
+        endpoint = request.args.get('endpoint')
+        
+        return jsonify({'profiles': sql_profiler.recent(limit, endpoint)}), 200
+    
+    except Exception as e:
+        return jsonify({'error': 'Failed to read SQL profiles', 'details': str(e)}), 500
+
+@internal_bp.route('/metrics', methods=['GET'])
+@internal_only
+def get_metrics():
+    """Serve request, parser and import metrics, merged across workers, for Prometheus to scrape."""
+    try:
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+    
+    except Exception as e:
+        return jsonify({'error': 'Failed to render metrics', 'details': str(e)}), 500
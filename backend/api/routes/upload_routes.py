@@ -1,10 +1,15 @@
-from flask import Blueprint, request, jsonify, g, current_app
+from flask import Blueprint, request, jsonify, g, current_app, Response, stream_with_context
 import os
+import json
 from werkzeug.utils import secure_filename
 from backend.api.routes.auth_routes import token_required
-from backend.services.parsers.statement_parser import parse_uploaded_statement
-from backend.models import Account, Transaction, Category, db
-from datetime import datetime
+from backend.services.parsers.statement_parser import (
+    parse_uploaded_statement, stream_uploaded_statement, serialize_parsed_transaction, hash_uploaded_file
+)
+from backend.services.importers.transaction_importer import bulk_import_transactions, statement_already_imported
+from backend.services.jobs.import_jobs import import_jobs, serialize_job
+from backend.services.categorizers.merchant_rules import merchant_rules
+from backend.models import Account, Category, ImportJob, db
 
 # Create a Blueprint for file upload routes
 upload_bp = Blueprint('upload', __name__, url_prefix='/api/upload')
@@ -15,6 +20,24 @@ def allowed_file(filename):
     """Check if file has an allowed extension."""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def stream_parsed_batches(batches, file_hash):
+    """Yield newline-delimited JSON, one line per batch followed by a summary line."""
+    transactions_count = 0
+    try:
+        for batch in batches:
+            transactions_count += len(batch)
+            yield json.dumps({
+                'transactions': [serialize_parsed_transaction(transaction) for transaction in batch]
+            }) + '\n'
+        
+        yield json.dumps({
+            'message': 'Statement parsed successfully',
+            'transactions_count': transactions_count,
+            'file_hash': file_hash
+        }) + '\n'
+    except Exception as e:
+        yield json.dumps({'error': 'Failed to process statement', 'details': str(e)}) + '\n'
+
 @upload_bp.route('/statement', methods=['POST'])
 @token_required
 def upload_statement():
@@ -52,24 +75,40 @@ def upload_statement():
             except:
                 pass
         
+        # Reject a statement file that has already been imported
+        file_hash = hash_uploaded_file(file)
+        if statement_already_imported(g.user_id, file_hash):
+            return jsonify({
+                'error': 'This statement has already been imported',
+                'file_hash': file_hash
+            }), 409
+        
+        # Parse in the background if requested
+        if request.form.get('async', '').lower() == 'true':
+            job = import_jobs.submit_parse(g.user_id, file, bank_name, column_mapping)
+            return jsonify({**serialize_job(job), 'file_hash': file_hash}), 202
+        
+        # Stream batches as newline-delimited JSON if requested
+        if request.form.get('stream', '').lower() == 'true':
+            batches = stream_uploaded_statement(
+                file, bank_name, column_mapping, current_app.config['STATEMENT_CHUNK_SIZE']
+            )
+            return Response(
+                stream_with_context(stream_parsed_batches(batches, file_hash)),
+                mimetype='application/x-ndjson'
+            )
+        
         # Parse the statement
         parsed_transactions = parse_uploaded_statement(file, bank_name, column_mapping)
         
         # Return the parsed transactions for preview
-        result = []
-        for transaction in parsed_transactions:
-            result.append({
-                'date': transaction['date'].strftime('%Y-%m-%d'),
-                'description': transaction['description'],
-                'amount': transaction['amount'],
-                'category_hint': transaction.get('category_hint', ''),
-                'notes': transaction.get('notes', '')
-            })
+        result = [serialize_parsed_transaction(transaction) for transaction in parsed_transactions]
         
         return jsonify({
             'message': 'Statement parsed successfully',
             'transactions_count': len(result),
-            'transactions': result
+            'transactions': result,
+            'file_hash': file_hash
         }), 200
     
     except Exception as e:
@@ -99,56 +138,54 @@ def import_transactions():
         for category in categories:
             category_map[category.name.lower()] = category.id
         
-        # Import transactions
-        transactions = data['transactions']
-        imported_count = 0
-        skipped_count = 0
-        
-        for transaction_data in transactions:
-            # Check for required fields
-            if 'date' not in transaction_data or 'amount' not in transaction_data:
-                skipped_count += 1
-                continue
-            
-            # Parse date
-            try:
-                transaction_date = datetime.strptime(transaction_data['date'], '%Y-%m-%d')
-            except ValueError:
-                skipped_count += 1
-                continue
-            
-            # Find category if possible
-            category_id = None
-            category_hint = transaction_data.get('category_hint', '').lower()
-            
-            if category_hint and category_hint in category_map:
-                category_id = category_map[category_hint]
-            
-            # Create transaction
-            new_transaction = Transaction(
-                amount=float(transaction_data['amount']),
-                account_id=account_id,
-                transaction_date=transaction_date,
-                description=transaction_data.get('description', ''),
-                category_id=category_id,
-                notes=transaction_data.get('notes', '')
+        # Compiled merchant rules categorize rows the hints don't
+        matcher = merchant_rules.get_matcher(g.user_id)
+        
+        # Import in the background if requested
+        if data.get('async'):
+            job = import_jobs.submit_import(
+                g.user_id,
+                account_id,
+                data['transactions'],
+                category_map,
+                current_app.config['IMPORT_BATCH_SIZE'],
+                data.get('file_hash'),
+                matcher
             )
-            
-            db.session.add(new_transaction)
-            
-            # Update account balance
-            account.update_balance(float(transaction_data['amount']))
-            
-            imported_count += 1
-        
-        db.session.commit()
+            return jsonify(serialize_job(job)), 202
+        
+        # Import transactions in set-based batches
+        result = bulk_import_transactions(
+            g.user_id,
+            account_id,
+            data['transactions'],
+            category_map,
+            current_app.config['IMPORT_BATCH_SIZE'],
+            file_hash=data.get('file_hash'),
+            matcher=matcher
+        )
         
         return jsonify({
             'message': 'Transactions imported successfully',
-            'imported_count': imported_count,
-            'skipped_count': skipped_count
+            'imported_count': result['imported_count'],
+            'skipped_count': result['skipped_count'],
+            'duplicate_count': result['duplicate_count']
         }), 200
     
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': 'Failed to import transactions', 'details': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': 'Failed to import transactions', 'details': str(e)}), 500
+
+@upload_bp.route('/jobs/<job_id>', methods=['GET'])
+@token_required
+def get_import_job(job_id):
+    """Get the status and progress of a background parse or import job."""
+    try:
+        job = ImportJob.query.filter_by(id=job_id, user_id=g.user_id).first()
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify(serialize_job(job)), 200
+    
+    except Exception as e:
+        return jsonify({'error': 'Failed to retrieve job', 'details': str(e)}), 500
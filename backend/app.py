@@ -3,46 +3,28 @@ from flask_cors import CORS
 from dotenv import load_dotenv
 import os
 from backend.models import db
+from backend.services.cache.analysis_cache import analysis_cache
+from backend.services.cache.token_cache import token_cache
+from backend.services.auth.password_hasher import password_hasher
+from backend.services.jobs.import_jobs import import_jobs
+from backend.services.monitoring.request_log import request_logger
+from backend.services.monitoring.pool_metrics import engine_options
+from backend.services.monitoring.sql_profiler import sql_profiler
+from backend.services.monitoring.metrics import metrics
+from backend.services.http.json_provider import FastJSONProvider
+from backend.services.http.compression import response_compressor
 from backend.api.routes.auth_routes import auth_bp
 from backend.api.routes.account_routes import account_bp
 from backend.api.routes.transaction_routes import transaction_bp
 from backend.api.routes.upload_routes import upload_bp
 from backend.api.routes.analysis_routes import analysis_bp
-import logging
-from logging.handlers import RotatingFileHandler
-from flask import request
+from backend.api.routes.category_rule_routes import category_rule_bp
+from backend.api.routes.dashboard_routes import dashboard_bp
+from backend.api.routes.internal_routes import internal_bp
 
 # Load environment variables
 load_dotenv()
 
-def configure_logging(app):
-    # Ensure logs directory exists
-    log_dir = 'logs'
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-
-    # Configure file logging
-    file_handler = RotatingFileHandler(
-        os.path.join(log_dir, 'app.log'), 
-        maxBytes=10240, 
-        backupCount=10
-    )
-    file_handler.setFormatter(logging.Formatter(
-        '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-    ))
-    file_handler.setLevel(logging.INFO)
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    
-    # Add handlers to app logger
-    app.logger.addHandler(file_handler)
-    app.logger.addHandler(console_handler)
-    app.logger.setLevel(logging.INFO)
-
-
-
 def create_app(config=None):
     """Create and configure the Flask app."""
     # Determine the base directory
@@ -59,18 +41,89 @@ def create_app(config=None):
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///budget_tracker.db')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev_key')
+    app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'dev_key')  # Read once; used to sign auth tokens
+    app.config['TOKEN_CACHE_MAX_ENTRIES'] = int(os.getenv('TOKEN_CACHE_MAX_ENTRIES', 10000))  # Verified tokens cached per worker
+    app.config['PASSWORD_HASH_METHOD'] = os.getenv('PASSWORD_HASH_METHOD', 'scrypt')  # werkzeug method with optional cost, e.g. scrypt:32768:8:1 or pbkdf2:sha256:600000
+    app.config['PASSWORD_HASH_WORKERS'] = int(os.getenv('PASSWORD_HASH_WORKERS', 2))  # Hashes run at once per worker
+    # Hashes waiting before requests get a 503; by default at most half of a worker's GUNICORN_THREADS wait on hashing
+    app.config['PASSWORD_HASH_QUEUE_SIZE'] = int(os.getenv(
+        'PASSWORD_HASH_QUEUE_SIZE', max(int(os.getenv('GUNICORN_THREADS', 8)) // 2 - app.config['PASSWORD_HASH_WORKERS'], 0)
+    ))
     app.config['DEBUG'] = os.getenv('DEBUG', 'True').lower() == 'true'
-    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload size
+    app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_UPLOAD_SIZE_MB', 16)) * 1024 * 1024  # 16MB max upload size by default
+    app.config['STATEMENT_CHUNK_SIZE'] = int(os.getenv('STATEMENT_CHUNK_SIZE', 5000))  # Rows per streamed batch
+    app.config['IMPORT_BATCH_SIZE'] = int(os.getenv('IMPORT_BATCH_SIZE', 5000))  # Rows per import commit
+    app.config['IMPORT_JOB_THREADS'] = int(os.getenv('IMPORT_JOB_THREADS', 4))  # Background job threads per worker
+    app.config['IMPORT_JOB_PROCESSES'] = int(os.getenv('IMPORT_JOB_PROCESSES', 2))  # Statement parsing processes per worker
+    app.config['IMPORT_JOB_PREVIEW_ROWS'] = int(os.getenv('IMPORT_JOB_PREVIEW_ROWS', 1000))  # Parsed rows kept in a parse job's result
+    
+    # Database connection pool, per worker
+    app.config['DB_POOL_SIZE'] = int(os.getenv('DB_POOL_SIZE', 5))  # Connections kept open
+    app.config['DB_MAX_OVERFLOW'] = int(os.getenv('DB_MAX_OVERFLOW', 10))  # Extra connections allowed under load
+    app.config['DB_POOL_TIMEOUT'] = float(os.getenv('DB_POOL_TIMEOUT', 30))  # Seconds to wait for a free connection
+    app.config['DB_POOL_RECYCLE'] = int(os.getenv('DB_POOL_RECYCLE', 1800))  # Replace connections older than this; -1 to keep them
+    app.config['DB_POOL_PRE_PING'] = os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true'  # Test connections before use, e.g. after a database restart
+    app.config['SQL_PROFILING'] = os.getenv('SQL_PROFILING', 'False').lower() == 'true'  # Time every query; adds a Server-Timing header
+    app.config['SQL_PROFILE_SLOWEST'] = int(os.getenv('SQL_PROFILE_SLOWEST', 5))  # Statements kept per profiled request
+    app.config['SQL_PROFILE_HISTORY'] = int(os.getenv('SQL_PROFILE_HISTORY', 100))  # Profiled requests kept per worker
+    app.config['METRICS_DIR'] = os.getenv('METRICS_DIR')  # Owner-only directory for merging metrics across workers; unset reports this process only
+    app.config['METRICS_FLUSH_INTERVAL'] = float(os.getenv('METRICS_FLUSH_INTERVAL', 5))  # Seconds between writes of each worker's metrics
+    app.config['INTERNAL_API_TOKEN'] = os.getenv('INTERNAL_API_TOKEN')  # Required by /api/internal unless called from localhost
+    
+    # Response encoding
+    app.config['JSON_ENCODER'] = os.getenv('JSON_ENCODER', 'auto')  # auto, orjson or json; auto uses orjson when installed
+    app.config['COMPRESSION_ENABLED'] = os.getenv('COMPRESSION_ENABLED', 'True').lower() == 'true'  # gzip/brotli for clients that accept it
+    app.config['COMPRESSION_MIN_SIZE'] = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))  # Smaller bodies are sent uncompressed
+    app.config['COMPRESSION_GZIP_LEVEL'] = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+    app.config['COMPRESSION_BROTLI_QUALITY'] = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))  # Used when the Brotli package is installed
+    
+    # Analysis result cache: 'memory' (per worker), 'sqlite' (shared by workers on a host) or 'none'
+    app.config['ANALYSIS_CACHE_BACKEND'] = os.getenv('ANALYSIS_CACHE_BACKEND', 'memory')
+    app.config['ANALYSIS_CACHE_PATH'] = os.getenv('ANALYSIS_CACHE_PATH')  # Required for sqlite; a file in the instance directory, e.g. analysis_cache.sqlite3
+    app.config['ANALYSIS_CACHE_TTL'] = int(os.getenv('ANALYSIS_CACHE_TTL', 300))
+    app.config['ANALYSIS_CACHE_MAX_ENTRIES'] = int(os.getenv('ANALYSIS_CACHE_MAX_ENTRIES', 1024))
+    
+    # Logging: records are queued and written by a background thread
+    app.config['LOG_LEVEL'] = os.getenv('LOG_LEVEL', 'INFO')
+    app.config['LOG_FILE'] = os.getenv('LOG_FILE', 'logs/app.log')  # Empty to log to the console only
+    app.config['LOG_MAX_BYTES'] = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))  # Rotate the log file at 10MB by default
+    app.config['LOG_BACKUP_COUNT'] = int(os.getenv('LOG_BACKUP_COUNT', 5))
+    app.config['LOG_BODY_SAMPLE_RATE'] = float(os.getenv('LOG_BODY_SAMPLE_RATE', 0.0))  # Fraction of requests whose redacted body is logged
+    app.config['LOG_BODY_MAX_BYTES'] = int(os.getenv('LOG_BODY_MAX_BYTES', 1000))
     
     # Apply any custom config
     if config:
         app.config.update(config)
     
     # Enable CORS
-    CORS(app, resources={r"/api/*": {"origins": "*"}})
+    CORS(app, resources={
+        r"/api/*": {
+            "origins": "*",
+            "allow_headers": [
+                "Content-Type", 
+                "Authorization", 
+                "Access-Control-Allow-Credentials"
+            ],
+            "supports_credentials": True
+        }
+    })
+    
+    # Engine options are built after custom config so it can change the pool settings
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        **engine_options(app.config), **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    }
     
     # Initialize extensions
     db.init_app(app)
+    analysis_cache.init_app(app)
+    token_cache.init_app(app)
+    password_hasher.init_app(app)
+    import_jobs.init_app(app)
+    request_logger.init_app(app)
+    sql_profiler.init_app(app)
+    metrics.init_app(app)
+    response_compressor.init_app(app)
+    app.json = FastJSONProvider(app)
     
     # Register blueprints
     app.register_blueprint(auth_bp)
@@ -78,42 +131,9 @@ def create_app(config=None):
     app.register_blueprint(transaction_bp)
     app.register_blueprint(upload_bp)
     app.register_blueprint(analysis_bp)
-    
-    def setup_logging(app):
-    # Configure logging
-        handler = logging.FileHandler('app.log')
-        handler.setLevel(logging.INFO)
-        app.logger.addHandler(handler)
-    
-    # Log all requests
-    @app.before_request
-    def log_request_info():
-        app.logger.info(f'Request Headers: {request.headers}')
-        app.logger.info(f'Request Path: {request.path}')
-        app.logger.info(f'Request Method: {request.method}')
-        
-        # Log request data more comprehensively
-        if request.method == 'POST':
-            # Log form data
-            if request.form:
-                app.logger.info(f'Request Form Data: {request.form}')
-            
-            # Log JSON data
-            try:
-                if request.json:
-                    app.logger.info(f'Request JSON Data: {request.json}')
-            except Exception as e:
-                app.logger.info(f'No valid JSON in request: {str(e)}')
-            
-            # Log raw data
-            if request.data:
-                app.logger.info(f'Request Raw Data: {request.data[:1000]}')  # Truncate if too large
-                
-    @app.after_request
-    def log_response_info(response):
-        app.logger.info(f'Response Status: {response.status}')
-        app.logger.info(f'Response Headers: {response.headers}')
-        return response
+    app.register_blueprint(category_rule_bp)
+    app.register_blueprint(dashboard_bp)
+    app.register_blueprint(internal_bp)
     
     # Health check route
     @app.route('/api/health')
@@ -167,33 +187,16 @@ def create_app(config=None):
         # Serve the login page as the default landing page
         return render_template('standalone_login.html')
     
-    # Create tables
-    with app.app_context():
+    # Schema changes only happen on demand, never while a worker boots
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create any missing database tables."""
         db.create_all()
+        print("Database tables created.")
     
-    # Add logging setup
-    setup_logging(app)
-
-    # Enable CORS with more permissive settings
-    CORS(app, resources={
-        r"/api/*": {
-            "origins": "*",
-            "allow_headers": [
-                "Content-Type", 
-                "Authorization", 
-                "Access-Control-Allow-Credentials"
-            ],
-            "supports_credentials": True
-        }
-    })
-
-    configure_logging(app)
-
     return app
 
-# Create the app
-app = create_app()
-
 if __name__ == '__main__':
+    app = create_app()
     port = int(os.getenv('PORT', 8000))
     app.run(host='0.0.0.0', port=port, debug=app.config['DEBUG'])
\ No newline at end of file
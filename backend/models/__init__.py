@@ -1,17 +1,29 @@
 from backend.models.user import User, db
 from backend.models.account import Account
 from backend.models.category import Category
+from backend.models.category_rule import CategoryRule
 from backend.models.transaction import Transaction
 from backend.models.budget import Budget, BudgetItem
 from backend.models.attachment import Attachment
+from backend.models.monthly_category_total import MonthlyCategoryTotal
+from backend.models.recurring_series import RecurringSeries
+from backend.models.import_job import ImportJob
+from backend.models.statement_upload import StatementUpload
+from backend.models.revoked_token import RevokedToken
 
 __all__ = [
     'db',
     'User',
     'Account',
     'Category',
+    'CategoryRule',
     'Transaction',
     'Budget',
     'BudgetItem',
-    'Attachment'
+    'Attachment',
+    'MonthlyCategoryTotal',
+    'RecurringSeries',
+    'ImportJob',
+    'StatementUpload',
+    'RevokedToken'
 ]
\ No newline at end of file
@@ -28,6 +28,12 @@ class Account(db.Model):
         lazy=True, 
         cascade="all, delete-orphan"
     )
+    monthly_totals = db.relationship(
+        'MonthlyCategoryTotal',
+        backref='account',
+        lazy=True,
+        cascade="all, delete-orphan"
+    )
     
     def __init__(self, name, account_type, user_id, balance=0.0, currency='USD', institution=None):
         self.name = name
@@ -1,7 +1,32 @@
 from datetime import datetime
+import logging
 import uuid
 from backend.models.user import db
 
+logger = logging.getLogger(__name__)
+
+# Categories every new user starts with
+DEFAULT_CATEGORIES = [
+    # Income categories
+    {'name': 'Salary', 'type': 'income', 'color': '#2ecc71', 'icon': 'briefcase'},
+    {'name': 'Investments', 'type': 'income', 'color': '#27ae60', 'icon': 'trending-up'},
+    {'name': 'Gifts', 'type': 'income', 'color': '#3498db', 'icon': 'gift'},
+    {'name': 'Other Income', 'type': 'income', 'color': '#2980b9', 'icon': 'plus-circle'},
+    
+    # Expense categories
+    {'name': 'Housing', 'type': 'expense', 'color': '#e74c3c', 'icon': 'home'},
+    {'name': 'Transportation', 'type': 'expense', 'color': '#d35400', 'icon': 'car'},
+    {'name': 'Food', 'type': 'expense', 'color': '#f39c12', 'icon': 'shopping-cart'},
+    {'name': 'Utilities', 'type': 'expense', 'color': '#f1c40f', 'icon': 'zap'},
+    {'name': 'Healthcare', 'type': 'expense', 'color': '#e67e22', 'icon': 'activity'},
+    {'name': 'Personal', 'type': 'expense', 'color': '#9b59b6', 'icon': 'user'},
+    {'name': 'Entertainment', 'type': 'expense', 'color': '#8e44ad', 'icon': 'film'},
+    {'name': 'Education', 'type': 'expense', 'color': '#1abc9c', 'icon': 'book'},
+    {'name': 'Debt Payments', 'type': 'expense', 'color': '#c0392b', 'icon': 'credit-card'},
+    {'name': 'Savings', 'type': 'expense', 'color': '#16a085', 'icon': 'save'},
+    {'name': 'Other Expenses', 'type': 'expense', 'color': '#7f8c8d', 'icon': 'more-horizontal'},
+]
+
 class Category(db.Model):
     """Category model for classifying transactions."""
     
@@ -24,6 +49,7 @@ class Category(db.Model):
     transactions = db.relationship('Transaction', backref='category', lazy=True)
     subcategories = db.relationship('Category', backref=db.backref('parent', remote_side=[id]), lazy=True)
     budget_items = db.relationship('BudgetItem', backref='category', lazy=True)
+    rules = db.relationship('CategoryRule', backref='category', lazy=True, cascade="all, delete-orphan")
     
     def __init__(self, name, user_id, category_type='expense', color='#3498db', icon=None, parent_id=None, is_system=False):
         self.name = name
@@ -40,32 +66,10 @@ class Category(db.Model):
     @classmethod
     def create_default_categories(cls, user_id):
         """Create default expense and income categories for a new user."""
-        print(f"Creating default categories for user_id: {user_id}")
-        
-        default_categories = [
-            # Income categories
-            {'name': 'Salary', 'type': 'income', 'color': '#2ecc71', 'icon': 'briefcase'},
-            {'name': 'Investments', 'type': 'income', 'color': '#27ae60', 'icon': 'trending-up'},
-            {'name': 'Gifts', 'type': 'income', 'color': '#3498db', 'icon': 'gift'},
-            {'name': 'Other Income', 'type': 'income', 'color': '#2980b9', 'icon': 'plus-circle'},
-            
-            # Expense categories
-            {'name': 'Housing', 'type': 'expense', 'color': '#e74c3c', 'icon': 'home'},
-            {'name': 'Transportation', 'type': 'expense', 'color': '#d35400', 'icon': 'car'},
-            {'name': 'Food', 'type': 'expense', 'color': '#f39c12', 'icon': 'shopping-cart'},
-            {'name': 'Utilities', 'type': 'expense', 'color': '#f1c40f', 'icon': 'zap'},
-            {'name': 'Healthcare', 'type': 'expense', 'color': '#e67e22', 'icon': 'activity'},
-            {'name': 'Personal', 'type': 'expense', 'color': '#9b59b6', 'icon': 'user'},
-            {'name': 'Entertainment', 'type': 'expense', 'color': '#8e44ad', 'icon': 'film'},
-            {'name': 'Education', 'type': 'expense', 'color': '#1abc9c', 'icon': 'book'},
-            {'name': 'Debt Payments', 'type': 'expense', 'color': '#c0392b', 'icon': 'credit-card'},
-            {'name': 'Savings', 'type': 'expense', 'color': '#16a085', 'icon': 'save'},
-            {'name': 'Other Expenses', 'type': 'expense', 'color': '#7f8c8d', 'icon': 'more-horizontal'},
-        ]
+        logger.debug("Creating default categories for user_id: %s", user_id)
         
         categories = []
-        for cat in default_categories:
-            print(f"Creating category {cat['name']} with user_id {user_id}")
+        for cat in DEFAULT_CATEGORIES:
             category = cls(
                 name=cat['name'],
                 user_id=user_id,  # Ensure this is set correctly
@@ -0,0 +1,25 @@
+from datetime import datetime
+import uuid
+from backend.models.user import db
+
+class CategoryRule(db.Model):
+    """Rule assigning a category to imported transactions whose description contains a pattern."""
+    
+    __tablename__ = 'category_rules'
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    pattern = db.Column(db.String(255), nullable=False)  # Matched case-insensitively as a substring
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Foreign Keys
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+    category_id = db.Column(db.String(36), db.ForeignKey('categories.id'), nullable=False)
+    
+    def __init__(self, pattern, category_id, user_id):
+        self.pattern = pattern
+        self.category_id = category_id
+        self.user_id = user_id
+    
+    def __repr__(self):
+        return f'<CategoryRule {self.pattern}>'
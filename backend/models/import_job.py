@@ -0,0 +1,30 @@
+from datetime import datetime
+import uuid
+from backend.models.user import db
+
+class ImportJob(db.Model):
+    """Background statement parse or import job and its progress."""
+    
+    __tablename__ = 'import_jobs'
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    job_type = db.Column(db.String(20), nullable=False)  # parse, import
+    status = db.Column(db.String(20), default='queued')  # queued, running, completed, failed
+    total_rows = db.Column(db.Integer, nullable=True)
+    processed_rows = db.Column(db.Integer, default=0)
+    error = db.Column(db.Text, nullable=True)
+    result = db.Column(db.Text, nullable=True)  # JSON payload of the finished job
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Foreign Keys
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+    
+    def __init__(self, job_type, user_id, status='queued'):
+        self.job_type = job_type
+        self.user_id = user_id
+        self.status = status
+        self.processed_rows = 0
+    
+    def __repr__(self):
+        return f'<ImportJob {self.job_type} ({self.status})>'
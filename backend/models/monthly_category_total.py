@@ -0,0 +1,35 @@
+from datetime import datetime
+import uuid
+from backend.models.user import db
+
+class MonthlyCategoryTotal(db.Model):
+    """Rollup of non-transfer expenses per account, month and category."""
+    
+    __tablename__ = 'monthly_category_totals'
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    month = db.Column(db.String(7), nullable=False)  # YYYY-MM
+    total_amount = db.Column(db.Float, default=0.0)  # Sum of expenses as a positive amount
+    transaction_count = db.Column(db.Integer, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Foreign Keys
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    account_id = db.Column(db.String(36), db.ForeignKey('accounts.id'), nullable=False)
+    category_id = db.Column(db.String(36), db.ForeignKey('categories.id'), nullable=True)
+    
+    __table_args__ = (
+        db.Index('ix_monthly_category_totals_user_month', user_id, month),
+        db.Index('ix_monthly_category_totals_account_month_category', account_id, month, category_id),
+    )
+    
+    def __init__(self, user_id, account_id, month, category_id=None, total_amount=0.0, transaction_count=0):
+        self.user_id = user_id
+        self.account_id = account_id
+        self.month = month
+        self.category_id = category_id
+        self.total_amount = total_amount
+        self.transaction_count = transaction_count
+    
+    def __repr__(self):
+        return f'<MonthlyCategoryTotal {self.month}: {self.total_amount}>'
@@ -0,0 +1,45 @@
+from datetime import datetime
+import uuid
+from backend.models.user import db
+
+class RecurringSeries(db.Model):
+    """Expenses sharing a normalized description, with the statistics used to detect recurring charges."""
+    
+    __tablename__ = 'recurring_series'
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    normalized_description = db.Column(db.String(255), nullable=False)
+    description = db.Column(db.String(255), nullable=True)  # Description of the transaction that started the series
+    # Cadence and statistics cover the SERIES_WINDOW_DAYS up to last_seen
+    cadence = db.Column(db.String(20), nullable=True)  # monthly, bi-weekly, weekly, irregular; None below two transactions
+    is_recurring = db.Column(db.Boolean, default=False)  # Enough transactions with similar amounts
+    transaction_count = db.Column(db.Integer, default=0)
+    mean_amount = db.Column(db.Float, default=0.0)  # Mean expense amount, positive
+    min_amount = db.Column(db.Float, default=0.0)
+    max_amount = db.Column(db.Float, default=0.0)
+    first_seen = db.Column(db.DateTime, nullable=True)
+    last_seen = db.Column(db.DateTime, nullable=True)
+    expected_next_date = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Foreign Keys
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    category_id = db.Column(db.String(36), db.ForeignKey('categories.id'), nullable=True)
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'normalized_description', name='uq_recurring_series_user_description'),
+        # Recurring-cost views read a user's recurring series seen recently
+        db.Index('ix_recurring_series_user_recurring_last_seen', user_id, is_recurring, last_seen),
+    )
+    
+    def __init__(self, user_id, normalized_description, description=None, category_id=None):
+        self.user_id = user_id
+        self.normalized_description = normalized_description
+        self.description = description
+        self.category_id = category_id
+        self.transaction_count = 0
+        self.is_recurring = False
+    
+    def __repr__(self):
+        return f'<RecurringSeries {self.normalized_description} ({self.cadence})>'
@@ -0,0 +1,18 @@
+from datetime import datetime
+from backend.models.user import db
+
+class RevokedToken(db.Model):
+    """Auth token rejected before its expiry, e.g. after logout."""
+    
+    __tablename__ = 'revoked_tokens'
+    
+    token_hash = db.Column(db.String(64), primary_key=True)  # SHA-256 of the token, never the token itself
+    expires_at = db.Column(db.DateTime, nullable=True, index=True)  # The token's exp; rows are purged once it passes
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __init__(self, token_hash, expires_at=None):
+        self.token_hash = token_hash
+        self.expires_at = expires_at
+    
+    def __repr__(self):
+        return f'<RevokedToken {self.token_hash[:12]}>'
@@ -0,0 +1,28 @@
+from datetime import datetime
+import uuid
+from backend.models.user import db
+
+class StatementUpload(db.Model):
+    """Hash of a statement file whose transactions have been imported."""
+    
+    __tablename__ = 'statement_uploads'
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    file_hash = db.Column(db.String(64), nullable=False)  # SHA-256 of the file contents
+    filename = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Foreign Keys
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'file_hash', name='uq_statement_uploads_user_hash'),
+    )
+    
+    def __init__(self, user_id, file_hash, filename=None):
+        self.user_id = user_id
+        self.file_hash = file_hash
+        self.filename = filename
+    
+    def __repr__(self):
+        return f'<StatementUpload {self.filename}>'
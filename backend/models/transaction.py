@@ -14,6 +14,7 @@ class Transaction(db.Model):
     is_recurring = db.Column(db.Boolean, default=False)
     recurrence_pattern = db.Column(db.String(50), nullable=True)  # monthly, weekly, etc.
     notes = db.Column(db.Text, nullable=True)
+    fingerprint = db.Column(db.String(64), nullable=True)  # Set on imported rows to detect re-imports
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -24,6 +25,27 @@ class Transaction(db.Model):
     # For transfers between accounts
     transfer_account_id = db.Column(db.String(36), db.ForeignKey('accounts.id'), nullable=True)
     
+    # Series of similar expenses this transaction belongs to; None for income and transfers
+    recurring_series_id = db.Column(db.String(36), db.ForeignKey('recurring_series.id'), nullable=True)
+    
+    # Indexes covering the account, category and date filters used by the
+    # transaction list and the analysis services
+    __table_args__ = (
+        db.Index('ix_transactions_account_date', account_id, transaction_date),
+        db.Index('ix_transactions_category_date', category_id, transaction_date),
+        db.Index('ix_transactions_transfer_account', transfer_account_id),
+        db.Index('ix_transactions_fingerprint', fingerprint, unique=True),
+        db.Index('ix_transactions_recurring_series', recurring_series_id),
+        # Partial index for non-transfer expenses, the rows every spending analysis scans
+        db.Index(
+            'ix_transactions_expenses_account_date',
+            account_id,
+            transaction_date,
+            postgresql_where=db.and_(amount < 0, transfer_account_id.is_(None)),
+            sqlite_where=db.and_(amount < 0, transfer_account_id.is_(None))
+        ),
+    )
+    
     # Relationships
     attachments = db.relationship('Attachment', backref='transaction', lazy=True, cascade="all, delete-orphan")
     
@@ -35,7 +57,8 @@ class Transaction(db.Model):
     )
     
     def __init__(self, amount, account_id, transaction_date, category_id=None, description=None, 
-                 is_recurring=False, recurrence_pattern=None, notes=None, transfer_account_id=None):
+                 is_recurring=False, recurrence_pattern=None, notes=None, transfer_account_id=None,
+                 fingerprint=None):
         self.amount = amount
         self.account_id = account_id
         self.transaction_date = transaction_date
@@ -45,6 +68,7 @@ class Transaction(db.Model):
         self.recurrence_pattern = recurrence_pattern
         self.notes = notes
         self.transfer_account_id = transfer_account_id
+        self.fingerprint = fingerprint
     
     def __repr__(self):
         return f'<Transaction {self.amount}: {self.description}>'
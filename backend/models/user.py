@@ -1,7 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 import uuid
+from backend.services.auth.password_hasher import password_hasher
 
 # This will be imported from app.py in production
 db = SQLAlchemy()
@@ -19,6 +19,8 @@ class User(db.Model):
     last_name = db.Column(db.String(50), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Incremented by every write to the user's accounts, transactions or category rules
+    rules_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Incremented by every write to the user's category rules
     
     # Relationships
     accounts = db.relationship('Account', backref='user', lazy=True, cascade="all, delete-orphan")
@@ -34,11 +36,55 @@ class User(db.Model):
     
     def set_password(self, password):
         """Set password hash from plain text password."""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
         """Verify password against stored hash."""
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+    
+    def needs_rehash(self):
+        """Whether the stored hash uses outdated hashing parameters."""
+        return password_hasher.needs_rehash(self.password_hash)
+    
+    @staticmethod
+    def bump_data_version(user_id):
+        """
+        Record a change to the user's accounts, transactions or category rules.
+        
+        Runs in the current session so the new version commits together
+        with the write that caused it. Read endpoints derive their ETags
+        from this version, and every worker's caches are keyed on it.
+        """
+        User.query.filter_by(id=user_id).update({
+            User.data_version: User.data_version + 1,
+            # Not a profile change, so keep updated_at as it is
+            User.updated_at: User.updated_at
+        }, synchronize_session=False)
+    
+    @staticmethod
+    def get_data_version(user_id):
+        """Return the user's committed data version with a primary key lookup, 0 if there is no such user."""
+        return db.session.query(User.data_version).filter(User.id == user_id).scalar() or 0
+    
+    @staticmethod
+    def bump_rules_version(user_id):
+        """
+        Record a change to the user's category rules.
+        
+        Runs in the current session so the new version commits together
+        with the rule change. Compiled rule matchers are keyed on this
+        version, so transaction writes do not invalidate them.
+        """
+        User.query.filter_by(id=user_id).update({
+            User.rules_version: User.rules_version + 1,
+            # Not a profile change, so keep updated_at as it is
+            User.updated_at: User.updated_at
+        }, synchronize_session=False)
+    
+    @staticmethod
+    def get_rules_version(user_id):
+        """Return the user's committed category rules version, 0 if there is no such user."""
+        return db.session.query(User.rules_version).filter(User.id == user_id).scalar() or 0
     
     def __repr__(self):
         return f'<User {self.username}>'
\ No newline at end of file
@@ -0,0 +1,165 @@
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import func
+from backend.models import Transaction, Category, Account, MonthlyCategoryTotal, db
+from backend.services.analyzers.monthly_totals import month_expression
+from backend.services.analyzers.spending_analyzer import spending_recommendations
+
+# Months of spending the recommendations look at, as in SpendingAnalyzer
+RECOMMENDATION_MONTHS = 3
+
+def month_keys(months, today=None):
+    """Return the YYYY-MM keys of the last `months` calendar months, oldest first, ending with today's."""
+    today = today or datetime.now()
+    year, month = today.year, today.month
+    keys = []
+    
+    for _ in range(months):
+        keys.append(f'{year:04d}-{month:02d}')
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    
+    return keys[::-1]
+
+def _serialize_account(account):
+    """Account fields shown on the dashboard, in the /api/accounts format."""
+    return {
+        'id': account.id,
+        'name': account.name,
+        'type': account.account_type,
+        'balance': account.balance,
+        'institution': account.institution or '',
+        'currency': account.currency,
+        'is_active': account.is_active
+    }
+
+def build_dashboard_summary(user_id, months=6, recent_limit=10):
+    """
+    Gather everything the dashboard shows in one pass.
+    
+    Parameters:
+    - user_id: Owner of the data
+    - months: Calendar months of income and spending trends (default: 6)
+    - recent_limit: Number of recent transactions (default: 10)
+    
+    The user's accounts and category names are loaded once and shared by
+    every section. Spending comes from the monthly rollup table, read once
+    for the trends, this month's categories and the recommendations, and
+    income from one grouped query, so the cost does not grow with the
+    number of transactions beyond the recent ones returned.
+    Recommendations follow the rules of the spending recommendations
+    endpoint, over the last RECOMMENDATION_MONTHS calendar months.
+    
+    Returns:
+    - Dict with accounts, totals, recent_transactions, spending_by_category,
+      monthly_trends and recommendations
+    """
+    accounts = Account.query.filter_by(user_id=user_id).all()
+    account_names = {account.id: account.name for account in accounts}
+    category_names = dict(db.session.query(Category.id, Category.name).filter(Category.user_id == user_id).all())
+    
+    # Account totals
+    assets = sum(account.balance for account in accounts if account.balance > 0)
+    debt = sum(-account.balance for account in accounts if account.balance < 0)
+    
+    # Recent transactions, with names resolved from the loaded accounts and categories
+    recent = []
+    if accounts and recent_limit:
+        recent = Transaction.query.filter(
+            Transaction.account_id.in_(account_names)
+        ).order_by(
+            Transaction.transaction_date.desc(), Transaction.id.desc()
+        ).limit(recent_limit).all()
+    
+    # Read the rollup once for the trends, this month's spending and the recommendations
+    keys = month_keys(max(months, RECOMMENDATION_MONTHS))
+    spending = {key: defaultdict(float) for key in keys}
+    rollup = db.session.query(
+        MonthlyCategoryTotal.month,
+        MonthlyCategoryTotal.category_id,
+        func.sum(MonthlyCategoryTotal.total_amount)
+    ).filter(
+        MonthlyCategoryTotal.user_id == user_id,
+        MonthlyCategoryTotal.month >= keys[0]
+    ).group_by(
+        MonthlyCategoryTotal.month, MonthlyCategoryTotal.category_id
+    ).all()
+    
+    for row_month, category_id, amount in rollup:
+        if row_month in spending:
+            spending[row_month][category_id] += amount
+    
+    # Income per month, excluding transfers
+    trend_keys = keys[-months:]
+    month = month_expression(Transaction.transaction_date)
+    income = dict(db.session.query(
+        month, func.sum(Transaction.amount)
+    ).join(
+        Account, Transaction.account_id == Account.id
+    ).filter(
+        Account.user_id == user_id,
+        Transaction.amount > 0,
+        Transaction.transfer_account_id.is_(None),
+        Transaction.transaction_date >= datetime.strptime(trend_keys[0], '%Y-%m')
+    ).group_by(month).all())
+    
+    # Spending by category name per month; categories sharing a name are one row
+    spending_by_name = {}
+    for key, month_spending in spending.items():
+        by_name = spending_by_name[key] = defaultdict(float)
+        for category_id, amount in month_spending.items():
+            by_name[category_names.get(category_id, 'Uncategorized')] += amount
+    
+    # Recommendations from the months that had spending, as the analyzer's trends report them
+    recommendation_months = [spending_by_name[key] for key in keys[-RECOMMENDATION_MONTHS:] if spending_by_name[key]]
+    recommendation_totals = defaultdict(float)
+    for month_spending in recommendation_months:
+        for name, amount in month_spending.items():
+            recommendation_totals[name] += amount
+    
+    # This month's spending by category
+    current_month = keys[-1]
+    by_name = spending_by_name[current_month]
+    month_total = sum(by_name.values())
+    
+    return {
+        'accounts': [_serialize_account(account) for account in accounts],
+        'totals': {
+            'assets': round(assets, 2),
+            'debt': round(debt, 2),
+            'net_worth': round(assets - debt, 2)
+        },
+        'recent_transactions': [
+            {
+                'id': transaction.id,
+                'date': transaction.transaction_date.strftime('%Y-%m-%d'),
+                'description': transaction.description,
+                'amount': transaction.amount,
+                'category': category_names.get(transaction.category_id) if transaction.category_id else None,
+                'account_id': transaction.account_id,
+                'account_name': account_names.get(transaction.account_id)
+            }
+            for transaction in recent
+        ],
+        'spending_by_category': {
+            'month': current_month,
+            'categories': [
+                {
+                    'category': name,
+                    'total_amount': round(amount, 2),
+                    'percentage': round(amount / month_total * 100, 2) if month_total else 0.0
+                }
+                for name, amount in sorted(by_name.items(), key=lambda item: item[1], reverse=True)
+            ]
+        },
+        'monthly_trends': [
+            {
+                'month': key,
+                'income': round(income.get(key) or 0.0, 2),
+                'expenses': round(sum(spending[key].values()), 2)
+            }
+            for key in trend_keys
+        ],
+        'recommendations': spending_recommendations(recommendation_totals, recommendation_months, RECOMMENDATION_MONTHS)
+    }
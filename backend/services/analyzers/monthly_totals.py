@@ -0,0 +1,144 @@
+from collections import defaultdict
+from sqlalchemy import func, insert
+from backend.models import Transaction, Account, MonthlyCategoryTotal, db
+
+def month_key(transaction_date):
+    """Return the YYYY-MM rollup key for a date."""
+    return transaction_date.strftime('%Y-%m')
+
+def month_expression(column):
+    """SQL expression formatting a datetime column as YYYY-MM."""
+    if db.engine.dialect.name == 'postgresql':
+        return func.to_char(column, 'YYYY-MM')
+    return func.strftime('%Y-%m', column)
+
+def apply_expense_totals(user_id, account_id, expenses, sign=1):
+    """
+    Add a batch of transactions for one account to the monthly rollup.
+    
+    Parameters:
+    - user_id: Owner of the account
+    - account_id: Account the transactions belong to
+    - expenses: Iterable of (transaction_date, category_id, amount, transfer_account_id)
+    - sign: 1 to add the transactions, -1 to remove them
+    
+    Only non-transfer expenses are counted; other rows are ignored. Changes
+    are made in the current session so they commit with the write that
+    caused them.
+    """
+    deltas = defaultdict(lambda: [0.0, 0])
+    for transaction_date, category_id, amount, transfer_account_id in expenses:
+        if amount >= 0 or transfer_account_id:
+            continue
+        key = (month_key(transaction_date), category_id)
+        deltas[key][0] += abs(amount) * sign
+        deltas[key][1] += sign
+    
+    if not deltas:
+        return
+    
+    # Load the affected rollup rows in one query
+    months = {month for month, _ in deltas}
+    existing = {
+        (row.month, row.category_id): row.id
+        for row in MonthlyCategoryTotal.query.filter(
+            MonthlyCategoryTotal.account_id == account_id,
+            MonthlyCategoryTotal.month.in_(months)
+        ).all()
+    }
+    
+    for (month, category_id), (amount_delta, count_delta) in deltas.items():
+        row_id = existing.get((month, category_id))
+        if row_id:
+            # Increment in SQL so concurrent writers don't lose updates
+            MonthlyCategoryTotal.query.filter_by(id=row_id).update({
+                MonthlyCategoryTotal.total_amount: MonthlyCategoryTotal.total_amount + amount_delta,
+                MonthlyCategoryTotal.transaction_count: MonthlyCategoryTotal.transaction_count + count_delta
+            }, synchronize_session=False)
+        elif count_delta > 0:
+            db.session.add(MonthlyCategoryTotal(
+                user_id=user_id,
+                account_id=account_id,
+                month=month,
+                category_id=category_id,
+                total_amount=amount_delta,
+                transaction_count=count_delta
+            ))
+    
+    # Drop rows whose transactions have all been removed
+    MonthlyCategoryTotal.query.filter(
+        MonthlyCategoryTotal.account_id == account_id,
+        MonthlyCategoryTotal.month.in_(months),
+        MonthlyCategoryTotal.transaction_count <= 0
+    ).delete(synchronize_session=False)
+
+def add_transaction_to_totals(user_id, transaction):
+    """Count a single transaction in the monthly rollup."""
+    apply_expense_totals(user_id, transaction.account_id, [(
+        transaction.transaction_date,
+        transaction.category_id,
+        transaction.amount,
+        transaction.transfer_account_id
+    )])
+
+def remove_transaction_from_totals(user_id, transaction):
+    """Remove a single transaction from the monthly rollup."""
+    apply_expense_totals(user_id, transaction.account_id, [(
+        transaction.transaction_date,
+        transaction.category_id,
+        transaction.amount,
+        transaction.transfer_account_id
+    )], sign=-1)
+
+def rebuild_monthly_totals(user_id=None):
+    """
+    Recompute the monthly rollup from the transactions table.
+    
+    Parameters:
+    - user_id: Only rebuild this user's rows (default: all users)
+    
+    Returns:
+    - Number of rollup rows written
+    """
+    delete_query = MonthlyCategoryTotal.query
+    if user_id:
+        delete_query = delete_query.filter(MonthlyCategoryTotal.user_id == user_id)
+    delete_query.delete(synchronize_session=False)
+    
+    month = month_expression(Transaction.transaction_date)
+    query = db.session.query(
+        Account.user_id,
+        Transaction.account_id,
+        month.label('month'),
+        Transaction.category_id,
+        func.sum(-Transaction.amount),
+        func.count(Transaction.id)
+    ).join(
+        Account, Transaction.account_id == Account.id
+    ).filter(
+        Transaction.amount < 0,
+        Transaction.transfer_account_id.is_(None)
+    )
+    
+    if user_id:
+        query = query.filter(Account.user_id == user_id)
+    
+    rows = [
+        {
+            'user_id': row_user_id,
+            'account_id': account_id,
+            'month': row_month,
+            'category_id': category_id,
+            'total_amount': total_amount,
+            'transaction_count': transaction_count
+        }
+        for row_user_id, account_id, row_month, category_id, total_amount, transaction_count
+        in query.group_by(Account.user_id, Transaction.account_id, month, Transaction.category_id)
+    ]
+    
+    if rows:
+        db.session.execute(insert(MonthlyCategoryTotal), rows)
+    
+    db.session.commit()
+    
+    return len(rows)
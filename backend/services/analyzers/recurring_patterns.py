@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+# Words dropped when grouping descriptions
+_COMMON_WORDS = {'the', 'and', 'for', 'inc', 'ltd', 'llc', 'co', 'company'}
+
+# Average-interval bounds in days for each cadence, checked in order
+FREQUENCY_BOUNDS = [
+    ('monthly', 25, 35),
+    ('bi-weekly', 13, 16),
+    ('weekly', 6, 8)
+]
+
+# Occurrences needed to establish a pattern, and the maximum relative
+# distance of any amount from the mean amount
+MIN_INSTANCES = 3
+AMOUNT_TOLERANCE = 0.1
+
+# Days before a series' latest charge that its statistics cover, the six
+# months the recurring-cost views look back over
+SERIES_WINDOW_DAYS = 180
+
+# Occurrences per year used for annual cost; anything not monthly or bi-weekly counts as weekly
+ANNUAL_MULTIPLIERS = {'monthly': 12, 'bi-weekly': 26}
+
+# Deletes every ASCII character that is neither a letter nor whitespace
+_ASCII_NON_LETTERS = str.maketrans('', '', ''.join(
+    chr(code) for code in range(128) if not (chr(code).isalpha() or chr(code).isspace())
+))
+
+def normalize_recurring_description(description):
+    """
+    Normalize one description so similar ones group together.
+    
+    Lowercases, keeps only letters and whitespace and drops common words.
+    Returns None if nothing is left.
+    """
+    if not description:
+        return None
+    
+    description = description.lower()
+    if description.isascii():
+        description = description.translate(_ASCII_NON_LETTERS)
+    else:
+        description = ''.join(char for char in description if char.isalpha() or char.isspace())
+    
+    return ' '.join(word for word in description.split() if word not in _COMMON_WORDS) or None
+
+def normalize_descriptions(descriptions):
+    """
+    Normalize a Series of descriptions so similar ones group together.
+    
+    Each distinct description is normalized once. Missing descriptions
+    and ones that normalize to nothing become None.
+    """
+    codes, uniques = pd.factorize(descriptions)
+    
+    # factorize marks missing descriptions with -1, which picks the trailing None
+    values = np.array([normalize_recurring_description(description) for description in uniques] + [None], dtype=object)
+    return pd.Series(values[codes], index=descriptions.index, dtype=object)
+
+def cadence_for_interval(average_interval):
+    """Return the cadence name for an average interval in days."""
+    for name, low, high in FREQUENCY_BOUNDS:
+        if low <= average_interval <= high:
+            return name
+    return 'irregular'
+
+def annual_cost(amount, frequency):
+    """Yearly cost of a recurring amount at the given cadence."""
+    return round(amount * ANNUAL_MULTIPLIERS.get(frequency, 52), 2)
@@ -0,0 +1,309 @@
+import uuid
+import pandas as pd
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, bindparam, case
+from backend.models import Transaction, Account, Category, RecurringSeries, db
+from backend.services.analyzers.recurring_patterns import (
+    MIN_INSTANCES, AMOUNT_TOLERANCE, SERIES_WINDOW_DAYS, normalize_recurring_description, normalize_descriptions,
+    cadence_for_interval
+)
+
+# Series IDs per IN (...) clause
+SERIES_CHUNK_SIZE = 5000
+
+def _chunks(values, size=SERIES_CHUNK_SIZE):
+    """Split a list into lists of at most size items."""
+    values = list(values)
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+def series_statistics(count, mean_amount, min_amount, max_amount, first_seen, last_seen):
+    """
+    Derive cadence, next expected date and whether the charges recur from a series' aggregates.
+    
+    Amounts are positive expense amounts. A series recurs with at least
+    MIN_INSTANCES transactions whose amounts are all within the tolerance
+    of the mean.
+    """
+    cadence = None
+    expected_next_date = None
+    if count >= 2:
+        average_interval = (last_seen - first_seen).total_seconds() / 86400 / (count - 1)
+        cadence = cadence_for_interval(average_interval)
+        expected_next_date = last_seen + timedelta(days=average_interval)
+    
+    deviation = max(max_amount - mean_amount, mean_amount - min_amount) / mean_amount if mean_amount else 1.0
+    
+    return {
+        'cadence': cadence,
+        'expected_next_date': expected_next_date,
+        'is_recurring': count >= MIN_INSTANCES and deviation < AMOUNT_TOLERANCE
+    }
+
+def is_tracked_expense(amount, transfer_account_id):
+    """Only non-transfer expenses belong to recurring series."""
+    return amount < 0 and not transfer_account_id
+
+def assign_recurring_series(user_id, transactions):
+    """
+    Point a batch of transactions at their recurring series, creating missing series.
+    
+    Parameters:
+    - user_id: Owner of the transactions
+    - transactions: List of dicts with description, amount and
+      transfer_account_id, and category_id for new series. Each gets a
+      recurring_series_id key, None for income and transfers.
+    
+    Returns:
+    - Set of series IDs the batch was assigned to
+    
+    Call refresh_recurring_series with the returned IDs once the
+    transactions are written.
+    """
+    keys = {}
+    for transaction in transactions:
+        transaction['recurring_series_id'] = None
+        if is_tracked_expense(transaction['amount'], transaction.get('transfer_account_id')):
+            key = normalize_recurring_description(transaction.get('description'))
+            if key:
+                keys.setdefault(key, transaction)
+    
+    if not keys:
+        return set()
+    
+    # Look up the existing series in one query per chunk
+    series_ids = {}
+    for chunk in _chunks(keys):
+        series_ids.update(db.session.query(
+            RecurringSeries.normalized_description, RecurringSeries.id
+        ).filter(
+            RecurringSeries.user_id == user_id,
+            RecurringSeries.normalized_description.in_(chunk)
+        ).all())
+    
+    # Create the rest, described by the first transaction that needs them
+    now = datetime.utcnow()
+    new_series = []
+    for key, transaction in keys.items():
+        if key not in series_ids:
+            series_ids[key] = str(uuid.uuid4())
+            new_series.append({
+                'id': series_ids[key],
+                'user_id': user_id,
+                'normalized_description': key,
+                'description': transaction.get('description'),
+                'category_id': transaction.get('category_id'),
+                'transaction_count': 0,
+                'is_recurring': False,
+                'created_at': now,
+                'updated_at': now
+            })
+    
+    if new_series:
+        db.session.execute(insert(RecurringSeries), new_series)
+    
+    for transaction in transactions:
+        if is_tracked_expense(transaction['amount'], transaction.get('transfer_account_id')):
+            key = normalize_recurring_description(transaction.get('description'))
+            transaction['recurring_series_id'] = series_ids.get(key)
+    
+    return set(series_ids.values())
+
+def refresh_recurring_series(series_ids):
+    """
+    Recompute series statistics from their transactions.
+    
+    Uses two grouped queries per chunk of series over the recurring-series
+    index, so the cost depends on the size of the touched series rather
+    than the user's history. The statistics cover the SERIES_WINDOW_DAYS
+    before each series' latest charge, so a price change or a gap long
+    ago does not keep a current subscription from counting as recurring.
+    Series left without transactions are deleted. Changes are made in the
+    current session so they commit with the write that caused them.
+    Transactions' own is_recurring and recurrence_pattern belong to the
+    user and are never changed here.
+    """
+    series_ids = [series_id for series_id in set(series_ids) if series_id]
+    if not series_ids:
+        return
+    
+    # Make pending inserts, updates and deletes visible to the aggregate
+    db.session.flush()
+    
+    empty_ids = []
+    
+    for chunk in _chunks(series_ids):
+        last_seen = dict(db.session.query(
+            Transaction.recurring_series_id,
+            func.max(Transaction.transaction_date)
+        ).filter(
+            Transaction.recurring_series_id.in_(chunk)
+        ).group_by(Transaction.recurring_series_id).all())
+        
+        stats = {}
+        if last_seen:
+            window_start = case(
+                {series_id: latest - timedelta(days=SERIES_WINDOW_DAYS) for series_id, latest in last_seen.items()},
+                value=Transaction.recurring_series_id
+            )
+            stats = {
+                row[0]: row[1:] for row in db.session.query(
+                    Transaction.recurring_series_id,
+                    func.count(Transaction.id),
+                    func.avg(-Transaction.amount),
+                    func.min(-Transaction.amount),
+                    func.max(-Transaction.amount),
+                    func.min(Transaction.transaction_date)
+                ).filter(
+                    Transaction.recurring_series_id.in_(list(last_seen)),
+                    Transaction.transaction_date >= window_start
+                ).group_by(Transaction.recurring_series_id)
+            }
+        
+        for series in RecurringSeries.query.filter(RecurringSeries.id.in_(chunk)).all():
+            if series.id not in stats:
+                empty_ids.append(series.id)
+                continue
+            
+            count, mean_amount, min_amount, max_amount, first_seen = stats[series.id]
+            series.transaction_count = count
+            series.mean_amount = mean_amount
+            series.min_amount = min_amount
+            series.max_amount = max_amount
+            series.first_seen = first_seen
+            series.last_seen = last_seen[series.id]
+            
+            derived = series_statistics(count, mean_amount, min_amount, max_amount, first_seen, series.last_seen)
+            series.cadence = derived['cadence']
+            series.expected_next_date = derived['expected_next_date']
+            series.is_recurring = derived['is_recurring']
+    
+    for chunk in _chunks(empty_ids):
+        RecurringSeries.query.filter(RecurringSeries.id.in_(chunk)).delete(synchronize_session=False)
+
+def update_transaction_series(user_id, transaction, previous_series_id=None):
+    """
+    Match a written transaction against its user's series.
+    
+    Parameters:
+    - user_id: Owner of the transaction
+    - transaction: Transaction that was added or changed
+    - previous_series_id: Series the transaction belonged to before the change
+    """
+    records = [{
+        'description': transaction.description,
+        'amount': transaction.amount,
+        'transfer_account_id': transaction.transfer_account_id,
+        'category_id': transaction.category_id
+    }]
+    assign_recurring_series(user_id, records)
+    transaction.recurring_series_id = records[0]['recurring_series_id']
+    
+    refresh_recurring_series([transaction.recurring_series_id, previous_series_id])
+
+def get_recurring_series(user_id, since):
+    """
+    Return a user's recurring series charged since a date, with their category names.
+    
+    Reads the statistics kept up to date as transactions are written,
+    through the series' (user, is_recurring, last_seen) index, so no
+    transactions are scanned.
+    
+    Returns:
+    - List of (RecurringSeries, category name) tuples
+    """
+    return db.session.query(RecurringSeries, Category.name).outerjoin(
+        Category, RecurringSeries.category_id == Category.id
+    ).filter(
+        RecurringSeries.user_id == user_id,
+        RecurringSeries.is_recurring.is_(True),
+        RecurringSeries.last_seen >= since
+    ).all()
+
+def rebuild_recurring_series(user_id=None):
+    """
+    Recompute the recurring series from the transactions table.
+    
+    Parameters:
+    - user_id: Only rebuild this user's series (default: all users)
+    
+    Returns:
+    - Number of series written
+    """
+    account_ids = db.session.query(Account.id)
+    if user_id:
+        account_ids = account_ids.filter(Account.user_id == user_id)
+    
+    # Detach transactions before dropping the series they point at
+    Transaction.query.filter(Transaction.account_id.in_(account_ids.scalar_subquery())).update({
+        Transaction.recurring_series_id: None,
+        Transaction.updated_at: Transaction.updated_at
+    }, synchronize_session=False)
+    
+    delete_query = RecurringSeries.query
+    if user_id:
+        delete_query = delete_query.filter(RecurringSeries.user_id == user_id)
+    delete_query.delete(synchronize_session=False)
+    
+    query = db.session.query(
+        Transaction.id,
+        Account.user_id,
+        Transaction.description,
+        Transaction.category_id
+    ).join(
+        Account, Transaction.account_id == Account.id
+    ).filter(
+        Transaction.amount < 0,
+        Transaction.transfer_account_id.is_(None)
+    )
+    
+    if user_id:
+        query = query.filter(Account.user_id == user_id)
+    
+    rows = query.order_by(Transaction.transaction_date, Transaction.id).all()
+    if not rows:
+        db.session.commit()
+        return 0
+    
+    # Group the expenses by user and normalized description, oldest first
+    expenses = pd.DataFrame(rows, columns=['id', 'user_id', 'description', 'category_id'])
+    expenses['normalized_description'] = normalize_descriptions(expenses['description'])
+    expenses = expenses.dropna(subset=['normalized_description'])
+    
+    now = datetime.utcnow()
+    series = expenses.groupby(['user_id', 'normalized_description'], sort=False).first().reset_index()
+    series['series_id'] = [str(uuid.uuid4()) for _ in range(len(series))]
+    
+    db.session.execute(insert(RecurringSeries), [
+        {
+            'id': row.series_id,
+            'user_id': row.user_id,
+            'normalized_description': row.normalized_description,
+            'description': row.description,
+            'category_id': row.category_id,
+            'transaction_count': 0,
+            'is_recurring': False,
+            'created_at': now,
+            'updated_at': now
+        }
+        for row in series.itertuples(index=False)
+    ])
+    
+    # Point every expense at its series
+    expenses = expenses.merge(
+        series[['user_id', 'normalized_description', 'series_id']],
+        on=['user_id', 'normalized_description']
+    )
+    statement = Transaction.__table__.update().where(
+        Transaction.__table__.c.id == bindparam('transaction_id')
+    ).values(recurring_series_id=bindparam('series_id'))
+    assignments = [
+        {'transaction_id': transaction_id, 'series_id': series_id}
+        for transaction_id, series_id in zip(expenses['id'], expenses['series_id'])
+    ]
+    for chunk in _chunks(assignments):
+        db.session.execute(statement, chunk)
+    
+    refresh_recurring_series(series['series_id'])
+    db.session.commit()
+    
+    return len(series)
@@ -1,7 +1,63 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from backend.models import Transaction, Category, Account
+from sqlalchemy import func
+from backend.models import Transaction, Category, Account, MonthlyCategoryTotal, db
+from backend.services.analyzers.monthly_totals import month_key
+
+# Share of total spending above which a category gets a budget suggestion
+HIGH_SPENDING_PERCENTAGE = 15
+
+# Growth from the first to the last month that counts as an increasing trend
+INCREASE_RATIO = 1.2
+
+def spending_recommendations(category_totals, monthly_spending, months):
+    """
+    Suggest where to cut back, from spending that is already loaded.
+    
+    Parameters:
+    - category_totals: Dict of category name to amount spent over the period
+    - monthly_spending: List of dicts of category name to amount spent,
+      one per month with spending, oldest first
+    - months: Length of the period in months, for the messages
+    
+    Categories taking more than HIGH_SPENDING_PERCENTAGE of spending are
+    reported first, highest first, then categories whose spending in the
+    last month is more than INCREASE_RATIO times the first month's.
+    
+    Returns:
+    - List of recommendation dicts with type, category, message and action
+    """
+    recommendations = []
+    
+    total_spent = sum(category_totals.values())
+    if total_spent:
+        for category, amount in sorted(category_totals.items(), key=lambda item: item[1], reverse=True):
+            percentage = round(amount / total_spent * 100, 2)
+            if percentage > HIGH_SPENDING_PERCENTAGE:
+                recommendations.append({
+                    'type': 'high_spending',
+                    'category': category,
+                    'message': f"Your spending on {category} is {percentage}% of your total expenses.",
+                    'action': f"Consider setting a budget for {category} to reduce overall expenses."
+                })
+    
+    if len(monthly_spending) > 1:
+        first, last = monthly_spending[0], monthly_spending[-1]
+        for category in sorted(set(first) | set(last)):
+            previous_amount = first.get(category, 0.0)
+            current_amount = last.get(category, 0.0)
+            # A category with no spending in the first month has no meaningful increase
+            if previous_amount > 0 and current_amount > previous_amount * INCREASE_RATIO:
+                increase = round((current_amount / previous_amount - 1) * 100, 2)
+                recommendations.append({
+                    'type': 'increasing_trend',
+                    'category': category,
+                    'message': f"Your spending on {category} has increased by {increase}% over the past {months} months.",
+                    'action': f"Review your {category} expenses to identify areas for potential savings."
+                })
+    
+    return recommendations
 
 class SpendingAnalyzer:
     """Analyze spending patterns and provide insights."""
@@ -16,52 +72,44 @@ class SpendingAnalyzer:
         Returns:
         - DataFrame with categories and their total spending
         """
-        # Get accounts for this user
-        accounts = Account.query.filter_by(user_id=self.user_id).all()
-        account_ids = [account.id for account in accounts]
-        
         if account_id:
-            if account_id not in account_ids:
+            account = Account.query.filter_by(id=account_id, user_id=self.user_id).first()
+            if not account:
                 raise ValueError("Invalid account ID")
-            account_ids = [account_id]
         
-        # Build query for transactions
-        query = Transaction.query.filter(
-            Transaction.account_id.in_(account_ids),
+        # Sum expenses per category in the database so only one row per
+        # category is returned
+        query = db.session.query(
+            Category.name.label('category'),
+            func.sum(-Transaction.amount).label('total_amount')
+        ).join(
+            Account, Transaction.account_id == Account.id
+        ).outerjoin(
+            Category, Transaction.category_id == Category.id
+        ).filter(
+            Account.user_id == self.user_id,
             Transaction.amount < 0,  # Only expenses
             Transaction.transfer_account_id.is_(None)  # Exclude transfers
         )
         
+        if account_id:
+            query = query.filter(Transaction.account_id == account_id)
+        
         if start_date:
             query = query.filter(Transaction.transaction_date >= start_date)
         
         if end_date:
             query = query.filter(Transaction.transaction_date <= end_date)
         
-        transactions = query.all()
-        
-        # Prepare data for analysis
-        data = []
-        for transaction in transactions:
-            category_name = "Uncategorized"
-            if transaction.category_id:
-                category = Category.query.get(transaction.category_id)
-                if category:
-                    category_name = category.name
-            
-            data.append({
-                'amount': abs(transaction.amount),  # Convert to positive for easier analysis
-                'category': category_name,
-                'date': transaction.transaction_date
-            })
+        rows = query.group_by(Transaction.category_id, Category.name).all()
         
-        if not data:
+        if not rows:
             return pd.DataFrame(columns=['category', 'total_amount', 'percentage'])
         
-        # Create DataFrame and group by category
-        df = pd.DataFrame(data)
-        category_spending = df.groupby('category')['amount'].sum().reset_index()
-        category_spending = category_spending.rename(columns={'amount': 'total_amount'})
+        # Categories that share a name are reported as a single row
+        df = pd.DataFrame(rows, columns=['category', 'total_amount'])
+        df['category'] = df['category'].fillna('Uncategorized')
+        category_spending = df.groupby('category')['total_amount'].sum().reset_index()
         
         # Calculate percentages
         total_spent = category_spending['total_amount'].sum()
@@ -79,47 +127,38 @@ class SpendingAnalyzer:
         Parameters:
         - months: Number of months to analyze (default: 6)
         
+        Whole calendar months are reported, starting with the month that
+        contains the date 30 * months days ago.
+        
         Returns:
         - DataFrame with monthly totals and category breakdowns
         """
-        # Calculate date range
+        # Calculate the range of months to include
         end_date = datetime.now()
         start_date = end_date - timedelta(days=30 * months)
         
-        # Get accounts for this user
-        accounts = Account.query.filter_by(user_id=self.user_id).all()
-        account_ids = [account.id for account in accounts]
-        
-        # Get expenses
-        expenses = Transaction.query.filter(
-            Transaction.account_id.in_(account_ids),
-            Transaction.amount < 0,  # Only expenses
-            Transaction.transfer_account_id.is_(None),  # Exclude transfers
-            Transaction.transaction_date >= start_date,
-            Transaction.transaction_date <= end_date
+        # Read per-month category totals from the rollup table, so the cost
+        # depends on the number of months rather than transactions
+        rows = db.session.query(
+            MonthlyCategoryTotal.month,
+            Category.name,
+            func.sum(MonthlyCategoryTotal.total_amount)
+        ).outerjoin(
+            Category, MonthlyCategoryTotal.category_id == Category.id
+        ).filter(
+            MonthlyCategoryTotal.user_id == self.user_id,
+            MonthlyCategoryTotal.month >= month_key(start_date),
+            MonthlyCategoryTotal.month <= month_key(end_date)
+        ).group_by(
+            MonthlyCategoryTotal.month, Category.name
         ).all()
         
-        # Prepare data for analysis
-        data = []
-        for expense in expenses:
-            category_name = "Uncategorized"
-            if expense.category_id:
-                category = Category.query.get(expense.category_id)
-                if category:
-                    category_name = category.name
-            
-            data.append({
-                'amount': abs(expense.amount),
-                'category': category_name,
-                'date': expense.transaction_date,
-                'month': expense.transaction_date.strftime('%Y-%m')
-            })
-        
-        if not data:
+        if not rows:
             return pd.DataFrame(columns=['month', 'total_amount'])
         
         # Create DataFrame and analyze
-        df = pd.DataFrame(data)
+        df = pd.DataFrame(rows, columns=['month', 'category', 'amount'])
+        df['category'] = df['category'].fillna('Uncategorized')
         
         # Monthly totals
         monthly_totals = df.groupby('month')['amount'].sum().reset_index()
@@ -222,47 +261,15 @@ class SpendingAnalyzer:
         total_spent = category_spending['total_amount'].sum()
         monthly_average = total_spent / months
         
-        # Find categories that take up significant portions of spending
-        high_spending_categories = category_spending[category_spending['percentage'] > 15]
-        
         # Get monthly trends
         monthly_trends = self.get_monthly_spending_trends(months)
+        category_columns = [col for col in monthly_trends.columns if col not in ['month', 'total_amount']]
         
-        # Check for spending increases
-        increasing_categories = []
-        if not monthly_trends.empty and len(monthly_trends) > 1:
-            category_columns = [col for col in monthly_trends.columns if col not in ['month', 'total_amount']]
-            
-            for category in category_columns:
-                if category in monthly_trends.columns:
-                    values = monthly_trends[category].values
-                    if len(values) >= 2 and values[-1] > values[0] * 1.2:  # 20% increase
-                        increasing_categories.append({
-                            'category': category,
-                            'increase_percentage': round((values[-1] / values[0] - 1) * 100, 2),
-                            'current_amount': values[-1]
-                        })
-        
-        # Generate recommendations
-        recommendations = []
-        
-        # High spending categories
-        for _, row in high_spending_categories.iterrows():
-            recommendations.append({
-                'type': 'high_spending',
-                'category': row['category'],
-                'message': f"Your spending on {row['category']} is {row['percentage']}% of your total expenses.",
-                'action': f"Consider setting a budget for {row['category']} to reduce overall expenses."
-            })
-        
-        # Increasing trends
-        for category in increasing_categories:
-            recommendations.append({
-                'type': 'increasing_trend',
-                'category': category['category'],
-                'message': f"Your spending on {category['category']} has increased by {category['increase_percentage']}% over the past {months} months.",
-                'action': f"Review your {category['category']} expenses to identify areas for potential savings."
-            })
+        recommendations = spending_recommendations(
+            dict(zip(category_spending['category'], category_spending['total_amount'].tolist())),
+            monthly_trends[category_columns].to_dict('records'),
+            months
+        )
         
         return {
             'status': 'success',
@@ -0,0 +1,140 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.exceptions import ServiceUnavailable
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_HASH_METHOD = 'scrypt'
+
+class HashingBusy(ServiceUnavailable):
+    """Raised when too many password hashes are already running or queued."""
+    
+    description = "Too many sign-in requests right now. Please try again shortly."
+
+class PasswordHasher:
+    """
+    Runs password hashing on a small bounded thread pool.
+    
+    The pool size caps how many hashes run at once, so a burst of logins
+    can't take every CPU from the other endpoints, and callers beyond the
+    queue limit are turned away with HashingBusy instead of piling up.
+    Pool size plus queue limit must stay below the request threads of a
+    worker, or every thread can end up waiting on a hash. hashlib releases the GIL while hashing, so the other threads of a
+    gthread worker (see gunicorn.conf.py) keep serving requests meanwhile.
+    Queue and hash times are recorded for the stats.
+    """
+    
+    def __init__(self, method=DEFAULT_HASH_METHOD, max_workers=2, max_queue=2):
+        self.method = method
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._method_prefix = None
+        self._lock = threading.Lock()
+        self._reset_stats()
+    
+    def init_app(self, app):
+        """Configure the hash method and pool limits from the app config."""
+        self.method = app.config.get('PASSWORD_HASH_METHOD', DEFAULT_HASH_METHOD)
+        self.max_workers = app.config.get('PASSWORD_HASH_WORKERS', 2)
+        self.max_queue = app.config.get('PASSWORD_HASH_QUEUE_SIZE', 2)
+        
+        # Let werkzeug fill in the method's default parameters, e.g. the
+        # scrypt cost or pbkdf2 iterations, by hashing an empty password once
+        method_prefix = generate_password_hash('', self.method).split('$', 1)[0]
+        
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = None
+            self._method_prefix = method_prefix
+            self._reset_stats()
+        
+        app.extensions['password_hasher'] = self
+    
+    def _reset_stats(self):
+        """Zero the counters and timings."""
+        self._pending = 0
+        self._stats = {
+            'completed': 0,
+            'rejected': 0,
+            'queue_seconds_total': 0.0,
+            'queue_seconds_max': 0.0,
+            'hash_seconds_total': 0.0,
+            'hash_seconds_max': 0.0
+        }
+    
+    def _pool(self):
+        """Create the thread pool on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix='password-hash'
+            )
+        return self._executor
+    
+    def _run(self, function, *args):
+        """Run a hashing function on the pool and wait for its result."""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._stats['rejected'] += 1
+                raise HashingBusy()
+            self._pending += 1
+            executor = self._pool()
+        
+        submitted_at = time.perf_counter()
+        
+        def timed_call():
+            started_at = time.perf_counter()
+            try:
+                return function(*args)
+            finally:
+                finished_at = time.perf_counter()
+                self._record(started_at - submitted_at, finished_at - started_at)
+        
+        try:
+            return executor.submit(timed_call).result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+    
+    def _record(self, queue_seconds, hash_seconds):
+        """Add one hash's queue and run time to the stats."""
+        with self._lock:
+            self._stats['completed'] += 1
+            self._stats['queue_seconds_total'] += queue_seconds
+            self._stats['queue_seconds_max'] = max(self._stats['queue_seconds_max'], queue_seconds)
+            self._stats['hash_seconds_total'] += hash_seconds
+            self._stats['hash_seconds_max'] = max(self._stats['hash_seconds_max'], hash_seconds)
+    
+    def hash(self, password):
+        """Hash a password with the configured method."""
+        return self._run(generate_password_hash, password, self.method)
+    
+    def verify(self, password_hash, password):
+        """Check a password against a stored hash."""
+        return self._run(check_password_hash, password_hash, password)
+    
+    def needs_rehash(self, password_hash):
+        """Whether a stored hash was made with a method or cost other than the configured one."""
+        if self._method_prefix is None:
+            # Not configured yet, so there is no target to compare against
+            return False
+        
+        return password_hash.split('$', 1)[0] != self._method_prefix
+    
+    def stats(self):
+        """Return the pool limits, current load, counters and timings."""
+        with self._lock:
+            completed = self._stats['completed']
+            return {
+                'method': self.method,
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'in_flight': self._pending,
+                **self._stats,
+                'queue_seconds_avg': self._stats['queue_seconds_total'] / completed if completed else 0.0,
+                'hash_seconds_avg': self._stats['hash_seconds_total'] / completed if completed else 0.0
+            }
+
+# Shared instance, configured by create_app
+password_hasher = PasswordHasher()
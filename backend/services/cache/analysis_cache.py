@@ -0,0 +1,232 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from flask import g, has_request_context
+from backend.models import User
+from backend.services.http.json_provider import FastJSONProvider
+
+class MemoryCacheBackend:
+    """In-process LRU cache with per-entry expiry. Not shared between workers."""
+    
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key, value, ttl):
+        """Store a value for ttl seconds, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+class SqliteCacheBackend:
+    """
+    LRU cache stored in a local SQLite file.
+    
+    Every worker process on the host opens the same file, so cached results
+    are shared between gunicorn workers. Values are stored as JSON, never
+    pickled, so whoever can write the file cannot run code in the app,
+    and the file is only readable and writable by the user running it.
+    """
+    
+    def __init__(self, path, max_entries=1024):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        
+        self._create_private_file()
+        connection = self._connection()
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entries ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+            'expires_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed_at ON cache_entries (accessed_at)'
+        )
+    
+    def _create_private_file(self):
+        """Create the cache file with owner-only permissions, refusing one owned by someone else."""
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+        
+        if os.stat(self.path).st_uid != os.geteuid():
+            raise ValueError(f"Analysis cache file {self.path} is owned by another user")
+        os.chmod(self.path, 0o600)
+    
+    def _connection(self):
+        """Return this thread's connection to the cache file."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+    
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired."""
+        connection = self._connection()
+        now = time.time()
+        row = connection.execute(
+            'SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        try:
+            value = json.loads(row[0])
+        except ValueError:
+            # Not written by this backend; treat it as a miss and let set replace it
+            return None
+        
+        connection.execute('UPDATE cache_entries SET accessed_at = ? WHERE key = ?', (now, key))
+        return value
+    
+    def set(self, key, value, ttl):
+        """Store a value for ttl seconds, evicting the least recently used entries."""
+        connection = self._connection()
+        now = time.time()
+        connection.execute(
+            'INSERT OR REPLACE INTO cache_entries (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+            (key, json.dumps(value, default=FastJSONProvider.default), now + ttl, now)
+        )
+        
+        # Drop expired entries, then the least recently used beyond the limit
+        connection.execute('DELETE FROM cache_entries WHERE expires_at <= ?', (now,))
+        connection.execute(
+            'DELETE FROM cache_entries WHERE key IN ('
+            'SELECT key FROM cache_entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+    
+    def clear(self):
+        """Remove all entries."""
+        self._connection().execute('DELETE FROM cache_entries')
+
+CACHE_BACKENDS = {
+    'memory': MemoryCacheBackend,
+    'sqlite': SqliteCacheBackend
+}
+
+class AnalysisCache:
+    """
+    Cache for analysis and recommendation results.
+    
+    Entries are keyed by user, endpoint, normalized parameters and the
+    user's data version, the users.data_version column that every write
+    increments in its own commit. A write therefore makes the user's
+    earlier entries unreachable in every worker at once; they are never
+    read again and age out through the TTL and LRU limit.
+    """
+    
+    def __init__(self, backend=None, ttl=300, enabled=True):
+        self.backend = backend or MemoryCacheBackend()
+        self.ttl = ttl
+        self.enabled = enabled
+    
+    def init_app(self, app):
+        """Configure the cache backend from the app config."""
+        backend_name = app.config.get('ANALYSIS_CACHE_BACKEND', 'memory')
+        max_entries = app.config.get('ANALYSIS_CACHE_MAX_ENTRIES', 1024)
+        
+        self.ttl = app.config.get('ANALYSIS_CACHE_TTL', 300)
+        self.enabled = backend_name != 'none'
+        
+        if backend_name == 'sqlite':
+            self.backend = SqliteCacheBackend(self._sqlite_path(app), max_entries)
+        elif backend_name in ('memory', 'none'):
+            self.backend = MemoryCacheBackend(max_entries)
+        else:
+            raise ValueError(f"Unsupported analysis cache backend: {backend_name}")
+        
+        app.extensions['analysis_cache'] = self
+    
+    def _sqlite_path(self, app):
+        """Resolve ANALYSIS_CACHE_PATH, which must name a file inside the app's instance directory."""
+        path = app.config.get('ANALYSIS_CACHE_PATH')
+        if not path:
+            raise ValueError("ANALYSIS_CACHE_PATH is required for the sqlite analysis cache backend")
+        
+        instance_dir = os.path.realpath(app.instance_path)
+        path = os.path.realpath(os.path.join(instance_dir, path))
+        if os.path.commonpath([instance_dir, path]) != instance_dir or path == instance_dir:
+            raise ValueError(f"ANALYSIS_CACHE_PATH must be inside the instance directory {instance_dir}")
+        
+        return path
+    
+    def data_version(self, user_id):
+        """
+        Return the user's committed data version.
+        
+        Within a request it is read once and reused, so the ETag of a
+        response and the cache entry its body comes from always share a
+        version, even if another worker commits a write in between.
+        """
+        if not has_request_context():
+            return User.get_data_version(user_id)
+        
+        versions = g.setdefault('data_versions', {})
+        if user_id not in versions:
+            versions[user_id] = User.get_data_version(user_id)
+        return versions[user_id]
+    
+    def make_key(self, user_id, endpoint, params, version):
+        """Build a cache key from the user, endpoint, parameters and data version."""
+        normalized = json.dumps(params or {}, sort_keys=True, default=str)
+        digest = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        return f'analysis:{user_id}:{version}:{endpoint}:{digest}'
+    
+    def get_or_compute(self, user_id, endpoint, params, compute):
+        """
+        Return the cached result for this request, computing and storing it on a miss.
+        
+        Parameters:
+        - user_id: Owner of the data
+        - endpoint: Name of the analysis being cached
+        - params: Dict of parameters that affect the result
+        - compute: Callable producing the result on a miss
+        """
+        if not self.enabled:
+            return compute()
+        
+        # Read the version before computing, so a write that commits while we
+        # compute leaves this entry under the old, unreachable version
+        version = self.data_version(user_id)
+        key = self.make_key(user_id, endpoint, params, version)
+        
+        result = self.backend.get(key)
+        if result is None:
+            result = compute()
+            self.backend.set(key, result, self.ttl)
+        
+        return result
+
+# Shared instance, configured by create_app
+analysis_cache = AnalysisCache()
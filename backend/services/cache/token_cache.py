@@ -0,0 +1,143 @@
+import calendar
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+import jwt
+from werkzeug.exceptions import Unauthorized
+from backend.models import RevokedToken, db
+
+JWT_ALGORITHM = 'HS256'
+
+class TokenCache:
+    """
+    Signs auth tokens and caches the ones it has verified.
+    
+    The signing secret is read from the app config once, in init_app.
+    Verified tokens are kept in a bounded per-worker LRU keyed by the
+    token's SHA-256, each entry expiring at the token's exp, so repeat
+    requests skip jwt.decode. Tokens without an exp are verified every
+    time. Revocations are stored in the revoked_tokens table, so a token
+    revoked on one worker is rejected by all of them; checking it costs a
+    primary key lookup per request.
+    """
+    
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.secret_key = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # token hash -> (user_id, exp)
+        self._lock = threading.Lock()
+    
+    def init_app(self, app):
+        """Resolve the signing secret and cache size from the app config."""
+        self.secret_key = app.config['JWT_SECRET_KEY']
+        self.max_entries = app.config.get('TOKEN_CACHE_MAX_ENTRIES', 10000)
+        self.clear()
+        
+        app.extensions['token_cache'] = self
+    
+    def _key(self, token):
+        """Cache key for a token, so raw tokens are never held as keys."""
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+    
+    def encode(self, payload):
+        """Sign a token payload, caching the token for its subject."""
+        token = jwt.encode(payload, self.secret_key, algorithm=JWT_ALGORITHM)
+        
+        exp = payload.get('exp')
+        if isinstance(exp, datetime):
+            exp = calendar.timegm(exp.utctimetuple())
+        
+        if exp is not None:
+            self._store(self._key(token), payload['sub'], exp)
+        return token
+    
+    def verify(self, token):
+        """
+        Return the user ID for a valid token.
+        
+        Raises Unauthorized if the token is expired, invalid or revoked.
+        """
+        key = self._key(token)
+        user_id = self._cached_user(key)
+        
+        if user_id is None:
+            try:
+                payload = jwt.decode(token, self.secret_key, algorithms=[JWT_ALGORITHM])
+            except jwt.ExpiredSignatureError:
+                raise Unauthorized("Token expired. Please log in again.")
+            except jwt.InvalidTokenError:
+                raise Unauthorized("Invalid token. Please log in again.")
+            
+            user_id = payload['sub']
+            # A token without an expiry has nothing to bound its cache entry
+            if payload.get('exp') is not None:
+                self._store(key, user_id, payload['exp'])
+        
+        # Checked after the signature, so forged tokens never reach the database
+        if db.session.get(RevokedToken, key) is not None:
+            raise Unauthorized("Token has been revoked. Please log in again.")
+        
+        return user_id
+    
+    def _cached_user(self, key):
+        """Return the user ID of a cached, unexpired token, counting the hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                user_id, exp = entry
+                if exp > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return user_id
+                del self._entries[key]
+            
+            self.misses += 1
+            return None
+    
+    def _store(self, key, user_id, exp):
+        """Cache a verified token until exp, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = (user_id, exp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def revoke(self, token):
+        """Reject a token on every worker from now until it expires, even though its signature is valid."""
+        key = self._key(token)
+        try:
+            payload = jwt.decode(
+                token, self.secret_key, algorithms=[JWT_ALGORITHM], options={'verify_exp': False}
+            )
+        except jwt.InvalidTokenError:
+            return
+        
+        exp = payload.get('exp')
+        expires_at = datetime.utcfromtimestamp(exp) if exp is not None else None
+        
+        # Forget revocations whose tokens have expired anyway
+        RevokedToken.query.filter(RevokedToken.expires_at <= datetime.utcnow()).delete(synchronize_session=False)
+        db.session.merge(RevokedToken(key, expires_at))
+        db.session.commit()
+        
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def stats(self):
+        """Return the hit and miss counters and the number of cached tokens."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+    
+    def clear(self):
+        """Remove all cached tokens and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+# Shared instance, configured by create_app
+token_cache = TokenCache()
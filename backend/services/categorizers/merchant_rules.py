@@ -0,0 +1,128 @@
+import threading
+from collections import OrderedDict, deque
+from backend.models import CategoryRule, User, db
+from backend.services.importers.transaction_importer import normalize_description
+
+class RuleMatcher:
+    """
+    Aho-Corasick automaton over a user's rule patterns.
+    
+    Matching walks the description once, so the cost is linear in its
+    length however many rules the user has. When several patterns occur,
+    the longest wins, and among equally long patterns the oldest rule.
+    """
+    
+    def __init__(self, rules):
+        """
+        Compile the automaton.
+        
+        Parameters:
+        - rules: List of (pattern, category_id) tuples, oldest rule first
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [None]  # (pattern length, -rule order, category_id) of the best pattern ending here
+        
+        for order, (pattern, category_id) in enumerate(rules):
+            pattern = normalize_description(pattern)
+            if not pattern:
+                continue
+            
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                state = next_state
+            
+            candidate = (len(pattern), -order, category_id)
+            if self._best[state] is None or candidate > self._best[state]:
+                self._best[state] = candidate
+        
+        self._build_failure_links()
+    
+    def _build_failure_links(self):
+        """Set failure links breadth-first and fold each state's suffix matches into it."""
+        queue = deque(self._goto[0].values())
+        
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                
+                suffix_best = self._best[self._fail[next_state]]
+                if suffix_best is not None and (self._best[next_state] is None or suffix_best > self._best[next_state]):
+                    self._best[next_state] = suffix_best
+                
+                queue.append(next_state)
+    
+    def match(self, description):
+        """
+        Return the category ID of the best rule matching a normalized description, or None.
+        
+        description must already be normalized with normalize_description.
+        """
+        goto = self._goto
+        fail = self._fail
+        best_states = self._best
+        state = 0
+        best = None
+        
+        for char in description:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            
+            candidate = best_states[state]
+            if candidate is not None and (best is None or candidate > best):
+                best = candidate
+        
+        return best[2] if best else None
+
+class MerchantRuleCache:
+    """
+    Per-worker cache of compiled rule matchers.
+    
+    Matchers are keyed on the user's persisted rules version, which only
+    rule writes bump, in the same commit. A cached matcher is only used
+    while that version is current, so every worker recompiles after a
+    rule change but not after transaction writes.
+    """
+    
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._matchers = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_matcher(self, user_id):
+        """Return the compiled matcher for a user's rules, or None if they have no rules."""
+        version = User.get_rules_version(user_id)
+        
+        with self._lock:
+            entry = self._matchers.get(user_id)
+            if entry is not None and entry[0] == version:
+                self._matchers.move_to_end(user_id)
+                return entry[1]
+        
+        rules = db.session.query(CategoryRule.pattern, CategoryRule.category_id).filter(
+            CategoryRule.user_id == user_id
+        ).order_by(CategoryRule.created_at, CategoryRule.id).all()
+        matcher = RuleMatcher(rules) if rules else None
+        
+        with self._lock:
+            self._matchers[user_id] = (version, matcher)
+            self._matchers.move_to_end(user_id)
+            while len(self._matchers) > self.max_entries:
+                self._matchers.popitem(last=False)
+        
+        return matcher
+
+# Shared instance
+merchant_rules = MerchantRuleCache()
@@ -0,0 +1,97 @@
+import gzip
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # Optional; responses are only gzip-compressed without it
+    brotli = None
+
+# Content types worth compressing; images and archives are already compressed
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/css',
+    'text/csv',
+    'text/html',
+    'text/javascript',
+    'text/plain'
+}
+
+def available_encodings():
+    """Content codings this server can produce, most preferred first."""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+def encoded_etag(etag, encoding):
+    """ETag of a compressed representation; a strong ETag must differ per encoding."""
+    return f'{etag}-{encoding}'
+
+class ResponseCompressor:
+    """
+    Negotiated gzip or brotli compression of response bodies.
+    
+    Responses of a compressible type whose body is at least
+    COMPRESSION_MIN_SIZE bytes are compressed with the best coding the
+    client accepts, brotli when the Brotli package is installed and gzip
+    otherwise. Streamed and file responses are sent as they are, and so is
+    anything that already has a Content-Encoding. Strong ETags get the
+    coding appended, so each representation keeps a distinct validator.
+    """
+    
+    def __init__(self):
+        self.enabled = True
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 4
+    
+    def init_app(self, app):
+        """Read the compression settings and register the response hook."""
+        self.enabled = app.config.get('COMPRESSION_ENABLED', True)
+        self.min_size = app.config.get('COMPRESSION_MIN_SIZE', 1024)
+        self.gzip_level = app.config.get('COMPRESSION_GZIP_LEVEL', 6)
+        self.brotli_quality = app.config.get('COMPRESSION_BROTLI_QUALITY', 4)
+        
+        app.extensions['response_compressor'] = self
+        
+        if self.enabled:
+            app.after_request(self._compress_response)
+    
+    def compress(self, data, encoding):
+        """Compress bytes with a content coding from available_encodings."""
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level)
+    
+    def _compress_response(self, response):
+        """Compress the response body if it is large enough and the client accepts it."""
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+        
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+        
+        # Whether this response is compressed depends on the request header
+        response.vary.add('Accept-Encoding')
+        
+        encoding = request.accept_encodings.best_match(available_encodings())
+        if encoding is None:
+            return response
+        
+        response.set_data(self.compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(encoded_etag(etag, encoding))
+        
+        return response
+
+# Shared instance, configured by create_app
+response_compressor = ResponseCompressor()
@@ -0,0 +1,118 @@
+import dataclasses
+import json
+import math
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional; the standard library encoder is used without it
+    orjson = None
+
+JSON_ENCODERS = ('auto', 'orjson', 'json')
+
+def _default(obj):
+    """Convert values that neither encoder serializes by itself."""
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return _replace_non_finite(obj.item())
+    if isinstance(obj, np.ndarray):
+        return _replace_non_finite(obj.tolist())
+    if isinstance(obj, Decimal):
+        return _replace_non_finite(float(obj))
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _replace_non_finite(obj):
+    """Return obj with NaN and infinite floats, which JSON cannot represent, replaced by None."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _replace_non_finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_replace_non_finite(value) for value in obj]
+    return obj
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider encoding with orjson when it is installed.
+    
+    Both encoders produce the same output for API payloads: datetimes and
+    dates as ISO 8601 strings, NumPy scalars and arrays as plain numbers
+    and lists, and NaN or infinite floats, e.g. from pandas results, as
+    null. JSON_ENCODER selects the encoder: 'auto' uses orjson if it can
+    be imported, 'orjson' requires it, and 'json' always uses the
+    standard library.
+    """
+    
+    default = staticmethod(_default)
+    
+    def __init__(self, app):
+        super().__init__(app)
+        
+        encoder = app.config.get('JSON_ENCODER', 'auto')
+        if encoder not in JSON_ENCODERS:
+            raise ValueError(f"Unsupported JSON encoder: {encoder}")
+        if encoder == 'orjson' and orjson is None:
+            raise ValueError("JSON_ENCODER is 'orjson' but orjson is not installed")
+        
+        self.use_orjson = orjson is not None and encoder != 'json'
+    
+    def _orjson_options(self, indent=None):
+        """orjson flags matching the provider's settings."""
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            # orjson only supports two-space indentation
+            options |= orjson.OPT_INDENT_2
+        return options
+    
+    def dumps_bytes(self, obj, indent=None):
+        """Serialize obj to UTF-8 encoded JSON."""
+        if self.use_orjson:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_options(indent))
+        
+        separators = None if indent else (',', ':')
+        return self.dumps(obj, indent=indent, separators=separators).encode('utf-8')
+    
+    def dumps(self, obj, **kwargs):
+        """Serialize obj to a JSON string."""
+        if self.use_orjson and set(kwargs) <= {'indent', 'separators'}:
+            return orjson.dumps(
+                obj, default=self.default, option=self._orjson_options(kwargs.get('indent'))
+            ).decode('utf-8')
+        
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        try:
+            return json.dumps(obj, allow_nan=False, **kwargs)
+        except ValueError:
+            # Only pay for the extra pass when the payload has NaN or infinity
+            return json.dumps(_replace_non_finite(obj), allow_nan=False, **kwargs)
+    
+    def loads(self, s, **kwargs):
+        """Deserialize JSON from a string or UTF-8 bytes."""
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+    
+    def response(self, *args, **kwargs):
+        """Serialize the arguments into a JSON response without an intermediate str."""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = 2 if (self.compact is None and self._app.debug) or self.compact is False else None
+        
+        return self._app.response_class(self.dumps_bytes(obj, indent) + b'\n', mimetype=self.mimetype)
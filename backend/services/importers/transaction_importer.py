@@ -0,0 +1,256 @@
+import hashlib
+import io
+import math
+import re
+import uuid
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import insert
+from backend.models import Account, StatementUpload, Transaction, User, db
+from backend.services.analyzers.monthly_totals import apply_expense_totals
+from backend.services.analyzers.recurring_series import assign_recurring_series, refresh_recurring_series
+from backend.services.monitoring.metrics import metrics
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Columns written by the bulk insert, in COPY order
+IMPORT_COLUMNS = [
+    'id', 'amount', 'description', 'transaction_date', 'is_recurring', 'recurrence_pattern',
+    'notes', 'created_at', 'updated_at', 'account_id', 'category_id', 'transfer_account_id',
+    'fingerprint', 'recurring_series_id'
+]
+
+def normalize_description(description):
+    """Lowercase a description and collapse its whitespace."""
+    return re.sub(r'\s+', ' ', (description or '').strip().lower())
+
+def fingerprint_fields(account_id, transaction_date, amount, description):
+    """The parts of a transaction that its duplicate-detection fingerprint is built from."""
+    return (account_id, transaction_date.strftime('%Y-%m-%d'), f'{amount:.2f}', normalize_description(description))
+
+def transaction_fingerprint(account_id, transaction_date, amount, description, occurrence=0):
+    """
+    Build the duplicate-detection fingerprint for an imported transaction.
+    
+    occurrence numbers identical rows within one statement (0, 1, ...), so
+    genuinely repeated charges are kept, while the same rows imported again
+    from an overlapping export produce the same fingerprints.
+    """
+    key = '|'.join([*fingerprint_fields(account_id, transaction_date, amount, description), str(occurrence)])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def next_transaction_fingerprint(account_id, transaction_date, amount, description):
+    """
+    Fingerprint a single new transaction, e.g. one entered by hand.
+    
+    Takes the lowest occurrence whose fingerprint is not stored yet, as the
+    fingerprint migration does for existing rows, so identical transactions
+    get distinct fingerprints however they were created.
+    """
+    occurrence = 0
+    while True:
+        fingerprint = transaction_fingerprint(account_id, transaction_date, amount, description, occurrence)
+        if not db.session.query(Transaction.id).filter(Transaction.fingerprint == fingerprint).first():
+            return fingerprint
+        occurrence += 1
+
+def prepare_rows(transactions, account_id, category_map, matcher=None):
+    """
+    Validate parsed statement rows and convert them to transaction table rows.
+    
+    Parameters:
+    - transactions: List of dicts with date, amount and optional description,
+      category_hint and notes
+    - account_id: Account the rows are imported into
+    - category_map: Dict of lowercase category name to category ID
+    - matcher: Optional compiled merchant rule matcher, used for rows whose
+      category_hint does not name one of the user's categories
+    
+    Returns:
+    - Tuple of (rows, skipped_count)
+    """
+    now = datetime.utcnow()
+    rows = []
+    skipped_count = 0
+    occurrences = Counter()
+    
+    for transaction_data in transactions:
+        # Check for required fields
+        if 'date' not in transaction_data or 'amount' not in transaction_data:
+            skipped_count += 1
+            continue
+        
+        # Parse date; fromisoformat is much faster than strptime for YYYY-MM-DD
+        date_str = transaction_data['date']
+        try:
+            if not isinstance(date_str, str) or len(date_str) != 10:
+                raise ValueError(f"Invalid date: {date_str}")
+            transaction_date = datetime.fromisoformat(date_str)
+        except ValueError:
+            skipped_count += 1
+            continue
+        
+        try:
+            amount = float(transaction_data['amount'])
+            if not math.isfinite(amount):
+                raise ValueError(f"Invalid amount: {amount}")
+        except (TypeError, ValueError):
+            skipped_count += 1
+            continue
+        
+        description = transaction_data.get('description', '')
+        normalized_description = normalize_description(description)
+        
+        # Find category if possible, falling back to the user's merchant rules
+        category_hint = (transaction_data.get('category_hint') or '').lower()
+        category_id = category_map.get(category_hint) if category_hint else None
+        if category_id is None and matcher is not None:
+            category_id = matcher.match(normalized_description)
+        
+        # Number identical rows so each gets its own fingerprint
+        duplicate_key = (date_str, f'{amount:.2f}', normalized_description)
+        occurrence = occurrences[duplicate_key]
+        occurrences[duplicate_key] += 1
+        
+        rows.append({
+            'id': str(uuid.uuid4()),
+            'amount': amount,
+            'description': description,
+            'transaction_date': transaction_date,
+            'is_recurring': False,
+            'recurrence_pattern': None,
+            'notes': transaction_data.get('notes', ''),
+            'created_at': now,
+            'updated_at': now,
+            'account_id': account_id,
+            'category_id': category_id,
+            'transfer_account_id': None,
+            'fingerprint': transaction_fingerprint(account_id, transaction_date, amount, description, occurrence),
+            'recurring_series_id': None
+        })
+    
+    return rows, skipped_count
+
+def drop_existing_duplicates(rows):
+    """Remove rows whose fingerprint is already stored, using one query for the batch."""
+    fingerprints = [row['fingerprint'] for row in rows]
+    existing = {
+        fingerprint for (fingerprint,) in db.session.query(Transaction.fingerprint).filter(
+            Transaction.fingerprint.in_(fingerprints)
+        )
+    }
+    return [row for row in rows if row['fingerprint'] not in existing]
+
+def statement_already_imported(user_id, file_hash):
+    """Check whether a statement file with this hash was already imported by the user."""
+    return db.session.query(
+        StatementUpload.query.filter_by(user_id=user_id, file_hash=file_hash).exists()
+    ).scalar()
+
+def record_statement_upload(user_id, file_hash, filename=None):
+    """Remember that a statement file has been imported, so re-uploads can be rejected."""
+    if not statement_already_imported(user_id, file_hash):
+        db.session.add(StatementUpload(user_id, file_hash, filename))
+        db.session.commit()
+
+def _copy_value(value):
+    """Format a value for PostgreSQL COPY in CSV format; unquoted empty means NULL."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, float):
+        return repr(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+def _copy_rows(rows):
+    """Insert rows with PostgreSQL COPY on the session's connection."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(','.join(_copy_value(row[column]) for column in IMPORT_COLUMNS))
+        buffer.write('\n')
+    buffer.seek(0)
+    
+    # Use the session's connection so the COPY is part of the batch transaction
+    dbapi_connection = db.session.connection().connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {Transaction.__tablename__} ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+def insert_rows(rows):
+    """Insert prepared transaction rows using the fastest path for the database."""
+    if db.engine.dialect.name == 'postgresql':
+        _copy_rows(rows)
+    else:
+        db.session.execute(insert(Transaction.__table__), rows)
+
+def bulk_import_transactions(user_id, account_id, transactions, category_map, batch_size=DEFAULT_BATCH_SIZE,
+                             progress_callback=None, file_hash=None, matcher=None):
+    """
+    Import parsed statement rows in set-based batches.
+    
+    Rows already imported, matched by fingerprint with one lookup per
+    batch, are skipped and counted as duplicates. Each batch is inserted in
+    one statement, the account balance is moved by the batch's summed
+    amount, and the monthly rollup and recurring series are updated, all in
+    a single commit. A failing batch is rolled back; earlier batches stay
+    committed. progress_callback, if given, is called with the number of
+    rows processed so far after each batch. file_hash, the SHA-256 of the
+    statement file the rows came from, is recorded once every batch has
+    been imported. matcher, the user's compiled merchant rules, categorizes
+    rows whose category_hint is not one of their categories.
+    
+    Returns:
+    - Dict with imported_count, skipped_count and duplicate_count
+    """
+    rows, skipped_count = prepare_rows(transactions, account_id, category_map, matcher)
+    imported_count = 0
+    duplicate_count = 0
+    
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        metrics.observe('import_batch_size', len(batch))
+        
+        try:
+            new_rows = drop_existing_duplicates(batch)
+            duplicate_count += len(batch) - len(new_rows)
+            
+            if new_rows:
+                series_ids = assign_recurring_series(user_id, new_rows)
+                insert_rows(new_rows)
+                
+                # Apply the batch's balance change once, in SQL
+                Account.query.filter_by(id=account_id).update({
+                    Account.balance: Account.balance + sum(row['amount'] for row in new_rows),
+                    Account.updated_at: datetime.utcnow()
+                }, synchronize_session=False)
+                
+                apply_expense_totals(user_id, account_id, [
+                    (row['transaction_date'], row['category_id'], row['amount'], None) for row in new_rows
+                ])
+                
+                # Match the new rows against the user's recurring series
+                refresh_recurring_series(series_ids)
+                User.bump_data_version(user_id)
+                
+                db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise ValueError(f"Import stopped after {imported_count} transactions: {str(e)}")
+        
+        imported_count += len(new_rows)
+        if progress_callback:
+            progress_callback(start + len(batch))
+    
+    if file_hash:
+        record_statement_upload(user_id, file_hash)
+    
+    return {
+        'imported_count': imported_count,
+        'skipped_count': skipped_count,
+        'duplicate_count': duplicate_count
+    }
@@ -0,0 +1,247 @@
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from backend.models import ImportJob, db
+from backend.services.parsers.statement_parser import (
+    get_parser_for_file, save_uploaded_file, detect_file_type, serialize_parsed_transaction
+)
+from backend.services.importers.transaction_importer import bulk_import_transactions
+from backend.services.monitoring.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of a running parse for progress
+PROGRESS_POLL_SECONDS = 0.5
+
+def parse_statement_file(file_path, file_type, bank_name=None, column_mapping=None, chunk_size=5000,
+                         preview_rows=1000, progress=None):
+    """
+    Parse a saved statement batch by batch. Runs in a worker process.
+    
+    Only the first preview_rows rows are kept for the preview; the rest
+    are counted. After each batch the number of rows parsed so far is put
+    on the progress queue, if given.
+    
+    Returns the preview rows, the total number of rows and the seconds
+    spent parsing, which the parent records since metrics kept in the
+    worker process would be lost.
+    """
+    started_at = time.perf_counter()
+    parser = get_parser_for_file(file_path, file_type, bank_name, column_mapping)
+    preview = []
+    total_rows = 0
+    
+    for batch in parser.iter_batches(chunk_size):
+        preview.extend(
+            serialize_parsed_transaction(transaction) for transaction in batch[:preview_rows - len(preview)]
+        )
+        total_rows += len(batch)
+        if progress is not None:
+            progress.put(total_rows)
+    
+    return preview, total_rows, time.perf_counter() - started_at
+
+class ImportJobRunner:
+    """
+    Runs statement parsing and imports in the background.
+    
+    Jobs run on a thread pool, which handles the database and file I/O.
+    Parsing is CPU-bound, so those threads hand it to a process pool,
+    which reports progress back through a queue after every batch. Job
+    state is stored in the import_jobs table, so any worker can report on
+    a job. Parse jobs keep a preview of at most IMPORT_JOB_PREVIEW_ROWS
+    rows; statements too large for that are better parsed with the
+    streaming upload.
+    """
+    
+    def __init__(self):
+        self.app = None
+        self._threads = None
+        self._processes = None
+        self._manager = None
+        self._lock = threading.Lock()
+    
+    def init_app(self, app):
+        """Attach the runner to the app."""
+        self.app = app
+        app.extensions['import_jobs'] = self
+    
+    def _thread_pool(self):
+        """Create the thread pool on first use."""
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self.app.config.get('IMPORT_JOB_THREADS', 4),
+                    thread_name_prefix='import-job'
+                )
+            return self._threads
+    
+    def _process_pool(self):
+        """Create the process pool on first use."""
+        with self._lock:
+            if self._processes is None:
+                # Spawn rather than fork, so children don't inherit DB connections or locks
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self.app.config.get('IMPORT_JOB_PROCESSES', 2),
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._processes
+    
+    def _progress_queue(self):
+        """Return a queue worker processes can report progress on."""
+        with self._lock:
+            if self._manager is None:
+                self._manager = multiprocessing.get_context('spawn').Manager()
+            return self._manager.Queue()
+    
+    def _create_job(self, job_type, user_id):
+        """Store a new queued job."""
+        job = ImportJob(job_type=job_type, user_id=user_id)
+        db.session.add(job)
+        db.session.commit()
+        return job
+    
+    def _update_job(self, job_id, **fields):
+        """Update a job's fields in its own commit."""
+        job = db.session.get(ImportJob, job_id)
+        for name, value in fields.items():
+            setattr(job, name, value)
+        db.session.commit()
+    
+    def submit_parse(self, user_id, uploaded_file, bank_name=None, column_mapping=None):
+        """Save an upload and queue it for parsing. Returns the job."""
+        job = self._create_job('parse', user_id)
+        
+        # Prefix with the job ID so concurrent uploads of the same name don't collide
+        upload_dir = os.path.join(os.getcwd(), 'uploads')
+        file_path = save_uploaded_file(uploaded_file, upload_dir, f"{job.id}_{uploaded_file.filename}")
+        file_type = detect_file_type(uploaded_file.filename)
+        
+        self._thread_pool().submit(
+            self._run_parse, job.id, file_path, file_type, bank_name, column_mapping
+        )
+        return job
+    
+    def submit_import(self, user_id, account_id, transactions, category_map, batch_size, file_hash=None,
+                      matcher=None):
+        """Queue parsed transactions for import. Returns the job."""
+        job = self._create_job('import', user_id)
+        job.total_rows = len(transactions)
+        db.session.commit()
+        
+        self._thread_pool().submit(
+            self._run_import, job.id, user_id, account_id, transactions, category_map, batch_size, file_hash,
+            matcher
+        )
+        return job
+    
+    def _run_parse(self, job_id, file_path, file_type, bank_name, column_mapping):
+        """Parse a statement in the process pool and store the preview."""
+        with self.app.app_context():
+            try:
+                self._update_job(job_id, status='running')
+                
+                progress = self._progress_queue()
+                future = self._process_pool().submit(
+                    parse_statement_file, file_path, file_type, bank_name, column_mapping,
+                    self.app.config.get('STATEMENT_CHUNK_SIZE', 5000),
+                    self.app.config.get('IMPORT_JOB_PREVIEW_ROWS', 1000),
+                    progress
+                )
+                
+                while not future.done():
+                    try:
+                        processed_rows = progress.get(timeout=PROGRESS_POLL_SECONDS)
+                    except queue.Empty:
+                        continue
+                    self._update_job(job_id, processed_rows=processed_rows)
+                
+                preview, total_rows, parse_seconds = future.result()
+                metrics.observe_parse(file_type, total_rows, parse_seconds)
+                
+                self._update_job(
+                    job_id,
+                    status='completed',
+                    total_rows=total_rows,
+                    processed_rows=total_rows,
+                    result=json.dumps({
+                        'transactions_count': total_rows,
+                        'transactions': preview,
+                        'preview_truncated': len(preview) < total_rows
+                    })
+                )
+            except Exception as e:
+                logger.exception("Statement parse job %s failed", job_id)
+                db.session.rollback()
+                self._update_job(job_id, status='failed', error=str(e))
+            finally:
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                db.session.remove()
+    
+    def _run_import(self, job_id, user_id, account_id, transactions, category_map, batch_size, file_hash, matcher):
+        """Import transactions batch by batch, recording progress."""
+        with self.app.app_context():
+            try:
+                self._update_job(job_id, status='running')
+                
+                result = bulk_import_transactions(
+                    user_id,
+                    account_id,
+                    transactions,
+                    category_map,
+                    batch_size,
+                    progress_callback=lambda processed_count: self._update_job(job_id, processed_rows=processed_count),
+                    file_hash=file_hash,
+                    matcher=matcher
+                )
+                
+                self._update_job(job_id, status='completed', result=json.dumps(result))
+            except Exception as e:
+                logger.exception("Import job %s failed", job_id)
+                db.session.rollback()
+                self._update_job(job_id, status='failed', error=str(e))
+            finally:
+                db.session.remove()
+
+def fail_interrupted_jobs():
+    """
+    Mark queued and running jobs as failed. Call when the server starts.
+    
+    Jobs run in the threads of the worker that accepted them, so none
+    survive a restart; without this they would report running forever.
+    Assumes one server per database, since it cannot tell another
+    server's live jobs apart.
+    """
+    count = ImportJob.query.filter(ImportJob.status.in_(['queued', 'running'])).update({
+        ImportJob.status: 'failed',
+        ImportJob.error: 'Interrupted by a server restart. Please upload the statement again.'
+    }, synchronize_session=False)
+    db.session.commit()
+    return count
+
+def serialize_job(job):
+    """Convert a job to its JSON status format."""
+    result = {
+        'id': job.id,
+        'job_type': job.job_type,
+        'status': job.status,
+        'total_rows': job.total_rows,
+        'processed_rows': job.processed_rows,
+        'error': job.error,
+        'created_at': job.created_at.isoformat(),
+        'updated_at': job.updated_at.isoformat()
+    }
+    
+    if job.status == 'completed' and job.result:
+        result['result'] = json.loads(job.result)
+    
+    return result
+
+# Shared instance, configured by create_app
+import_jobs = ImportJobRunner()
@@ -0,0 +1,327 @@
+import atexit
+import glob
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from flask import g, request
+from backend.services.auth.password_hasher import password_hasher
+from backend.services.cache.token_cache import token_cache
+from backend.services.monitoring.pool_metrics import pool_metrics
+
+logger = logging.getLogger(__name__)
+
+# Histogram upper bounds; an implicit +Inf bucket follows each list
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PARSE_RATE_BUCKETS = (1000, 5000, 10000, 25000, 50000, 100000, 250000, 500000, 1000000)
+BATCH_SIZE_BUCKETS = (10, 50, 100, 500, 1000, 2500, 5000, 10000, 50000)
+
+# (name, type, help, buckets)
+METRIC_DEFINITIONS = [
+    ('http_requests_total', 'counter', 'Requests handled, by route and status.', None),
+    ('http_request_duration_seconds', 'histogram', 'Request latency, by route.', LATENCY_BUCKETS),
+    ('http_requests_in_flight', 'gauge', 'Requests being handled, by route.', None),
+    ('statement_parse_rows_per_second', 'histogram', 'Statement parser throughput, per parsed file.', PARSE_RATE_BUCKETS),
+    ('statement_parse_rows_total', 'counter', 'Statement rows parsed.', None),
+    ('import_batch_size', 'histogram', 'Rows per transaction import batch.', BATCH_SIZE_BUCKETS),
+    ('token_cache_hits_total', 'counter', 'Auth tokens verified from the cache.', None),
+    ('token_cache_misses_total', 'counter', 'Auth tokens that needed a full verification.', None),
+    ('password_hashes_total', 'counter', 'Password hashes and checks completed.', None),
+    ('password_hashes_rejected_total', 'counter', 'Password hashes turned away because the queue was full.', None),
+    ('password_hash_queue_seconds_total', 'counter', 'Time password hashes spent queued.', None),
+    ('db_pool_checkouts_total', 'counter', 'Database connection checkouts.', None),
+    ('db_pool_timeouts_total', 'counter', 'Database connection checkouts that timed out.', None),
+    ('db_pool_wait_seconds_total', 'counter', 'Time spent waiting for database connections.', None)
+]
+
+def _label_key(labels):
+    """Turn a labels dict into a hashable, ordered key."""
+    return tuple(sorted(labels.items())) if labels else ()
+
+def _escape(value):
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(pairs):
+    """Render label pairs in the Prometheus text format."""
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+def _format_value(value):
+    """Render a sample value, keeping whole numbers free of a trailing .0."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+def collect_service_stats():
+    """Report the counters kept by the token cache, password hasher and connection pool."""
+    tokens = token_cache.stats()
+    hashing = password_hasher.stats()
+    pool = pool_metrics.counters()
+    
+    return [
+        ('token_cache_hits_total', None, tokens['hits']),
+        ('token_cache_misses_total', None, tokens['misses']),
+        ('password_hashes_total', None, hashing['completed']),
+        ('password_hashes_rejected_total', None, hashing['rejected']),
+        ('password_hash_queue_seconds_total', None, hashing['queue_seconds_total']),
+        ('db_pool_checkouts_total', None, pool['checkouts']),
+        ('db_pool_timeouts_total', None, pool['timeouts']),
+        ('db_pool_wait_seconds_total', None, pool['wait_seconds_total'])
+    ]
+
+def _create_private_directory(path):
+    """Create a directory only this user can use, refusing one owned by someone else."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    
+    if os.stat(path).st_uid != os.geteuid():
+        raise ValueError(f"Metrics directory {path} is owned by another user")
+    os.chmod(path, 0o700)
+
+def _process_alive(pid):
+    """Whether a process with this ID is running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class Metrics:
+    """
+    Counters, gauges and histograms exposed in the Prometheus text format.
+    
+    Each worker records into its own in-memory registry. With METRICS_DIR
+    set, a background thread writes the registry to a per-worker file every
+    METRICS_FLUSH_INTERVAL seconds, and render merges every worker's file:
+    counters and histograms are summed, including those of workers that
+    have exited so totals never go backwards, while gauges only count
+    workers that are still running. Without METRICS_DIR only the current
+    process is reported.
+    """
+    
+    def __init__(self):
+        self.directory = None
+        self.flush_interval = 5.0
+        self._definitions = {name: (metric_type, help_text, buckets) for name, metric_type, help_text, buckets in METRIC_DEFINITIONS}
+        self._collectors = [collect_service_stats]
+        self._lock = threading.Lock()
+        self._pid = None
+        self._reset()
+    
+    def init_app(self, app):
+        """Configure cross-worker aggregation and register the request hooks."""
+        self.directory = app.config.get('METRICS_DIR')
+        self.flush_interval = app.config.get('METRICS_FLUSH_INTERVAL', 5.0)
+        
+        if self.directory:
+            # Every JSON file in it is merged into /metrics, so nobody else may write there
+            _create_private_directory(self.directory)
+        
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.teardown_request(self._end_request)
+        
+        app.extensions['metrics'] = self
+    
+    def _reset(self):
+        """Drop all recorded values, e.g. in a newly forked worker."""
+        self._values = {}  # (name, label key) -> value
+        self._histograms = {}  # (name, label key) -> [bucket counts, sum, count]
+        self._worker_id = None
+        self._pid = os.getpid()
+    
+    def _check_process(self):
+        """Start afresh after a fork, with a new worker file and flush thread. Call with the lock held."""
+        if self._pid == os.getpid() and self._worker_id is not None:
+            return
+        
+        if self._pid != os.getpid():
+            self._reset()
+        
+        self._worker_id = f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+        if self.directory:
+            threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+    
+    def register_collector(self, collector):
+        """
+        Add a callable reporting values owned by another component.
+        
+        It is called on every flush and render and returns a list of
+        (name, labels, value) tuples for defined metrics.
+        """
+        self._collectors.append(collector)
+    
+    def inc(self, name, labels=None, amount=1):
+        """Add to a counter or gauge."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._check_process()
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def observe(self, name, value, labels=None):
+        """Record a value in a histogram."""
+        buckets = self._definitions[name][2]
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._check_process()
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(buckets) + 1), 0.0, 0]
+            histogram[0][bisect_left(buckets, value)] += 1
+            histogram[1] += value
+            histogram[2] += 1
+    
+    def observe_parse(self, file_type, rows, seconds):
+        """Record one parsed statement file."""
+        labels = {'file_type': file_type or 'unknown'}
+        self.inc('statement_parse_rows_total', labels, rows)
+        if seconds > 0:
+            self.observe('statement_parse_rows_per_second', rows / seconds, labels)
+    
+    def _start_request(self):
+        """Count the request as in flight."""
+        g.metrics_labels = {'blueprint': request.blueprint or 'app', 'endpoint': request.endpoint or 'unmatched'}
+        g.metrics_started_at = time.perf_counter()
+        self.inc('http_requests_in_flight', g.metrics_labels)
+    
+    def _finish_request(self, response):
+        """Record the request's latency and status."""
+        labels = g.get('metrics_labels')
+        if labels is not None:
+            self.observe('http_request_duration_seconds', time.perf_counter() - g.metrics_started_at, labels)
+            self.inc('http_requests_total', {**labels, 'method': request.method, 'status': str(response.status_code)})
+        return response
+    
+    def _end_request(self, exception=None):
+        """Remove the request from the in-flight gauge, even if it failed."""
+        labels = g.pop('metrics_labels', None)
+        if labels is not None:
+            self.inc('http_requests_in_flight', labels, -1)
+    
+    def _snapshot(self):
+        """Return this process's values, including collected ones, as a JSON-ready dict."""
+        collected = []
+        for collector in self._collectors:
+            try:
+                collected.extend(collector())
+            except Exception:
+                logger.exception("Metrics collector failed")
+        
+        with self._lock:
+            self._check_process()
+            values = [[name, list(key), value] for (name, key), value in self._values.items()]
+            histograms = [
+                [name, list(key), list(counts), total, count]
+                for (name, key), (counts, total, count) in self._histograms.items()
+            ]
+            worker_id = self._worker_id
+        
+        values.extend([name, list(_label_key(labels)), value] for name, labels, value in collected)
+        return {'pid': os.getpid(), 'worker_id': worker_id, 'values': values, 'histograms': histograms}
+    
+    def flush(self):
+        """Write this worker's values to its file in METRICS_DIR."""
+        if not self.directory:
+            return
+        
+        snapshot = self._snapshot()
+        path = os.path.join(self.directory, f"metrics-{snapshot['worker_id']}.json")
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.metrics-')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+    
+    def _flush_loop(self):
+        """Flush periodically for as long as the worker runs."""
+        pid = os.getpid()
+        while self._pid == pid:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                logger.warning("Could not write metrics to %s", self.directory, exc_info=True)
+    
+    def _snapshots(self):
+        """Return the snapshots of every worker, this one freshly flushed."""
+        if not self.directory:
+            return [self._snapshot()]
+        
+        self.flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, 'metrics-*.json')):
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                # Replaced or removed while being read
+                continue
+        return snapshots
+    
+    def render(self):
+        """Return every metric, merged across workers, in the Prometheus text format."""
+        values = {}
+        histograms = {}
+        
+        for snapshot in self._snapshots():
+            alive = snapshot['pid'] == os.getpid() or _process_alive(snapshot['pid'])
+            for name, key, value in snapshot['values']:
+                if name not in self._definitions:
+                    continue
+                if self._definitions[name][0] == 'gauge' and not alive:
+                    continue
+                key = (name, tuple(tuple(pair) for pair in key))
+                values[key] = values.get(key, 0) + value
+            
+            for name, key, counts, total, count in snapshot['histograms']:
+                key = (name, tuple(tuple(pair) for pair in key))
+                merged = histograms.setdefault(key, [[0] * len(counts), 0.0, 0])
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+                merged[2] += count
+        
+        lines = []
+        for name, (metric_type, help_text, buckets) in self._definitions.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            
+            if metric_type == 'histogram':
+                for (sample_name, key), (counts, total, count) in sorted(histograms.items()):
+                    if sample_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, bucket_count in zip(list(buckets) + ['+Inf'], counts):
+                        cumulative += bucket_count
+                        lines.append(f'{name}_bucket{_format_labels(key + (("le", bound),))} {cumulative}')
+                    lines.append(f'{name}_sum{_format_labels(key)} {_format_value(total)}')
+                    lines.append(f'{name}_count{_format_labels(key)} {count}')
+            else:
+                for (sample_name, key), value in sorted(values.items()):
+                    if sample_name == name:
+                        lines.append(f'{name}{_format_labels(key)} {_format_value(value)}')
+        
+        return '\n'.join(lines) + '\n'
+    
+    def clear_directory(self, directory=None):
+        """Remove worker files left by a previous run, e.g. when the server starts."""
+        directory = directory or self.directory
+        if directory:
+            for path in glob.glob(os.path.join(directory, 'metrics-*.json')):
+                os.remove(path)
+    
+    def _flush_at_exit(self):
+        """Write the final values of an exiting worker."""
+        if self.directory:
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+# Shared instance, configured by create_app
+metrics = Metrics()
+
+atexit.register(metrics._flush_at_exit)
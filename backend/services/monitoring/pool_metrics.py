@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+def is_memory_sqlite(database_uri):
+    """Whether a database URI points at an in-memory SQLite database."""
+    url = make_url(database_uri)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+def engine_options(config):
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS from the DB_POOL_* settings.
+    
+    In-memory SQLite keeps its own single-connection pool, so only
+    pre-ping and recycle apply there.
+    """
+    options = {'pool_pre_ping': config.get('DB_POOL_PRE_PING', True)}
+    
+    if config.get('DB_POOL_RECYCLE', -1) >= 0:
+        options['pool_recycle'] = config['DB_POOL_RECYCLE']
+    
+    if not is_memory_sqlite(config['SQLALCHEMY_DATABASE_URI']):
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=config.get('DB_POOL_SIZE', 5),
+            max_overflow=config.get('DB_MAX_OVERFLOW', 10),
+            pool_timeout=config.get('DB_POOL_TIMEOUT', 30)
+        )
+    
+    return options
+
+class PoolMetrics:
+    """
+    Per-worker counters for the database connection pool.
+    
+    Checkout waits and timeouts are recorded by TimedQueuePool, and new
+    and invalidated connections by pool events. snapshot combines them
+    with the pool's current state.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Zero the counters."""
+        with self._lock:
+            self._counters = {
+                'checkouts': 0,
+                'timeouts': 0,
+                'connections_opened': 0,
+                'connections_invalidated': 0,
+                'wait_seconds_total': 0.0,
+                'wait_seconds_max': 0.0
+            }
+    
+    def record_checkout(self, wait_seconds):
+        """Count a checkout and how long it waited for a connection."""
+        with self._lock:
+            self._counters['checkouts'] += 1
+            self._counters['wait_seconds_total'] += wait_seconds
+            self._counters['wait_seconds_max'] = max(self._counters['wait_seconds_max'], wait_seconds)
+    
+    def record_timeout(self, wait_seconds):
+        """Count a checkout that gave up waiting for a connection."""
+        with self._lock:
+            self._counters['timeouts'] += 1
+            self._counters['wait_seconds_total'] += wait_seconds
+            self._counters['wait_seconds_max'] = max(self._counters['wait_seconds_max'], wait_seconds)
+    
+    def record_event(self, counter):
+        """Increment a connection counter."""
+        with self._lock:
+            self._counters[counter] += 1
+    
+    def counters(self):
+        """Return a copy of the counters."""
+        with self._lock:
+            return dict(self._counters)
+    
+    def snapshot(self, engine):
+        """Return this worker's pool state and counters for an engine."""
+        pool = engine.pool
+        counters = self.counters()
+        
+        stats = {
+            'pid': os.getpid(),
+            'pool_class': type(pool).__name__,
+            **counters,
+            'wait_seconds_avg': counters['wait_seconds_total'] / counters['checkouts'] if counters['checkouts'] else 0.0
+        }
+        
+        if isinstance(pool, QueuePool):
+            stats.update({
+                'size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                # overflow() counts down from -size until the pool is full
+                'overflow': max(pool.overflow(), 0)
+            })
+        
+        return stats
+
+# Shared instance
+pool_metrics = PoolMetrics()
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits for a connection."""
+    
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout(time.perf_counter() - started_at)
+            raise
+        
+        pool_metrics.record_checkout(time.perf_counter() - started_at)
+        return connection
+
+@event.listens_for(TimedQueuePool, 'connect')
+def _count_connect(dbapi_connection, connection_record):
+    pool_metrics.record_event('connections_opened')
+
+@event.listens_for(TimedQueuePool, 'invalidate')
+def _count_invalidate(dbapi_connection, connection_record, exception):
+    pool_metrics.record_event('connections_invalidated')
@@ -0,0 +1,143 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from flask import g, request
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+# Body fields whose values are never logged, matched as substrings of the lowercased key
+SENSITIVE_FIELDS = ('password', 'token', 'secret', 'authorization')
+
+def redact(value):
+    """Replace the values of sensitive keys in a parsed JSON or form body."""
+    if isinstance(value, dict):
+        return {
+            key: '[redacted]' if any(field in str(key).lower() for field in SENSITIVE_FIELDS) else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+class RequestLogger:
+    """
+    Queue-backed logging with one structured line per request.
+    
+    Records from every logger are put on an in-memory queue by a
+    QueueHandler on the root logger, and a QueueListener thread writes them
+    to the console and a rotating log file, so requests never wait on disk.
+    Each request is logged once, as JSON with its method, path, endpoint,
+    status, size and duration. Request bodies are only logged for a sampled
+    fraction of requests (none by default), with sensitive fields redacted.
+    """
+    
+    def __init__(self):
+        self.body_sample_rate = 0.0
+        self.body_max_bytes = 1000
+        self.logger = logging.getLogger('backend.requests')
+        self._queue_handler = None
+        self._listener = None
+    
+    def init_app(self, app):
+        """Start the log listener and register the request hooks."""
+        self.body_sample_rate = app.config.get('LOG_BODY_SAMPLE_RATE', 0.0)
+        self.body_max_bytes = app.config.get('LOG_BODY_MAX_BYTES', 1000)
+        
+        self._start_listener(
+            level=app.config.get('LOG_LEVEL', 'INFO'),
+            log_file=app.config.get('LOG_FILE'),
+            max_bytes=app.config.get('LOG_MAX_BYTES', 10 * 1024 * 1024),
+            backup_count=app.config.get('LOG_BACKUP_COUNT', 5)
+        )
+        
+        app.before_request(self._start_timer)
+        app.after_request(self._log_request)
+        
+        app.extensions['request_logger'] = self
+    
+    def _start_listener(self, level, log_file, max_bytes, backup_count):
+        """Route the root logger through a queue drained by a listener thread."""
+        # Replace any listener from an earlier create_app in this process
+        self.stop()
+        
+        formatter = logging.Formatter(LOG_FORMAT)
+        handlers = [logging.StreamHandler()]
+        
+        if log_file:
+            log_dir = os.path.dirname(log_file)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+            handlers.append(RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count))
+        
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        log_queue = queue.SimpleQueue()
+        self._queue_handler = QueueHandler(log_queue)
+        self._listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        
+        root = logging.getLogger()
+        root.addHandler(self._queue_handler)
+        root.setLevel(level)
+        
+        self._listener.start()
+    
+    def stop(self):
+        """Flush queued records and detach the queue handler."""
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+        
+        if self._queue_handler is not None:
+            logging.getLogger().removeHandler(self._queue_handler)
+            self._queue_handler = None
+    
+    def _start_timer(self):
+        """Remember when the request started."""
+        g.request_started_at = time.perf_counter()
+    
+    def _log_request(self, response):
+        """Log one line describing the finished request."""
+        started_at = g.get('request_started_at')
+        if started_at is None or not self.logger.isEnabledFor(logging.INFO):
+            return response
+        
+        entry = {
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'duration_ms': round((time.perf_counter() - started_at) * 1000, 2),
+            'response_bytes': response.calculate_content_length(),
+            'user_id': g.get('user_id')
+        }
+        
+        if self.body_sample_rate and random.random() < self.body_sample_rate:
+            entry['body'] = self._request_body()
+        
+        self.logger.info(json.dumps(entry, default=str))
+        return response
+    
+    def _request_body(self):
+        """Return the redacted, truncated request body for a sampled request."""
+        if request.is_json:
+            body = request.get_json(silent=True)
+        elif request.form:
+            body = request.form.to_dict()
+        else:
+            # Uploaded files and other raw bodies are not logged
+            return None
+        
+        return json.dumps(redact(body), default=str)[:self.body_max_bytes]
+
+# Shared instance, configured by create_app
+request_logger = RequestLogger()
+
+atexit.register(request_logger.stop)
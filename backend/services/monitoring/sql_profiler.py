@@ -0,0 +1,152 @@
+import heapq
+import threading
+import time
+from collections import Counter, deque
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from backend.models import db
+
+# Characters of each statement kept in profiles
+STATEMENT_PREVIEW_LENGTH = 500
+
+class RequestProfile:
+    """Queries issued while handling one request."""
+    
+    def __init__(self):
+        self.query_count = 0
+        self.total_seconds = 0.0
+        self.statements = Counter()
+        self.timings = []  # (seconds, statement)
+    
+    def record(self, statement, seconds):
+        """Add one executed statement."""
+        self.query_count += 1
+        self.total_seconds += seconds
+        self.statements[statement] += 1
+        self.timings.append((seconds, statement))
+    
+    def summary(self, slowest):
+        """Return the counts, DB time, slowest statements and most repeated statements."""
+        return {
+            'query_count': self.query_count,
+            'db_ms': round(self.total_seconds * 1000, 3),
+            'slowest': [
+                {'ms': round(seconds * 1000, 3), 'statement': statement[:STATEMENT_PREVIEW_LENGTH]}
+                for seconds, statement in heapq.nlargest(slowest, self.timings, key=lambda timing: timing[0])
+            ],
+            # Statements run more than once in a request usually point at an N+1 pattern
+            'repeated': [
+                {'count': count, 'statement': statement[:STATEMENT_PREVIEW_LENGTH]}
+                for statement, count in self.statements.most_common(slowest) if count > 1
+            ]
+        }
+
+class SqlProfiler:
+    """
+    Opt-in per-request SQL profiling.
+    
+    When SQL_PROFILING is on, cursor execute events on the app's engine time
+    every statement run inside a request. Each response gets a
+    Server-Timing header with the query count and DB time, and a summary
+    with the slowest and most repeated statements is kept in a bounded
+    per-worker history for the internal debug endpoint. Statements run
+    outside a request, such as background imports, are not recorded.
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.slowest = 5
+        self._history = deque(maxlen=100)
+        self._lock = threading.Lock()
+    
+    def init_app(self, app):
+        """Attach the engine events and request hooks if profiling is enabled."""
+        self.enabled = app.config.get('SQL_PROFILING', False)
+        self.slowest = app.config.get('SQL_PROFILE_SLOWEST', 5)
+        self._history = deque(maxlen=app.config.get('SQL_PROFILE_HISTORY', 100))
+        
+        app.extensions['sql_profiler'] = self
+        
+        if not self.enabled:
+            return
+        
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        event.listen(engine, 'handle_error', self._handle_error)
+        
+        app.before_request(self._start_profile)
+        app.after_request(self._finish_profile)
+    
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        """Remember when a statement started."""
+        conn.info.setdefault('sql_profiler_started_at', []).append(time.perf_counter())
+    
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        """Record a finished statement against the current request."""
+        self._record(statement, conn.info['sql_profiler_started_at'].pop())
+    
+    def _handle_error(self, exception_context):
+        """
+        Record a statement that raised.
+        
+        after_cursor_execute does not run for it, so its start time is
+        popped here; otherwise it would stay on the pooled connection and
+        be paired with the next statement.
+        """
+        conn = exception_context.connection
+        started = conn.info.get('sql_profiler_started_at') if conn is not None else None
+        if started and exception_context.statement is not None:
+            self._record(exception_context.statement, started.pop())
+    
+    def _record(self, statement, started_at):
+        """Add a statement to the current request's profile, if there is one."""
+        if has_request_context():
+            profile = g.get('sql_profile')
+            if profile is not None:
+                profile.record(statement, time.perf_counter() - started_at)
+    
+    def _start_profile(self):
+        """Start collecting statements for this request."""
+        g.sql_profile = RequestProfile()
+        g.sql_profile_started_at = time.perf_counter()
+    
+    def _finish_profile(self, response):
+        """Add the Server-Timing header and keep the request's summary."""
+        profile = g.pop('sql_profile', None)
+        if profile is None:
+            return response
+        
+        total_ms = (time.perf_counter() - g.sql_profile_started_at) * 1000
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={profile.total_seconds * 1000:.2f};desc="{profile.query_count} queries", app;dur={total_ms:.2f}'
+        )
+        
+        entry = {
+            'time': time.time(),
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 3),
+            **profile.summary(self.slowest)
+        }
+        with self._lock:
+            self._history.append(entry)
+        
+        return response
+    
+    def recent(self, limit=None, endpoint=None):
+        """Return the most recent request summaries, newest first."""
+        with self._lock:
+            entries = list(self._history)
+        
+        entries.reverse()
+        if endpoint:
+            entries = [entry for entry in entries if entry['endpoint'] == endpoint]
+        return entries[:limit] if limit else entries
+
+# Shared instance, configured by create_app
+sql_profiler = SqlProfiler()
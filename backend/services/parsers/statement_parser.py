@@ -1,8 +1,12 @@
 import pandas as pd
-import re
+import hashlib
 from datetime import datetime
 import os
+import time
 from werkzeug.utils import secure_filename
+from backend.services.monitoring.metrics import metrics
+
+DEFAULT_CHUNK_SIZE = 5000
 
 class StatementParser:
     """Base class for parsing bank statements."""
@@ -23,8 +27,36 @@ class StatementParser:
         else:
             raise ValueError(f"Unsupported file type: {self.file_type}")
     
+    def iter_batches(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Parse the file incrementally, yielding lists of at most chunk_size transactions.
+        
+        CSV files are read chunk by chunk, so memory use is bounded by the
+        chunk size rather than the file size. Excel files cannot be read in
+        chunks and are loaded whole before being split into batches.
+        """
+        if self.file_type == 'csv':
+            yield from self._iter_csv_batches(chunk_size)
+        elif self.file_type == 'pdf':
+            yield self._parse_pdf()
+        elif self.file_type in ['xls', 'xlsx']:
+            transactions = self._parse_excel()
+            for start in range(0, len(transactions), chunk_size):
+                yield transactions[start:start + chunk_size]
+        else:
+            raise ValueError(f"Unsupported file type: {self.file_type}")
+    
     def _parse_csv(self):
         """Parse CSV statement."""
+        transactions = []
+        for batch in self._iter_csv_batches(None):
+            transactions.extend(batch)
+        
+        self.transactions = transactions
+        return transactions
+    
+    def _iter_csv_batches(self, chunk_size):
+        """Yield batches of transactions from a CSV statement."""
         raise NotImplementedError("CSV parsing not implemented in base class")
     
     def _parse_pdf(self):
@@ -35,64 +67,85 @@ class StatementParser:
         """Parse Excel statement."""
         raise NotImplementedError("Excel parsing not implemented in base class")
     
-    def _clean_amount(self, amount_str):
-        """Convert amount string to float."""
-        if not amount_str or pd.isna(amount_str):
-            return 0.0
-        
-        # Remove currency symbols and commas
-        amount_str = re.sub(r'[$£€,]', '', str(amount_str))
+    def _clean_amounts(self, amounts):
+        """Convert a Series of amount strings to floats, with 0.0 for unparseable values."""
+        amounts = amounts.astype('string').str.replace(r'[$£€,]', '', regex=True)
         
         # Handle parentheses for negative numbers
-        if '(' in amount_str and ')' in amount_str:
-            amount_str = amount_str.replace('(', '-').replace(')', '')
+        negative = amounts.str.contains('(', regex=False) & amounts.str.contains(')', regex=False)
+        amounts = amounts.mask(
+            negative.fillna(False),
+            amounts.str.replace('(', '-', regex=False).str.replace(')', '', regex=False)
+        )
         
-        try:
-            return float(amount_str)
-        except ValueError:
-            return 0.0
-    
-    def _format_date(self, date_str, date_format='%m/%d/%Y'):
-        """Convert date string to datetime object."""
-        if isinstance(date_str, datetime):
-            return date_str
+        return pd.to_numeric(amounts, errors='coerce').fillna(0.0).astype(float)
+    
+    def _format_dates(self, dates, date_format='%m/%d/%Y'):
+        """Convert a Series of date strings to Timestamps, with now for unparseable values."""
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            parsed = dates
+        else:
+            parsed = pd.to_datetime(dates, format=date_format, errors='coerce')
         
-        try:
-            return datetime.strptime(date_str, date_format)
-        except (ValueError, TypeError):
-            return datetime.now()
+        return parsed.fillna(pd.Timestamp(datetime.now()))
+    
+    def _text_column(self, df, column):
+        """Return a column as strings, or empty strings if it is missing."""
+        if column and column in df.columns:
+            return df[column].fillna('').astype(str)
+        return pd.Series('', index=df.index)
+    
+    def _read_csv(self, columns, chunk_size=None):
+        """
+        Read only the given columns of the CSV, all as strings.
+        
+        Yields the whole file as one DataFrame, or successive DataFrames of
+        chunk_size rows when a chunk size is given.
+        """
+        wanted = {column for column in columns if column}
+        reader = pd.read_csv(
+            self.file_path,
+            usecols=lambda column: column in wanted,
+            dtype=str,
+            chunksize=chunk_size
+        )
+        
+        if chunk_size is None:
+            yield reader
+        else:
+            with reader:
+                yield from reader
+    
+    def _build_transactions(self, df, date_column, description_column, amount_column,
+                            category_column=None, notes_column=None):
+        """Build the list of transaction dicts column-wise from a DataFrame."""
+        transactions = pd.DataFrame({
+            'date': self._format_dates(df[date_column]),
+            'description': self._text_column(df, description_column),
+            'amount': self._clean_amounts(df[amount_column]),
+            'category_hint': self._text_column(df, category_column),
+            'notes': self._text_column(df, notes_column)
+        }, index=df.index)
+        
+        return transactions.to_dict('records')
 
 class ChaseStatementParser(StatementParser):
     """Parser for Chase bank statements."""
     
-    def _parse_csv(self):
+    def _iter_csv_batches(self, chunk_size):
         """Parse Chase CSV statement."""
         try:
-            df = pd.read_csv(self.file_path)
-            
-            # Expected columns for Chase CSV format
-            expected_columns = ['Transaction Date', 'Post Date', 'Description', 'Category', 'Type', 'Amount', 'Memo']
-            
-            # Check if CSV has the expected format
-            if not all(col in df.columns for col in ['Transaction Date', 'Description', 'Amount']):
-                raise ValueError("CSV does not appear to be a Chase statement format")
-            
-            transactions = []
-            for _, row in df.iterrows():
-                amount = self._clean_amount(row['Amount'])
+            # Only the columns we use from the Chase CSV format
+            columns = ['Transaction Date', 'Description', 'Category', 'Amount', 'Memo']
+            for df in self._read_csv(columns, chunk_size):
+                # Check if CSV has the expected format
+                if not all(col in df.columns for col in ['Transaction Date', 'Description', 'Amount']):
+                    raise ValueError("CSV does not appear to be a Chase statement format")
                 
-                transaction = {
-                    'date': self._format_date(row['Transaction Date']),
-                    'description': row['Description'],
-                    'amount': amount,
-                    'category_hint': row.get('Category', ''),
-                    'notes': row.get('Memo', '')
-                }
-                transactions.append(transaction)
-            
-            self.transactions = transactions
-            return transactions
-            
+                yield self._build_transactions(
+                    df, 'Transaction Date', 'Description', 'Amount', 'Category', 'Memo'
+                )
+        
         except Exception as e:
             raise ValueError(f"Failed to parse Chase CSV statement: {str(e)}")
     
@@ -104,31 +157,16 @@ class ChaseStatementParser(StatementParser):
 class BankOfAmericaStatementParser(StatementParser):
     """Parser for Bank of America statements."""
     
-    def _parse_csv(self):
+    def _iter_csv_batches(self, chunk_size):
         """Parse Bank of America CSV statement."""
         try:
-            df = pd.read_csv(self.file_path)
-            
-            # Check if CSV has the expected format
-            if not all(col in df.columns for col in ['Date', 'Description', 'Amount']):
-                raise ValueError("CSV does not appear to be a Bank of America statement format")
-            
-            transactions = []
-            for _, row in df.iterrows():
-                amount = self._clean_amount(row['Amount'])
+            for df in self._read_csv(['Date', 'Description', 'Category', 'Amount'], chunk_size):
+                # Check if CSV has the expected format
+                if not all(col in df.columns for col in ['Date', 'Description', 'Amount']):
+                    raise ValueError("CSV does not appear to be a Bank of America statement format")
                 
-                transaction = {
-                    'date': self._format_date(row['Date']),
-                    'description': row['Description'],
-                    'amount': amount,
-                    'category_hint': row.get('Category', ''),
-                    'notes': ''
-                }
-                transactions.append(transaction)
-            
-            self.transactions = transactions
-            return transactions
-            
+                yield self._build_transactions(df, 'Date', 'Description', 'Amount', 'Category')
+        
         except Exception as e:
             raise ValueError(f"Failed to parse Bank of America CSV statement: {str(e)}")
 
@@ -143,61 +181,52 @@ class GenericStatementParser(StatementParser):
             'amount': 'Amount'
         }
     
-    def _parse_csv(self):
+    def _mapped_columns(self):
+        """Source columns named by the column mapping."""
+        keys = ['date', 'description', 'amount', 'category', 'notes']
+        return [self.column_mapping[key] for key in keys if self.column_mapping.get(key)]
+    
+    def _build_mapped_transactions(self, df):
+        """Build transactions using the column mapping."""
+        return self._build_transactions(
+            df,
+            self.column_mapping['date'],
+            self.column_mapping['description'],
+            self.column_mapping['amount'],
+            self.column_mapping.get('category'),
+            self.column_mapping.get('notes')
+        )
+    
+    def _iter_csv_batches(self, chunk_size):
         """Parse a generic CSV statement using column mapping."""
         try:
-            df = pd.read_csv(self.file_path)
-            
-            # Validate that the required columns exist
             required_columns = [self.column_mapping['date'], self.column_mapping['description'], self.column_mapping['amount']]
-            if not all(col in df.columns for col in required_columns):
-                raise ValueError(f"CSV is missing required columns. Expected: {required_columns}")
-            
-            transactions = []
-            for _, row in df.iterrows():
-                amount = self._clean_amount(row[self.column_mapping['amount']])
+            for df in self._read_csv(self._mapped_columns(), chunk_size):
+                # Validate that the required columns exist
+                if not all(col in df.columns for col in required_columns):
+                    raise ValueError(f"CSV is missing required columns. Expected: {required_columns}")
                 
-                transaction = {
-                    'date': self._format_date(row[self.column_mapping['date']]),
-                    'description': row[self.column_mapping['description']],
-                    'amount': amount,
-                    'category_hint': row.get(self.column_mapping.get('category', ''), ''),
-                    'notes': row.get(self.column_mapping.get('notes', ''), '')
-                }
-                transactions.append(transaction)
-            
-            self.transactions = transactions
-            return transactions
-            
+                yield self._build_mapped_transactions(df)
+        
         except Exception as e:
             raise ValueError(f"Failed to parse generic CSV statement: {str(e)}")
     
     def _parse_excel(self):
         """Parse a generic Excel statement using column mapping."""
         try:
-            df = pd.read_excel(self.file_path)
+            wanted = set(self._mapped_columns())
+            df = pd.read_excel(self.file_path, usecols=lambda column: column in wanted)
             
             # Validate that the required columns exist
             required_columns = [self.column_mapping['date'], self.column_mapping['description'], self.column_mapping['amount']]
             if not all(col in df.columns for col in required_columns):
                 raise ValueError(f"Excel file is missing required columns. Expected: {required_columns}")
             
-            transactions = []
-            for _, row in df.iterrows():
-                amount = self._clean_amount(row[self.column_mapping['amount']])
-                
-                transaction = {
-                    'date': self._format_date(row[self.column_mapping['date']]),
-                    'description': row[self.column_mapping['description']],
-                    'amount': amount,
-                    'category_hint': row.get(self.column_mapping.get('category', ''), ''),
-                    'notes': row.get(self.column_mapping.get('notes', ''), '')
-                }
-                transactions.append(transaction)
+            transactions = self._build_mapped_transactions(df)
             
             self.transactions = transactions
             return transactions
-            
+        
         except Exception as e:
             raise ValueError(f"Failed to parse generic Excel statement: {str(e)}")
 
@@ -213,17 +242,26 @@ def get_parser_for_file(file_path, file_type, bank_name=None, column_mapping=Non
     # Default to generic parser
     return GenericStatementParser(file_path, file_type, column_mapping)
 
-def save_uploaded_file(uploaded_file, upload_dir):
+def save_uploaded_file(uploaded_file, upload_dir, filename=None):
     """Save an uploaded file and return the file path."""
     if not os.path.exists(upload_dir):
         os.makedirs(upload_dir)
     
-    filename = secure_filename(uploaded_file.filename)
+    filename = secure_filename(filename or uploaded_file.filename)
     file_path = os.path.join(upload_dir, filename)
     
     uploaded_file.save(file_path)
     return file_path
 
+def hash_uploaded_file(uploaded_file, block_size=1024 * 1024):
+    """Return the SHA-256 of an uploaded file's contents, leaving the stream rewound."""
+    digest = hashlib.sha256()
+    uploaded_file.stream.seek(0)
+    for block in iter(lambda: uploaded_file.stream.read(block_size), b''):
+        digest.update(block)
+    uploaded_file.stream.seek(0)
+    return digest.hexdigest()
+
 def detect_file_type(filename):
     """Detect file type from filename."""
     _, extension = os.path.splitext(filename)
@@ -242,9 +280,59 @@ def parse_uploaded_statement(uploaded_file, bank_name=None, column_mapping=None)
     parser = get_parser_for_file(file_path, file_type, bank_name, column_mapping)
     
     # Parse the file
+    started_at = time.perf_counter()
     transactions = parser.parse()
+    metrics.observe_parse(file_type, len(transactions), time.perf_counter() - started_at)
     
     # Clean up (optional)
     os.remove(file_path)
     
-    return transactions
\ No newline at end of file
+    return transactions
+
+def serialize_parsed_transaction(transaction):
+    """Convert a parsed statement row to its preview format."""
+    return {
+        'date': transaction['date'].strftime('%Y-%m-%d'),
+        'description': transaction['description'],
+        'amount': transaction['amount'],
+        'category_hint': transaction.get('category_hint', ''),
+        'notes': transaction.get('notes', '')
+    }
+
+def stream_uploaded_statement(uploaded_file, bank_name=None, column_mapping=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Parse an uploaded bank statement file in batches.
+    
+    Yields lists of at most chunk_size transactions. The saved upload is
+    removed once the generator is exhausted or closed. Parse throughput
+    only counts time spent producing batches, not the caller's work.
+    """
+    # Save the uploaded file
+    upload_dir = os.path.join(os.getcwd(), 'uploads')
+    file_path = save_uploaded_file(uploaded_file, upload_dir)
+    file_type = None
+    rows = 0
+    parse_seconds = 0.0
+    
+    try:
+        # Detect file type
+        file_type = detect_file_type(uploaded_file.filename)
+        
+        # Get appropriate parser
+        parser = get_parser_for_file(file_path, file_type, bank_name, column_mapping)
+        batches = parser.iter_batches(chunk_size)
+        
+        while True:
+            started_at = time.perf_counter()
+            batch = next(batches, None)
+            parse_seconds += time.perf_counter() - started_at
+            
+            if batch is None:
+                break
+            
+            rows += len(batch)
+            yield batch
+    finally:
+        os.remove(file_path)
+        if rows:
+            metrics.observe_parse(file_type, rows, parse_seconds)
\ No newline at end of file
@@ -1,6 +1,8 @@
 import pandas as pd
 from datetime import datetime, timedelta
 from backend.services.analyzers.spending_analyzer import SpendingAnalyzer
+from backend.services.analyzers.recurring_patterns import SERIES_WINDOW_DAYS, annual_cost
+from backend.services.analyzers.recurring_series import get_recurring_series
 from backend.models import Category, Transaction, Account
 
 class BudgetRecommendationService:
@@ -9,6 +11,7 @@ class BudgetRecommendationService:
     def __init__(self, user_id):
         self.user_id = user_id
         self.analyzer = SpendingAnalyzer(user_id)
+        self._recurring_patterns = None
     
     def generate_budget_plan(self, income=None, savings_goal_percentage=20):
         """
@@ -240,85 +243,38 @@ class BudgetRecommendationService:
         """
         Identify recurring transaction patterns.
         
+        Reads the user's recurring series charged in the last 6 months,
+        whose statistics are kept up to date as transactions are written
+        and cover the 6 months before each series' latest charge. The
+        result is memoized on the service for the rest of the request.
+        
         Returns:
         - List of recurring transaction patterns
         """
-        # Get accounts for this user
-        accounts = Account.query.filter_by(user_id=self.user_id).all()
-        account_ids = [account.id for account in accounts]
-        
-        # Get transactions from the last 6 months
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=180)
-        
-        transactions = Transaction.query.filter(
-            Transaction.account_id.in_(account_ids),
-            Transaction.amount < 0,  # Expenses only
-            Transaction.transfer_account_id.is_(None),  # Exclude transfers
-            Transaction.transaction_date >= start_date,
-            Transaction.transaction_date <= end_date
-        ).all()
-        
-        if not transactions:
-            return []
-        
-        # Group transactions by similar descriptions
-        description_groups = {}
-        for transaction in transactions:
-            desc_key = self._normalize_description(transaction.description)
-            if desc_key:
-                if desc_key in description_groups:
-                    description_groups[desc_key].append(transaction)
-                else:
-                    description_groups[desc_key] = [transaction]
-        
-        # Identify recurring patterns
-        recurring_patterns = []
-        
-        for desc_key, trans_list in description_groups.items():
-            if len(trans_list) >= 3:  # Need at least 3 instances to establish a pattern
-                # Sort by date
-                trans_list.sort(key=lambda x: x.transaction_date)
-                
-                # Check if amounts are similar
-                amounts = [abs(t.amount) for t in trans_list]
-                avg_amount = sum(amounts) / len(amounts)
-                amounts_similar = all(abs(amount - avg_amount) / avg_amount < 0.1 for amount in amounts)
-                
-                if amounts_similar:
-                    # Check for monthly pattern
-                    dates = [t.transaction_date for t in trans_list]
-                    intervals = [(dates[i+1] - dates[i]).days for i in range(len(dates)-1)]
-                    avg_interval = sum(intervals) / len(intervals)
-                    
-                    if 25 <= avg_interval <= 35:  # Monthly
-                        frequency = 'monthly'
-                    elif 13 <= avg_interval <= 16:  # Bi-weekly
-                        frequency = 'bi-weekly'
-                    elif 6 <= avg_interval <= 8:  # Weekly
-                        frequency = 'weekly'
-                    else:
-                        frequency = 'irregular'
-                    
-                    category_name = "Uncategorized"
-                    if trans_list[0].category_id:
-                        category = Category.query.get(trans_list[0].category_id)
-                        if category:
-                            category_name = category.name
-                    
-                    recurring_patterns.append({
-                        'description': trans_list[0].description,
-                        'normalized_description': desc_key,
-                        'amount': round(avg_amount, 2),
-                        'frequency': frequency,
-                        'instances': len(trans_list),
-                        'category': category_name,
-                        'annual_cost': round(avg_amount * (12 if frequency == 'monthly' else 26 if frequency == 'bi-weekly' else 52), 2)
-                    })
+        if self._recurring_patterns is not None:
+            return self._recurring_patterns
+        
+        start_date = datetime.now() - timedelta(days=SERIES_WINDOW_DAYS)
+        
+        recurring_patterns = [
+            {
+                'description': series.description,
+                'normalized_description': series.normalized_description,
+                'amount': round(series.mean_amount, 2),
+                'frequency': series.cadence,
+                'instances': series.transaction_count,
+                'category': category_name or 'Uncategorized',
+                'annual_cost': annual_cost(series.mean_amount, series.cadence),
+                'last_seen': series.last_seen.strftime('%Y-%m-%d'),
+                'expected_next_date': series.expected_next_date.strftime('%Y-%m-%d')
+            }
+            for series, category_name in get_recurring_series(self.user_id, start_date)
+        ]
         
         # Sort by annual cost (highest first)
         recurring_patterns.sort(key=lambda x: x['annual_cost'], reverse=True)
         
+        self._recurring_patterns = recurring_patterns
         return recurring_patterns
     
     def _identify_potential_subscriptions(self):
@@ -360,24 +316,3 @@ class BudgetRecommendationService:
                 subscriptions.append(pattern)
         
         return subscriptions
-    
-    def _normalize_description(self, description):
-        """Normalize transaction descriptions to group similar ones."""
-        if not description:
-            return None
-        
-        # Convert to lowercase
-        desc = description.lower()
-        
-        # Remove dates, numbers, special characters
-        desc = ''.join([c for c in desc if c.isalpha() or c.isspace()])
-        
-        # Remove common words
-        common_words = ['the', 'and', 'for', 'inc', 'ltd', 'llc', 'co', 'company']
-        words = desc.split()
-        desc = ' '.join([word for word in words if word not in common_words])
-        
-        # Trim and remove extra spaces
-        desc = ' '.join(desc.split())
-        
-        return desc if desc else None
\ No newline at end of file
@@ -0,0 +1,11 @@
+"""
+WSGI entry point for gunicorn: gunicorn backend.wsgi:app
+
+Building the app does no database work, so workers boot quickly. Create
+or upgrade the schema beforehand with init_db.py, flask init-db or the
+scripts in database/migrations.
+"""
+
+from backend.app import create_app
+
+app = create_app()
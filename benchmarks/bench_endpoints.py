@@ -0,0 +1,194 @@
+"""
+Benchmark for the transaction and analysis endpoints at several data sizes.
+
+This script will:
+1. For each size, load a fresh synthetic dataset with the given number of
+   users and that many transactions per user on average
+2. Pick the user whose transaction count is closest to the size and time
+   each /api/transactions and /api/analysis endpoint for them through the
+   test client, after one warm-up request
+3. Print the timings and save them as JSON, optionally comparing them with
+   an earlier results file
+
+The analysis cache is disabled unless --cache is given, so the timings
+measure the work behind each endpoint.
+
+Usage: python benchmarks/bench_endpoints.py --sizes 1000,10000,50000 --compare benchmarks/results/endpoints-20240101-120000.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+
+from sqlalchemy import func
+
+# Add the project root to the path so we can import the application
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+from backend.models import db, Account, Transaction
+from backend.api.controllers.auth_controller import generate_auth_token
+from backend.app import create_app
+from benchmarks.synthetic_data import generate_dataset
+
+DEFAULT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, 'benchmarks', 'results')
+
+# (name, path, query parameters); {budget_id} is filled in per user
+ENDPOINTS = [
+    ('transactions', '/api/transactions', {}),
+    ('transactions-expenses', '/api/transactions', {'type': 'expense', 'limit': 100}),
+    ('spending-by-category', '/api/analysis/spending-by-category', {}),
+    ('monthly-trends', '/api/analysis/monthly-trends', {'months': 12}),
+    ('largest-expenses', '/api/analysis/largest-expenses', {'limit': 10}),
+    ('budget-comparison', '/api/analysis/budget-comparison/{budget_id}', {}),
+    ('spending-recommendations', '/api/analysis/recommendations/spending', {'months': 3}),
+    ('budget-plan', '/api/analysis/recommendations/budget-plan', {'income': 5000}),
+    ('cost-cutting', '/api/analysis/recommendations/cost-cutting', {})
+]
+
+def git_commit():
+    """Return the current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def pick_user(dataset, size):
+    """Return the index of the generated user whose transaction count is closest to size, and that count."""
+    counts = dict(db.session.query(Account.user_id, func.count(Transaction.id)).join(
+        Transaction, Transaction.account_id == Account.id
+    ).filter(Account.user_id.in_(dataset['users'])).group_by(Account.user_id).all())
+    
+    index = min(range(len(dataset['users'])), key=lambda i: abs(counts.get(dataset['users'][i], 0) - size))
+    return index, counts.get(dataset['users'][index], 0)
+
+def time_endpoint(client, path, params, headers, repeat):
+    """Time repeated GET requests after one warm-up, returning the timings in milliseconds."""
+    response = client.get(path, query_string=params, headers=headers)
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        client.get(path, query_string=params, headers=headers)
+        timings.append((time.perf_counter() - started_at) * 1000)
+    
+    return timings, len(response.get_data())
+
+def run_size(database_uri, size, users, repeat, use_cache, seed):
+    """Load a dataset of the given size and time every endpoint against it."""
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': database_uri,
+        'ANALYSIS_CACHE_BACKEND': 'memory' if use_cache else 'none',
+        'LOG_FILE': None,
+        'LOG_LEVEL': 'WARNING'
+    })
+    
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        
+        started_at = time.perf_counter()
+        dataset = generate_dataset(users, size * users, seed=seed, prefix=f'bench{size}_')
+        print(f"Size {size}: loaded {dataset['transactions']} transactions for {users} users "
+              f"in {time.perf_counter() - started_at:.1f}s")
+        
+        index, user_transactions = pick_user(dataset, size)
+        token = generate_auth_token(dataset['users'][index])
+        budget_id = dataset['budgets'][index]
+    
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+    results = []
+    
+    for name, path, params in ENDPOINTS:
+        timings, response_bytes = time_endpoint(client, path.format(budget_id=budget_id), params, headers, repeat)
+        timings.sort()
+        results.append({
+            'size': size,
+            'user_transactions': user_transactions,
+            'endpoint': name,
+            'median_ms': round(statistics.median(timings), 3),
+            'min_ms': round(timings[0], 3),
+            'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+            'response_bytes': response_bytes
+        })
+    
+    return results
+
+def load_previous(path):
+    """Map (size, endpoint) to the median of an earlier results file."""
+    with open(path) as f:
+        previous = json.load(f)
+    return {(row['size'], row['endpoint']): row['median_ms'] for row in previous['results']}
+
+def print_results(results, previous=None):
+    """Print a table of the results, with the change from an earlier run if given."""
+    header = f"{'size':>8}  {'endpoint':<26}{'median ms':>11}{'p95 ms':>10}{'bytes':>10}"
+    if previous is not None:
+        header += f"{'before ms':>11}{'change':>9}"
+    print(header)
+    
+    for row in results:
+        line = (f"{row['size']:>8}  {row['endpoint']:<26}{row['median_ms']:>11.2f}"
+                f"{row['p95_ms']:>10.2f}{row['response_bytes']:>10}")
+        if previous is not None:
+            before = previous.get((row['size'], row['endpoint']))
+            if before:
+                line += f"{before:>11.2f}{row['median_ms'] / before - 1:>+9.0%}"
+        print(line)
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Transaction and analysis endpoint benchmark")
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated transactions per user to test")
+    parser.add_argument("--users", type=int, default=5, help="Users in each dataset")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed requests per endpoint")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the datasets")
+    parser.add_argument("--cache", action="store_true", help="Keep the analysis cache enabled")
+    parser.add_argument("--database-url", help="Scratch database to use instead of a temporary SQLite file; "
+                                                "its tables are dropped for every size")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/endpoints-<time>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare with")
+    args = parser.parse_args()
+    
+    sizes = [int(size) for size in args.sizes.split(',')]
+    results = []
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_uri = args.database_url or f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        for size in sizes:
+            results.extend(run_size(database_uri, size, args.users, args.repeat, args.cache, args.seed))
+    
+    print_results(results, load_previous(args.compare) if args.compare else None)
+    
+    output = args.output or os.path.join(
+        DEFAULT_OUTPUT_DIR, f"endpoints-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'database': 'sqlite' if not args.database_url else args.database_url.split(':', 1)[0],
+            'users': args.users,
+            'repeat': args.repeat,
+            'analysis_cache': args.cache,
+            'results': results
+        }, f, indent=2)
+    
+    print(f"Results saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Benchmark for JSON encoding and response compression.
+
+This script will:
+1. Build API-shaped payloads of several sizes: transaction lists as
+   returned by /api/transactions, analysis records from
+   DataFrame.to_dict('records'), and rows holding datetimes, NumPy scalars
+   and NaN values that need the provider's conversions
+2. Encode each payload with the standard library and orjson encoders of
+   FastJSONProvider, compact and indented as in debug mode, and time them
+3. Compress the compact output with gzip, and brotli when installed, at
+   the levels the app is configured with
+4. Print encode and compress times with payload sizes, optionally saving
+   them as JSON
+
+Usage: python benchmarks/bench_json.py --rows 1000,10000,100000 --repeat 5
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import statistics
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from flask import Flask
+
+# Add the project root to the path so we can import the application
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+from backend.services.http.json_provider import FastJSONProvider, orjson
+from backend.services.http.compression import ResponseCompressor, available_encodings
+
+def transaction_payload(rows, rng):
+    """A page of transactions in the /api/transactions format."""
+    start = datetime(2024, 1, 1)
+    offsets = rng.integers(0, 365 * 24 * 3600, rows)
+    amounts = np.round(rng.normal(-40, 60, rows), 2)
+    account_ids = [str(uuid.UUID(int=int(value))) for value in rng.integers(0, 2 ** 63, 3)]
+    
+    transactions = []
+    for i in range(rows):
+        created = (start + timedelta(seconds=int(offsets[i]))).isoformat()
+        transactions.append({
+            'id': str(uuid.UUID(int=int(rng.integers(0, 2 ** 63)))),
+            'amount': float(amounts[i]),
+            'description': f'Merchant #{i % 500}',
+            'transaction_date': created,
+            'is_recurring': bool(i % 7 == 0),
+            'recurrence_pattern': 'monthly' if i % 7 == 0 else None,
+            'notes': None,
+            'account_id': account_ids[i % 3],
+            'account_name': 'Checking',
+            'category_id': None,
+            'category_name': 'Food' if amounts[i] < 0 else 'Income',
+            'transfer_account_id': None,
+            'transfer_account_name': None,
+            'transaction_type': 'expense' if amounts[i] < 0 else 'income',
+            'created_at': created
+        })
+    
+    return {'transactions': transactions, 'next_cursor': None, 'limit': rows}
+
+def analysis_payload(rows, rng):
+    """Analysis results shaped like the monthly trends pivot, via DataFrame.to_dict('records')."""
+    categories = ['Housing', 'Food', 'Transportation', 'Utilities', 'Entertainment', 'Healthcare']
+    frame = pd.DataFrame(rng.gamma(2, 150, (rows, len(categories))).round(2), columns=categories)
+    frame.insert(0, 'month', [f'{2000 + i // 12:04d}-{i % 12 + 1:02d}' for i in range(rows)])
+    frame['total_amount'] = frame[categories].sum(axis=1)
+    return {'months': rows, 'trends': frame.to_dict('records')}
+
+def numpy_payload(rows, rng):
+    """Rows with datetimes, NumPy scalars and non-finite values, which need the provider's conversions."""
+    amounts = rng.normal(100, 50, rows)
+    amounts[::50] = np.nan
+    counts = rng.integers(1, 20, rows)
+    start = datetime(2024, 1, 1)
+    
+    return {'rows': [
+        {
+            'date': start + timedelta(days=i % 365),
+            'amount': amounts[i],
+            'count': counts[i],
+            'ratio': amounts[i] / counts[i] if i % 97 else np.inf
+        }
+        for i in range(rows)
+    ]}
+
+PAYLOADS = {
+    'transactions': transaction_payload,
+    'analysis-records': analysis_payload,
+    'numpy-rows': numpy_payload
+}
+
+def make_provider(encoder):
+    """Build the app's JSON provider with the given encoder."""
+    app = Flask(__name__)
+    app.config['JSON_ENCODER'] = encoder
+    return FastJSONProvider(app)
+
+def time_call(function, repeat):
+    """Return the median time of repeated calls in milliseconds, and the last result."""
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(timings), result
+
+def run(rows_list, repeat, gzip_level, brotli_quality, seed):
+    """Encode and compress every payload at every size."""
+    encoders = ['json'] + (['orjson'] if orjson is not None else [])
+    providers = {encoder: make_provider(encoder) for encoder in encoders}
+    
+    compressor = ResponseCompressor()
+    compressor.gzip_level = gzip_level
+    compressor.brotli_quality = brotli_quality
+    
+    results = []
+    for rows in rows_list:
+        for name, build in PAYLOADS.items():
+            payload = build(rows, np.random.default_rng(seed))
+            
+            for encoder, provider in providers.items():
+                for indent in (None, 2):
+                    encode_ms, body = time_call(lambda: provider.dumps_bytes(payload, indent), repeat)
+                    result = {
+                        'rows': rows,
+                        'payload': name,
+                        'encoder': encoder,
+                        'indent': bool(indent),
+                        'encode_ms': round(encode_ms, 3),
+                        'bytes': len(body)
+                    }
+                    
+                    # Compression only depends on the bytes, so measure it once per payload
+                    if indent is None and encoder == encoders[-1]:
+                        for encoding in available_encodings():
+                            compress_ms, compressed = time_call(lambda: compressor.compress(body, encoding), repeat)
+                            result[f'{encoding}_ms'] = round(compress_ms, 3)
+                            result[f'{encoding}_bytes'] = len(compressed)
+                    
+                    results.append(result)
+    
+    return results
+
+def print_results(results):
+    """Print a table of encode times and sizes, with compression results where measured."""
+    encodings = available_encodings()
+    header = f"{'rows':>8}  {'payload':<18}{'encoder':<8}{'indent':<8}{'encode ms':>11}{'bytes':>11}"
+    for encoding in encodings:
+        header += f"{encoding + ' ms':>10}{encoding + ' bytes':>12}"
+    print(header)
+    
+    for row in results:
+        line = (f"{row['rows']:>8}  {row['payload']:<18}{row['encoder']:<8}{'yes' if row['indent'] else 'no':<8}"
+                f"{row['encode_ms']:>11.2f}{row['bytes']:>11}")
+        for encoding in encodings:
+            if f'{encoding}_ms' in row:
+                line += f"{row[encoding + '_ms']:>10.2f}{row[encoding + '_bytes']:>12}"
+        print(line)
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="JSON encoding and compression benchmark")
+    parser.add_argument("--rows", default="1000,10000", help="Comma-separated payload sizes in rows")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement")
+    parser.add_argument("--gzip-level", type=int, default=6, help="gzip level, as COMPRESSION_GZIP_LEVEL")
+    parser.add_argument("--brotli-quality", type=int, default=4, help="brotli quality, as COMPRESSION_BROTLI_QUALITY")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the payloads")
+    parser.add_argument("--output", help="Save the results to this JSON file")
+    args = parser.parse_args()
+    
+    if orjson is None:
+        print("orjson is not installed; only the standard library encoder is measured")
+    
+    results = run([int(rows) for rows in args.rows.split(',')], args.repeat, args.gzip_level,
+                  args.brotli_quality, args.seed)
+    print_results(results)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'created_at': datetime.now().isoformat(timespec='seconds'), 'results': results}, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
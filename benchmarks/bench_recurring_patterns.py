@@ -0,0 +1,199 @@
+"""
+Benchmark for recurring-pattern detection.
+
+This script will:
+1. Create a temporary SQLite database with one user holding the given
+   number of expenses over the last six months, a mix of monthly, weekly
+   and bi-weekly charges and one-off purchases
+2. Run the original detector, a Python loop over ORM rows with a
+   character-by-character normalizer and a category lookup per pattern
+3. Build the recurring_series table, time reading the patterns from it
+   over the same six months, check they agree with the original
+   detector, and time a full cost-cutting request
+
+Usage: python benchmarks/bench_recurring_patterns.py --expenses 100000
+"""
+
+import os
+import sys
+import time
+import uuid
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+# Add the project root to the path so we can import the application
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.models import db, User, Account, Category, Transaction
+from backend.services.analyzers.recurring_series import rebuild_recurring_series
+from backend.services.recommendations.budget_recommendations import BudgetRecommendationService
+from backend.app import create_app
+
+MERCHANTS = ['Netflix', 'Spotify', 'Gym Membership', 'Cloud Storage', 'Coffee Shop', 'Grocery Store',
+             'Gas Station', 'Restaurant', 'Pharmacy', 'Bookstore']
+
+def seed_expenses(user_id, account_id, category_ids, count):
+    """Insert count expenses spread over the last 180 days."""
+    now = datetime.now()
+    rows = []
+    
+    for i in range(count):
+        if i % 10 == 0:
+            # Recurring charges on a fixed cadence
+            merchant = f"{MERCHANTS[i % 4]} {''.join(chr(97 + int(d)) for d in str(i % 200))}"
+            cadence = [30, 7, 14][i % 3]
+            date = now - timedelta(days=(i // 10 % 6) * cadence + 1)
+            amount = -(9.99 + i % 200)
+        else:
+            merchant = f'{random.choice(MERCHANTS)} #{random.randint(1, 99999)} Store {random.randint(1, 5000)}'
+            date = now - timedelta(days=random.uniform(1, 179))
+            amount = -round(random.uniform(1, 300), 2)
+        
+        rows.append({
+            'id': str(uuid.uuid4()),
+            'amount': amount,
+            'description': merchant,
+            'transaction_date': date,
+            'is_recurring': False,
+            'notes': '',
+            'created_at': now,
+            'updated_at': now,
+            'account_id': account_id,
+            'category_id': random.choice(category_ids + [None])
+        })
+    
+    for start in range(0, len(rows), 10000):
+        db.session.execute(insert(Transaction.__table__), rows[start:start + 10000])
+    db.session.commit()
+
+def normalize_description_row_by_row(description):
+    """The original character-by-character normalizer, kept for comparison."""
+    if not description:
+        return None
+    
+    desc = description.lower()
+    desc = ''.join([c for c in desc if c.isalpha() or c.isspace()])
+    common_words = ['the', 'and', 'for', 'inc', 'ltd', 'llc', 'co', 'company']
+    desc = ' '.join([word for word in desc.split() if word not in common_words])
+    desc = ' '.join(desc.split())
+    
+    return desc if desc else None
+
+def identify_recurring_patterns_row_by_row(user_id):
+    """The original per-group loop detector, kept for comparison."""
+    account_ids = [account.id for account in Account.query.filter_by(user_id=user_id).all()]
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=180)
+    
+    transactions = Transaction.query.filter(
+        Transaction.account_id.in_(account_ids),
+        Transaction.amount < 0,
+        Transaction.transfer_account_id.is_(None),
+        Transaction.transaction_date >= start_date,
+        Transaction.transaction_date <= end_date
+    ).order_by(Transaction.transaction_date, Transaction.id).all()
+    
+    description_groups = {}
+    for transaction in transactions:
+        desc_key = normalize_description_row_by_row(transaction.description)
+        if desc_key:
+            description_groups.setdefault(desc_key, []).append(transaction)
+    
+    recurring_patterns = []
+    for desc_key, trans_list in description_groups.items():
+        if len(trans_list) < 3:
+            continue
+        
+        trans_list.sort(key=lambda x: x.transaction_date)
+        amounts = [abs(t.amount) for t in trans_list]
+        avg_amount = sum(amounts) / len(amounts)
+        if not all(abs(amount - avg_amount) / avg_amount < 0.1 for amount in amounts):
+            continue
+        
+        dates = [t.transaction_date for t in trans_list]
+        intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
+        avg_interval = sum(intervals) / len(intervals)
+        
+        if 25 <= avg_interval <= 35:
+            frequency = 'monthly'
+        elif 13 <= avg_interval <= 16:
+            frequency = 'bi-weekly'
+        elif 6 <= avg_interval <= 8:
+            frequency = 'weekly'
+        else:
+            frequency = 'irregular'
+        
+        category_name = "Uncategorized"
+        if trans_list[0].category_id:
+            category = db.session.get(Category, trans_list[0].category_id)
+            if category:
+                category_name = category.name
+        
+        recurring_patterns.append({
+            'description': trans_list[0].description,
+            'normalized_description': desc_key,
+            'amount': round(avg_amount, 2),
+            'frequency': frequency,
+            'instances': len(trans_list),
+            'category': category_name,
+            'annual_cost': round(avg_amount * (12 if frequency == 'monthly' else 26 if frequency == 'bi-weekly' else 52), 2)
+        })
+    
+    recurring_patterns.sort(key=lambda x: x['annual_cost'], reverse=True)
+    return recurring_patterns
+
+def timed(label, function):
+    """Run a function, print how long it took and return its result and time."""
+    started = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<26} {elapsed:8.3f}s")
+    return result, elapsed
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Recurring pattern detection benchmark")
+    parser.add_argument("--expenses", type=int, default=100000, help="Number of expenses to generate")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}",
+            'ANALYSIS_CACHE_BACKEND': 'none'
+        })
+        
+        with app.app_context():
+            db.create_all()
+            
+            user = User(username='bench', email='bench@example.com', password='Benchmark1')
+            db.session.add(user)
+            db.session.commit()
+            
+            categories = Category.create_default_categories(user.id)
+            account = Account(name='Checking', account_type='checking', user_id=user.id)
+            db.session.add_all(categories + [account])
+            db.session.commit()
+            
+            random.seed(42)
+            print(f"Seeding {args.expenses:,} expenses...")
+            seed_expenses(user.id, account.id, [category.id for category in categories], args.expenses)
+            
+            before, before_time = timed('row-by-row detector', lambda: identify_recurring_patterns_row_by_row(user.id))
+            db.session.expunge_all()
+            
+            timed('series rebuild', lambda: rebuild_recurring_series(user.id))
+            series, series_time = timed('series read', lambda: BudgetRecommendationService(user.id)._identify_recurring_patterns())
+            
+            fields = ('normalized_description', 'amount', 'frequency', 'instances')
+            key = lambda pattern: tuple(pattern[field] for field in fields)
+            assert sorted(map(key, before)) == sorted(map(key, series)), "Series read disagrees with the detector"
+            print(f"Series found: {len(series)}, speedup over row-by-row: {before_time / series_time:.0f}x")
+            
+            timed('cost-cutting request', lambda: BudgetRecommendationService(user.id).identify_cost_cutting_opportunities())
+
+if __name__ == "__main__":
+    main()
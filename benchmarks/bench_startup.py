@@ -0,0 +1,149 @@
+"""
+Benchmark for worker startup time.
+
+This script will:
+1. Create a temporary SQLite database with a user and a few transactions
+2. Start fresh Python processes that each import the application, build it
+   with create_app, and time the first requests, as a new gunicorn worker
+   would: a health check, then an authenticated, database-backed request
+3. Repeat with workers forked from a process that already imported the
+   application, as gunicorn.conf.py arranges in production
+4. Report the median and slowest time for each phase
+
+Usage: python benchmarks/bench_startup.py --runs 10
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+import time
+from datetime import datetime, timedelta
+
+# Add the project root to the path so we can import the application
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+PHASES = ['import', 'create_app', 'first_request', 'first_db_request']
+
+# Runs in each cold-started child process
+CHILD_SCRIPT = """
+import json, os, time
+started = time.perf_counter()
+import backend.app
+imported = time.perf_counter()
+from benchmarks.bench_startup import time_worker
+print(json.dumps(dict(time_worker(os.environ['BENCH_DATABASE_URI'], os.environ['BENCH_TOKEN']), **{'import': imported - started})))
+"""
+
+def time_worker(database_uri, token):
+    """Build the app and time its first requests, as a newly booted worker would."""
+    from backend.app import create_app
+    
+    started = time.perf_counter()
+    app = create_app({'SQLALCHEMY_DATABASE_URI': database_uri, 'LOG_FILE': None, 'LOG_LEVEL': 'WARNING'})
+    created = time.perf_counter()
+    
+    client = app.test_client()
+    assert client.get('/api/health').status_code == 200
+    first_request = time.perf_counter()
+    
+    response = client.get('/api/accounts', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200, response.status_code
+    first_db_request = time.perf_counter()
+    
+    return {
+        'create_app': created - started,
+        'first_request': first_request - created,
+        'first_db_request': first_db_request - first_request
+    }
+
+def prepare_database(database_uri):
+    """Create the schema and a user with some data, returning an auth token."""
+    from backend.app import create_app
+    from backend.models import db, User, Account, Transaction
+    from backend.api.controllers.auth_controller import generate_auth_token
+    
+    app = create_app({'SQLALCHEMY_DATABASE_URI': database_uri, 'LOG_FILE': None, 'LOG_LEVEL': 'WARNING'})
+    with app.app_context():
+        db.create_all()
+        
+        user = User(username='bench', email='bench@example.com', password='Benchmark1')
+        db.session.add(user)
+        db.session.commit()
+        
+        account = Account(name='Checking', account_type='checking', balance=1000, user_id=user.id)
+        db.session.add(account)
+        db.session.commit()
+        
+        start = datetime(2024, 1, 1)
+        for i in range(100):
+            db.session.add(Transaction(
+                account_id=account.id,
+                amount=-round(5 + i % 40, 2),
+                description=f'Purchase {i}',
+                transaction_date=start + timedelta(days=i)
+            ))
+        db.session.commit()
+        
+        return generate_auth_token(user.id)
+
+def run_child(database_uri, token):
+    """Start the application in a new interpreter and return its phase timings."""
+    env = dict(os.environ, BENCH_DATABASE_URI=database_uri, BENCH_TOKEN=token, PYTHONPATH=PROJECT_ROOT)
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD_SCRIPT], env=env, cwd=PROJECT_ROOT,
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def run_forked(database_uri, token):
+    """Fork this process, which has the application imported, and time the child's startup."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    
+    if pid == 0:
+        os.close(read_fd)
+        timings = dict(time_worker(database_uri, token), **{'import': 0.0})
+        with os.fdopen(write_fd, 'w') as pipe:
+            pipe.write(json.dumps(timings))
+        os._exit(0)
+    
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        timings = json.loads(pipe.read())
+    os.waitpid(pid, 0)
+    return timings
+
+def report(title, timings):
+    """Print the median and slowest time of each phase."""
+    print(f"{title} ({len(timings)} runs)")
+    for phase in PHASES + ['total']:
+        if phase == 'total':
+            values = [sum(run[name] for name in PHASES) for run in timings]
+        else:
+            values = [run[phase] for run in timings]
+        print(f"{phase:>17}: median {statistics.median(values) * 1000:8.1f} ms   max {max(values) * 1000:8.1f} ms")
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Worker startup benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="Number of cold starts to time")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_uri = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        token = prepare_database(database_uri)
+        
+        cold = [run_child(database_uri, token) for _ in range(args.runs)]
+        forked = [run_forked(database_uri, token) for _ in range(args.runs)] if hasattr(os, 'fork') else []
+    
+    report("Cold start", cold)
+    if forked:
+        report("Forked from a preloaded master", forked)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark for statement parsing throughput.
+
+This script will:
+1. Generate a synthetic Chase-format CSV export
+2. Parse it with the original row-by-row approach (iterrows, _clean_amount
+   and _format_date per row) and with the column-wise parser
+3. Report rows per second for both
+
+Usage: python benchmarks/bench_statement_parser.py --rows 50000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import datetime
+
+import pandas as pd
+
+# Add the project root to the path so we can import the application
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.services.parsers.statement_parser import ChaseStatementParser
+
+def generate_chase_csv(path, rows):
+    """Write a Chase-format CSV with the given number of rows."""
+    start = datetime.date(2023, 1, 1)
+    descriptions = ['Grocery Store', 'Coffee Shop', 'Gas Station', 'Netflix', 'Restaurant', 'Payroll']
+    categories = ['Groceries', 'Food & Drink', 'Gas', 'Entertainment', 'Food & Drink', '']
+    
+    with open(path, 'w') as f:
+        f.write('Transaction Date,Post Date,Description,Category,Type,Amount,Memo\n')
+        for i in range(rows):
+            date = (start + datetime.timedelta(days=i % 365)).strftime('%m/%d/%Y')
+            index = random.randrange(len(descriptions))
+            amount = round(random.uniform(1, 500), 2)
+            amount_str = f'"${amount:,.2f}"' if index == 5 else f'({amount:.2f})'
+            f.write(f'{date},{date},{descriptions[index]} #{i % 97},{categories[index]},Sale,{amount_str},\n')
+
+def parse_row_by_row(parser):
+    """The original iterrows-based Chase parsing loop, kept for comparison."""
+    df = pd.read_csv(parser.file_path)
+    transactions = []
+    for _, row in df.iterrows():
+        transactions.append({
+            'date': parser._format_date(row['Transaction Date']),
+            'description': row['Description'],
+            'amount': parser._clean_amount(row['Amount']),
+            'category_hint': row.get('Category', ''),
+            'notes': row.get('Memo', '')
+        })
+    return transactions
+
+def time_parse(label, rows, parse):
+    """Time a parse function and print its throughput."""
+    started = time.perf_counter()
+    transactions = parse()
+    elapsed = time.perf_counter() - started
+    
+    assert len(transactions) == rows
+    print(f"{label:<14} {elapsed:8.3f}s {rows / elapsed:12,.0f} rows/s")
+    return elapsed
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Statement parser benchmark")
+    parser.add_argument("--rows", type=int, default=50000, help="Number of statement rows to generate")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'chase.csv')
+        generate_chase_csv(path, args.rows)
+        statement_parser = ChaseStatementParser(path, 'csv')
+        
+        print(f"Parsing {args.rows:,} rows")
+        before = time_parse('row-by-row', args.rows, lambda: parse_row_by_row(statement_parser))
+        after = time_parse('column-wise', args.rows, statement_parser.parse)
+        print(f"Speedup: {before / after:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+"""
+Synthetic data generator for load tests and benchmarks.
+
+This script will:
+1. Create the given number of users, each with the default categories, a
+   checking, savings and credit card account and a budget for the current
+   month
+2. Generate their transactions with NumPy, a chunk of users at a time:
+   bi-weekly pay, monthly transfers to savings, rent, bills and
+   subscriptions on a fixed cadence, weekly groceries, and one-off
+   purchases filling the rest of each user's share
+3. Bulk-load every table, with COPY on PostgreSQL and batched multi-row
+   inserts elsewhere, then rebuild the monthly totals and recurring series
+
+The database is the one create_app uses (DATABASE_URL). Every generated
+user can log in with the password Synthetic1.
+
+Usage: python benchmarks/synthetic_data.py --users 10000 --transactions 50000000
+"""
+
+import io
+import os
+import sys
+import time
+import uuid
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
+
+# Add the project root to the path so we can import the application
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.models import db, User, Account, Category, Transaction, Budget, BudgetItem
+from backend.models.category import DEFAULT_CATEGORIES
+from backend.services.auth.password_hasher import password_hasher
+from backend.services.analyzers.monthly_totals import rebuild_monthly_totals
+from backend.services.analyzers.recurring_series import rebuild_recurring_series
+
+PASSWORD = 'Synthetic1'
+
+# Expenses on a fixed cadence: (description, category, cadence in days,
+# typical amount, spread of the amount between users, variation between
+# occurrences, share of users who have it)
+RECURRING_EXPENSES = [
+    ('Rent Payment', 'Housing', 30, 1500, 600, 0.0, 1.0),
+    ('Electric Company', 'Utilities', 30, 90, 40, 0.04, 0.9),
+    ('Water Utility', 'Utilities', 30, 45, 15, 0.03, 0.7),
+    ('Phone Bill', 'Utilities', 30, 70, 30, 0.0, 0.9),
+    ('Car Insurance', 'Transportation', 30, 120, 50, 0.0, 0.6),
+    ('Student Loan Payment', 'Debt Payments', 30, 250, 150, 0.0, 0.3),
+    ('Netflix', 'Entertainment', 30, 15.49, 0, 0.0, 0.6),
+    ('Spotify', 'Entertainment', 30, 10.99, 0, 0.0, 0.5),
+    ('Gym Membership', 'Personal', 30, 40, 20, 0.0, 0.4),
+    ('Cloud Storage', 'Utilities', 30, 2.99, 0, 0.0, 0.3),
+    ('Weekly Groceries Market', 'Food', 7, 110, 50, 0.35, 0.8)
+]
+
+# One-off purchases: (merchant, category, log-normal mu and sigma of the amount, weight)
+PURCHASE_MERCHANTS = [
+    ('Coffee Shop', 'Food', 1.8, 0.4, 0.20),
+    ('Restaurant', 'Food', 3.3, 0.5, 0.15),
+    ('Grocery Store', 'Food', 3.6, 0.7, 0.15),
+    ('Gas Station', 'Transportation', 3.6, 0.3, 0.10),
+    ('Rideshare', 'Transportation', 2.9, 0.5, 0.06),
+    ('Pharmacy', 'Healthcare', 3.0, 0.7, 0.05),
+    ('Online Marketplace', 'Personal', 3.5, 0.9, 0.12),
+    ('Department Store', 'Personal', 4.0, 0.8, 0.05),
+    ('Movie Theater', 'Entertainment', 3.0, 0.3, 0.04),
+    ('Bookstore', 'Education', 3.2, 0.6, 0.03),
+    ('Hardware Store', 'Other Expenses', 3.5, 0.8, 0.05)
+]
+
+# Share of one-off purchases left uncategorized, and paid by credit card
+UNCATEGORIZED_SHARE = 0.05
+CREDIT_CARD_SHARE = 0.4
+
+# Monthly budget limits per category for each generated user
+BUDGET_LIMITS = {'Housing': 2000, 'Food': 800, 'Utilities': 300, 'Transportation': 400, 'Entertainment': 150}
+
+TRANSACTION_COLUMNS = [
+    'id', 'amount', 'description', 'transaction_date', 'is_recurring', 'recurrence_pattern', 'notes',
+    'fingerprint', 'created_at', 'updated_at', 'account_id', 'category_id', 'transfer_account_id',
+    'recurring_series_id'
+]
+
+def new_ids(count):
+    """Return count new UUID strings."""
+    return [str(uuid.uuid4()) for _ in range(count)]
+
+def bulk_load(table, rows, batch_size):
+    """
+    Insert a DataFrame of rows into a table.
+    
+    PostgreSQL loads the rows with COPY; other databases get multi-row
+    inserts of batch_size rows.
+    """
+    if rows.empty:
+        return
+    
+    connection = db.session.connection()
+    if connection.dialect.name == 'postgresql':
+        buffer = io.StringIO()
+        rows.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        
+        cursor = connection.connection.cursor()
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(rows.columns)}) FROM STDIN WITH (FORMAT csv, NULL '')", buffer
+        )
+        return
+    
+    # Replace NaN/NaT with None so they load as NULL
+    rows = rows.astype(object).where(rows.notna(), None)
+    columns = list(rows.columns)
+    records = [dict(zip(columns, row)) for row in rows.itertuples(index=False, name=None)]
+    for start in range(0, len(records), batch_size):
+        connection.execute(insert(table), records[start:start + batch_size])
+
+def expand_schedule(offsets, cadences, days):
+    """
+    Expand series on a fixed cadence into their occurrences.
+    
+    Parameters:
+    - offsets: Day of each series' first occurrence
+    - cadences: Days between occurrences of each series
+    - days: Length of the period in days
+    
+    Returns:
+    - (series index, day) arrays with one entry per occurrence
+    """
+    counts = np.maximum((days - offsets) // cadences + 1, 0)
+    series_index = np.repeat(np.arange(len(counts)), counts)
+    occurrence = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return series_index, offsets[series_index] + occurrence * cadences[series_index]
+
+def generate_users(rng, prefix, first_index, count, password_hash, now):
+    """
+    Build the users, categories, accounts and budgets for a chunk of users.
+    
+    Returns:
+    - Dict of DataFrames keyed by table, plus a 'lookup' dict of per-user
+      ID arrays: user, checking, savings, credit, and category ID arrays
+      keyed by category name
+    """
+    user_ids = np.array(new_ids(count), dtype=object)
+    numbers = np.arange(first_index, first_index + count)
+    
+    users = pd.DataFrame({
+        'id': user_ids,
+        'username': [f'{prefix}{number}' for number in numbers],
+        'email': [f'{prefix}{number}@example.com' for number in numbers],
+        'password_hash': password_hash,
+        'first_name': 'Synthetic',
+        'last_name': [f'User {number}' for number in numbers],
+        'created_at': now,
+        'updated_at': now
+    })
+    
+    category_ids = {}
+    category_frames = []
+    for category in DEFAULT_CATEGORIES:
+        category_ids[category['name']] = np.array(new_ids(count), dtype=object)
+        category_frames.append(pd.DataFrame({
+            'id': category_ids[category['name']],
+            'name': category['name'],
+            'color': category['color'],
+            'icon': category['icon'],
+            'category_type': category['type'],
+            'is_system': True,
+            'created_at': now,
+            'updated_at': now,
+            'user_id': user_ids,
+            'parent_id': None
+        }))
+    
+    account_ids = {}
+    account_frames = []
+    for account_type, name in [('checking', 'Checking'), ('savings', 'Savings'), ('credit', 'Credit Card')]:
+        account_ids[account_type] = np.array(new_ids(count), dtype=object)
+        account_frames.append(pd.DataFrame({
+            'id': account_ids[account_type],
+            'name': name,
+            'account_type': account_type,
+            'institution': 'Synthetic Bank',
+            'balance': 0.0,
+            'currency': 'USD',
+            'is_active': True,
+            'created_at': now,
+            'updated_at': now,
+            'user_id': user_ids
+        }))
+    
+    # A budget for the current month
+    month_start = now.date().replace(day=1)
+    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    budget_ids = np.array(new_ids(count), dtype=object)
+    budgets = pd.DataFrame({
+        'id': budget_ids,
+        'name': 'Monthly Budget',
+        'start_date': month_start,
+        'end_date': month_end,
+        'total_limit': float(sum(BUDGET_LIMITS.values())),
+        'currency': 'USD',
+        'is_active': True,
+        'created_at': now,
+        'updated_at': now,
+        'user_id': user_ids
+    })
+    budget_items = pd.concat([
+        pd.DataFrame({
+            'id': new_ids(count),
+            'amount': float(limit),
+            'created_at': now,
+            'updated_at': now,
+            'budget_id': budget_ids,
+            'category_id': category_ids[name]
+        })
+        for name, limit in BUDGET_LIMITS.items()
+    ], ignore_index=True)
+    
+    return {
+        'users': users,
+        'categories': pd.concat(category_frames, ignore_index=True),
+        'accounts': pd.concat(account_frames, ignore_index=True),
+        'budgets': budgets,
+        'budget_items': budget_items,
+        'lookup': {
+            'user': user_ids,
+            'checking': account_ids['checking'],
+            'savings': account_ids['savings'],
+            'credit': account_ids['credit'],
+            'categories': category_ids,
+            'budgets': budget_ids
+        }
+    }
+
+def generate_transactions(rng, lookup, targets, start, days, now):
+    """
+    Generate the transactions for a chunk of users.
+    
+    Parameters:
+    - rng: NumPy random Generator
+    - lookup: Per-user ID arrays from generate_users
+    - targets: Number of transactions wanted for each user; users whose
+      recurring schedule alone is longer get only that schedule
+    - start: Start of the period
+    - days: Length of the period in days
+    - now: Timestamp for created_at and updated_at
+    
+    Returns:
+    - DataFrame with TRANSACTION_COLUMNS
+    """
+    count = len(lookup['user'])
+    categories = lookup['categories']
+    users = np.arange(count)
+    
+    # Series on a fixed cadence: pay, transfers to savings, then recurring expenses
+    has_expense = rng.random((count, len(RECURRING_EXPENSES))) < np.array([template[6] for template in RECURRING_EXPENSES])
+    expense_users, expense_templates = np.nonzero(has_expense)
+    
+    series_users = np.concatenate([users, users, expense_users])
+    series_cadences = np.concatenate([
+        np.full(count, 14),
+        np.full(count, 30),
+        np.array([RECURRING_EXPENSES[t][2] for t in expense_templates], dtype=int)
+    ])
+    series_amounts = np.concatenate([
+        rng.uniform(1200, 4000, count).round(2),
+        -rng.uniform(100, 800, count).round(-1),
+        -np.array([
+            RECURRING_EXPENSES[t][3] + RECURRING_EXPENSES[t][4] * (rng.random() - 0.5) for t in expense_templates
+        ]).round(2)
+    ])
+    series_variation = np.concatenate([
+        np.zeros(count), np.zeros(count), np.array([RECURRING_EXPENSES[t][5] for t in expense_templates])
+    ])
+    series_descriptions = np.concatenate([
+        np.full(count, 'Payroll Deposit', dtype=object),
+        np.full(count, 'Transfer to Savings', dtype=object),
+        np.array([RECURRING_EXPENSES[t][0] for t in expense_templates], dtype=object)
+    ])
+    series_categories = np.concatenate([
+        categories['Salary'],
+        np.full(count, None, dtype=object),
+        np.array([categories[RECURRING_EXPENSES[t][1]][u] for u, t in zip(expense_users, expense_templates)], dtype=object)
+    ])
+    series_transfer_accounts = np.concatenate([
+        np.full(count, None, dtype=object), lookup['savings'], np.full(len(expense_users), None, dtype=object)
+    ])
+    series_offsets = (rng.random(len(series_users)) * series_cadences).astype(int)
+    
+    index, day = expand_schedule(series_offsets, series_cadences, days)
+    variation = 1 + series_variation[index] * rng.uniform(-1, 1, len(index))
+    recurring = pd.DataFrame({
+        'amount': (series_amounts[index] * variation).round(2),
+        'description': series_descriptions[index],
+        'transaction_date': start + pd.to_timedelta(day, unit='D') + pd.Timedelta(hours=9),
+        'account_id': lookup['checking'][series_users[index]],
+        'category_id': series_categories[index],
+        'transfer_account_id': series_transfer_accounts[index]
+    })
+    
+    # One-off purchases fill each user's remaining share
+    remaining = np.maximum(targets - np.bincount(series_users[index], minlength=count), 0)
+    purchase_users = np.repeat(users, remaining)
+    merchants = rng.choice(
+        len(PURCHASE_MERCHANTS), len(purchase_users),
+        p=np.array([merchant[4] for merchant in PURCHASE_MERCHANTS]) / sum(merchant[4] for merchant in PURCHASE_MERCHANTS)
+    )
+    mu = np.array([merchant[2] for merchant in PURCHASE_MERCHANTS])[merchants]
+    sigma = np.array([merchant[3] for merchant in PURCHASE_MERCHANTS])[merchants]
+    stores = rng.integers(1, 5000, len(purchase_users))
+    names = [merchant[0] for merchant in PURCHASE_MERCHANTS]
+    
+    # Category ID per (merchant, user), then pick each purchase's entry
+    merchant_categories = np.stack([categories[merchant[1]] for merchant in PURCHASE_MERCHANTS])
+    purchase_categories = merchant_categories[merchants, purchase_users]
+    purchase_categories[rng.random(len(purchase_users)) < UNCATEGORIZED_SHARE] = None
+    
+    purchases = pd.DataFrame({
+        'amount': -np.maximum(rng.lognormal(mu, sigma), 0.5).round(2),
+        'description': [f'{names[merchant]} #{store}' for merchant, store in zip(merchants, stores)],
+        'transaction_date': start + pd.to_timedelta(rng.random(len(purchase_users)) * days, unit='D').round('s'),
+        'account_id': np.where(
+            rng.random(len(purchase_users)) < CREDIT_CARD_SHARE,
+            lookup['credit'][purchase_users],
+            lookup['checking'][purchase_users]
+        ),
+        'category_id': purchase_categories,
+        'transfer_account_id': None
+    })
+    
+    transactions = pd.concat([recurring, purchases], ignore_index=True)
+    transactions['id'] = new_ids(len(transactions))
+    transactions['is_recurring'] = False
+    transactions['recurrence_pattern'] = None
+    transactions['notes'] = None
+    transactions['fingerprint'] = None
+    transactions['recurring_series_id'] = None
+    transactions['created_at'] = now
+    transactions['updated_at'] = now
+    
+    return transactions[TRANSACTION_COLUMNS]
+
+def account_balances(accounts, transactions):
+    """Set each account's balance from its transactions and incoming transfers."""
+    balances = transactions.groupby('account_id')['amount'].sum()
+    transfers = transactions.dropna(subset=['transfer_account_id']).groupby('transfer_account_id')['amount'].sum()
+    balances = balances.add(-transfers, fill_value=0).round(2)
+    
+    return accounts.assign(balance=accounts['id'].map(balances).fillna(0.0))
+
+def generate_dataset(users, transactions, months=12, seed=0, prefix='synthetic', chunk_users=200,
+                     batch_size=10000, rebuild_derived=True, progress=None):
+    """
+    Generate and load a synthetic dataset into the current app's database.
+    
+    Parameters:
+    - users: Number of users to create
+    - transactions: Total number of transactions, shared unevenly between users
+    - months: Length of the transaction history
+    - seed: Seed for the random generator, so runs produce the same shape of data
+    - prefix: Username prefix; numbering continues after existing users with it
+    - chunk_users: Users generated and loaded together
+    - batch_size: Rows per insert statement when COPY is not available
+    - rebuild_derived: Whether to rebuild monthly totals and recurring series
+    - progress: Optional callable receiving a progress message
+    
+    Returns:
+    - Dict with the new user IDs, their budget IDs and the number of transactions
+    """
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    days = months * 30
+    start = pd.Timestamp(now.date()) - pd.Timedelta(days=days)
+    password_hash = password_hasher.hash(PASSWORD)
+    first_index = User.query.filter(User.username.like(f'{prefix}%')).count()
+    
+    # Uneven per-user volumes with the requested total
+    weights = rng.lognormal(0, 0.5, users)
+    targets = rng.multinomial(transactions, weights / weights.sum())
+    
+    user_ids = []
+    budget_ids = []
+    transaction_count = 0
+    started_at = time.perf_counter()
+    
+    for chunk_start in range(0, users, chunk_users):
+        chunk_targets = targets[chunk_start:chunk_start + chunk_users]
+        chunk = generate_users(rng, prefix, first_index + chunk_start, len(chunk_targets), password_hash, now)
+        chunk_transactions = generate_transactions(rng, chunk['lookup'], chunk_targets, start, days, now)
+        accounts = account_balances(chunk['accounts'], chunk_transactions)
+        
+        bulk_load(User.__table__, chunk['users'], batch_size)
+        bulk_load(Category.__table__, chunk['categories'], batch_size)
+        bulk_load(Account.__table__, accounts, batch_size)
+        bulk_load(Budget.__table__, chunk['budgets'], batch_size)
+        bulk_load(BudgetItem.__table__, chunk['budget_items'], batch_size)
+        bulk_load(Transaction.__table__, chunk_transactions, batch_size)
+        db.session.commit()
+        
+        user_ids.extend(chunk['lookup']['user'])
+        budget_ids.extend(chunk['lookup']['budgets'])
+        transaction_count += len(chunk_transactions)
+        
+        if progress:
+            elapsed = time.perf_counter() - started_at
+            progress(f"Loaded {len(user_ids)} users and {transaction_count} transactions "
+                     f"({transaction_count / elapsed:,.0f} rows/s)")
+    
+    if rebuild_derived:
+        for number, user_id in enumerate(user_ids, 1):
+            rebuild_monthly_totals(user_id)
+            rebuild_recurring_series(user_id)
+            if progress and number % chunk_users == 0:
+                progress(f"Rebuilt derived tables for {number} users")
+    
+    return {'users': user_ids, 'budgets': budget_ids, 'transactions': transaction_count}
+
+def main():
+    """Parse arguments and generate the dataset."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset")
+    parser.add_argument("--users", type=int, default=100, help="Number of users to create")
+    parser.add_argument("--transactions", type=int, default=100000, help="Total number of transactions")
+    parser.add_argument("--months", type=int, default=12, help="Months of history")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--prefix", default="synthetic", help="Username prefix")
+    parser.add_argument("--chunk-users", type=int, default=200, help="Users generated and loaded together")
+    parser.add_argument("--skip-derived", action="store_true",
+                        help="Skip rebuilding monthly totals and recurring series")
+    args = parser.parse_args()
+    
+    from backend.app import create_app
+    
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        
+        started_at = time.perf_counter()
+        result = generate_dataset(
+            args.users, args.transactions, months=args.months, seed=args.seed, prefix=args.prefix,
+            chunk_users=args.chunk_users, rebuild_derived=not args.skip_derived, progress=print
+        )
+        elapsed = time.perf_counter() - started_at
+        
+        print(f"Generated {len(result['users'])} users and {result['transactions']} transactions in {elapsed:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Migration adding the recurring_series table.
+
+This script will:
+1. Create the recurring_series table if it does not exist yet
+2. Add the recurring_series_id column to the transactions table and index it
+3. Group existing expenses into series and compute their statistics, for
+   every user or for a single user
+
+It is safe to run more than once; later runs rebuild the series from the
+transactions table.
+"""
+
+import os
+import sys
+import argparse
+
+# Add the project root to the path so we can import the application
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateIndex
+from backend.models import db, Transaction, RecurringSeries
+from backend.services.analyzers.recurring_series import rebuild_recurring_series
+from backend.app import create_app
+
+app = create_app()
+
+def add_series_column():
+    """Add the nullable recurring_series_id column and its index if missing."""
+    columns = [column['name'] for column in inspect(db.engine).get_columns(Transaction.__tablename__)]
+    if 'recurring_series_id' not in columns:
+        print("Adding transactions.recurring_series_id...")
+        with db.engine.begin() as connection:
+            connection.execute(text(
+                f"ALTER TABLE {Transaction.__tablename__} ADD COLUMN recurring_series_id VARCHAR(36) "
+                f"REFERENCES {RecurringSeries.__tablename__} (id)"
+            ))
+    
+    index = next(i for i in Transaction.__table__.indexes if i.name == 'ix_transactions_recurring_series')
+    statement = str(CreateIndex(index, if_not_exists=True).compile(dialect=db.engine.dialect))
+    if db.engine.dialect.name == 'postgresql':
+        statement = statement.replace('CREATE INDEX', 'CREATE INDEX CONCURRENTLY', 1)
+    
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        print(f"Creating index {index.name}...")
+        connection.execute(text(statement))
+
+def main():
+    """Parse arguments and run the migration."""
+    parser = argparse.ArgumentParser(description="Add and populate the recurring series table")
+    parser.add_argument("--user-id", help="Only rebuild series for this user")
+    args = parser.parse_args()
+    
+    with app.app_context():
+        RecurringSeries.__table__.create(db.engine, checkfirst=True)
+        add_series_column()
+        
+        print("Rebuilding recurring series...")
+        count = rebuild_recurring_series(args.user_id)
+        print(f"Wrote {count} series.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+Migration adding the revoked_tokens table.
+
+This script will:
+1. Create the revoked_tokens table, which holds the hashes of logged-out
+   auth tokens until they expire, if it does not exist yet
+
+Run it before deploying the shared token revocation. It is safe to run
+more than once.
+"""
+
+import os
+import sys
+
+# Add the project root to the path so we can import the application
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.models import db, RevokedToken
+from backend.app import create_app
+
+app = create_app()
+
+def main():
+    """Run the migration."""
+    with app.app_context():
+        print("Creating revoked_tokens...")
+        RevokedToken.__table__.create(db.engine, checkfirst=True)
+
+if __name__ == "__main__":
+    main()
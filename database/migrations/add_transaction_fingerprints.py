@@ -0,0 +1,116 @@
+"""
+Migration adding duplicate detection for statement imports.
+
+This script will:
+1. Add the fingerprint column to the transactions table if it is missing
+2. Backfill fingerprints for existing transactions, numbering identical
+   rows within an account the same way the importer does
+3. Create the statement_uploads table of imported file hashes
+4. Build the unique fingerprint index, concurrently on PostgreSQL
+
+Run add_transaction_fingerprints.py before deploying the importer changes.
+It is safe to run more than once.
+"""
+
+import os
+import re
+import sys
+from collections import Counter
+
+# Add the project root to the path so we can import the application
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateIndex
+from backend.models import db, Transaction, StatementUpload
+from backend.services.importers.transaction_importer import normalize_description, transaction_fingerprint
+from backend.app import create_app
+
+app = create_app()
+
+BACKFILL_BATCH_SIZE = 5000
+
+def add_fingerprint_column():
+    """Add the nullable fingerprint column if the table does not have it yet."""
+    columns = [column['name'] for column in inspect(db.engine).get_columns(Transaction.__tablename__)]
+    if 'fingerprint' not in columns:
+        print("Adding transactions.fingerprint...")
+        with db.engine.begin() as connection:
+            connection.execute(text(
+                f"ALTER TABLE {Transaction.__tablename__} ADD COLUMN fingerprint VARCHAR(64)"
+            ))
+
+def backfill_fingerprints():
+    """Fingerprint existing transactions that have none, oldest first within each account."""
+    occurrences = Counter()
+    existing = set()
+    updates = []
+    
+    rows = db.session.query(
+        Transaction.id,
+        Transaction.account_id,
+        Transaction.transaction_date,
+        Transaction.amount,
+        Transaction.description,
+        Transaction.fingerprint
+    ).order_by(Transaction.account_id, Transaction.created_at, Transaction.id)
+    
+    pending = []
+    for transaction_id, account_id, transaction_date, amount, description, fingerprint in rows.yield_per(BACKFILL_BATCH_SIZE):
+        if fingerprint:
+            existing.add(fingerprint)
+        else:
+            pending.append((transaction_id, account_id, transaction_date, amount, description))
+    
+    for transaction_id, account_id, transaction_date, amount, description in pending:
+        duplicate_key = (
+            account_id,
+            transaction_date.strftime('%Y-%m-%d'),
+            f'{amount:.2f}',
+            normalize_description(description)
+        )
+        
+        # Take the next ordinal not already used by a fingerprinted row
+        while True:
+            occurrence = occurrences[duplicate_key]
+            occurrences[duplicate_key] += 1
+            fingerprint = transaction_fingerprint(account_id, transaction_date, amount, description, occurrence)
+            if fingerprint not in existing:
+                break
+        
+        existing.add(fingerprint)
+        updates.append({'id': transaction_id, 'fingerprint': fingerprint})
+    
+    # Plain UPDATE so updated_at is left alone
+    statement = text(f"UPDATE {Transaction.__tablename__} SET fingerprint = :fingerprint WHERE id = :id")
+    for start in range(0, len(updates), BACKFILL_BATCH_SIZE):
+        db.session.execute(statement, updates[start:start + BACKFILL_BATCH_SIZE])
+        db.session.commit()
+    
+    print(f"Backfilled {len(updates)} fingerprints.")
+
+def add_fingerprint_index():
+    """Build the unique fingerprint index if it does not exist."""
+    index = next(i for i in Transaction.__table__.indexes if i.name == 'ix_transactions_fingerprint')
+    statement = str(CreateIndex(index, if_not_exists=True).compile(dialect=db.engine.dialect))
+    
+    if db.engine.dialect.name == 'postgresql':
+        statement = re.sub(r'^CREATE (UNIQUE )?INDEX', r'CREATE \1INDEX CONCURRENTLY', statement.strip())
+    
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        print(f"Creating index {index.name}...")
+        connection.execute(text(statement))
+
+def add_transaction_fingerprints():
+    """Run the migration."""
+    with app.app_context():
+        add_fingerprint_column()
+        backfill_fingerprints()
+        StatementUpload.__table__.create(db.engine, checkfirst=True)
+        add_fingerprint_index()
+        
+        print("Transaction fingerprints are up to date.")
+
+if __name__ == "__main__":
+    add_transaction_fingerprints()
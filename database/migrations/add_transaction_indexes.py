@@ -0,0 +1,72 @@
+"""
+Migration adding the transaction table indexes.
+
+This script will:
+1. Read the definitions of the account, category, transfer and expense
+   indexes from the Transaction model
+2. Build any that are missing, using CREATE INDEX CONCURRENTLY on PostgreSQL
+   so a live table keeps accepting writes while the indexes are built
+
+The fingerprint and recurring series indexes are built by
+add_transaction_fingerprints.py and add_recurring_series.py, after they add
+their columns, so the migrations can run in any order. It is safe to run
+more than once.
+"""
+
+import os
+import re
+import sys
+
+# Add the project root to the path so we can import the application
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
+from backend.models import db, Transaction
+from backend.app import create_app
+
+app = create_app()
+
+# Only the indexes this migration introduced; the others need columns added by later migrations
+INDEX_NAMES = (
+    'ix_transactions_account_date',
+    'ix_transactions_category_date',
+    'ix_transactions_expenses_account_date',
+    'ix_transactions_transfer_account'
+)
+
+def drop_invalid_index(connection, index_name):
+    """Drop an index left INVALID by an interrupted concurrent build."""
+    is_valid = connection.execute(text(
+        "SELECT i.indisvalid FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name"
+    ), {'name': index_name}).scalar()
+    
+    if is_valid is False:
+        print(f"Dropping invalid index {index_name}...")
+        connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"'))
+
+def add_transaction_indexes():
+    """Create the transaction list and analysis indexes."""
+    with app.app_context():
+        engine = db.engine
+        is_postgres = engine.dialect.name == 'postgresql'
+        
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            indexes = [index for index in Transaction.__table__.indexes if index.name in INDEX_NAMES]
+            for index in sorted(indexes, key=lambda i: i.name):
+                statement = str(CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect))
+                
+                if is_postgres:
+                    drop_invalid_index(connection, index.name)
+                    statement = re.sub(r'^CREATE (UNIQUE )?INDEX', r'CREATE \1INDEX CONCURRENTLY', statement.strip())
+                
+                print(f"Creating index {index.name}...")
+                connection.execute(text(statement))
+        
+        print("Transaction indexes are up to date.")
+
+if __name__ == "__main__":
+    add_transaction_indexes()
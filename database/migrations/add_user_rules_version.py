@@ -0,0 +1,43 @@
+"""
+Migration adding the per-user category rules version.
+
+This script will:
+1. Add the rules_version column to the users table if it is missing, with
+   every existing user starting at version 0
+
+Run it before deploying the cached rule matchers keyed on it. It is safe
+to run more than once.
+"""
+
+import os
+import sys
+
+# Add the project root to the path so we can import the application
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import inspect, text
+from backend.models import db, User
+from backend.app import create_app
+
+app = create_app()
+
+def add_rules_version_column():
+    """Add the rules_version column if the table does not have it yet."""
+    columns = [column['name'] for column in inspect(db.engine).get_columns(User.__tablename__)]
+    if 'rules_version' in columns:
+        print("users.rules_version already exists.")
+        return
+    
+    print("Adding users.rules_version...")
+    with db.engine.begin() as connection:
+        connection.execute(text(
+            f"ALTER TABLE {User.__tablename__} ADD COLUMN rules_version INTEGER NOT NULL DEFAULT 0"
+        ))
+
+def main():
+    """Run the migration."""
+    with app.app_context():
+        add_rules_version_column()
+
+if __name__ == "__main__":
+    main()
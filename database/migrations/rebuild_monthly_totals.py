@@ -0,0 +1,40 @@
+"""
+Rebuild the monthly_category_totals rollup table.
+
+This script will:
+1. Create the rollup table if it does not exist yet
+2. Recompute its rows from the transactions table, for every user or for
+   a single user
+
+Run it after deploying the rollup or after any bulk change to transactions
+made outside the API.
+"""
+
+import os
+import sys
+import argparse
+
+# Add the project root to the path so we can import the application
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.models import db, MonthlyCategoryTotal
+from backend.services.analyzers.monthly_totals import rebuild_monthly_totals
+from backend.app import create_app
+
+app = create_app()
+
+def main():
+    """Parse arguments and rebuild the rollup."""
+    parser = argparse.ArgumentParser(description="Rebuild the monthly category totals rollup")
+    parser.add_argument("--user-id", help="Only rebuild totals for this user")
+    args = parser.parse_args()
+    
+    with app.app_context():
+        MonthlyCategoryTotal.__table__.create(bind=db.engine, checkfirst=True)
+        
+        print("Rebuilding monthly category totals...")
+        row_count = rebuild_monthly_totals(args.user_id)
+        print(f"Monthly category totals rebuilt. Wrote {row_count} rows.")
+
+if __name__ == "__main__":
+    main()
@@ -48,33 +48,36 @@ async function initDashboard() {
     showLoading(true);
     
     try {
-        // Get dashboard data - try to fetch components individually to allow partial success
-        let accounts = [];
-        let recentTransactions = [];
+        // Everything on the dashboard comes from one summary request
+        let summary = null;
         let criticalError = false;
         
         try {
-            accounts = await fetchAccounts();
-            console.log('Accounts data loaded:', accounts);
-            renderAccountsOverview(accounts);
-        } catch (accountError) {
-            console.error('Error loading accounts:', accountError);
+            summary = await fetchDashboardSummary();
+            console.log('Dashboard summary loaded:', summary);
+        } catch (summaryError) {
+            console.error('Error loading dashboard summary:', summaryError);
             // Only mark as critical if we're in production
             if (!isDevelopment()) {
                 criticalError = true;
             }
         }
         
+        // Render each section separately so one failure doesn't hide the others
+        try {
+            renderAccountsOverview(summary ? summary.accounts : []);
+        } catch (accountError) {
+            console.error('Error rendering accounts:', accountError);
+        }
+        
         try {
-            recentTransactions = await fetchRecentTransactions();
-            console.log('Transactions data loaded:', recentTransactions);
-            renderRecentTransactions(recentTransactions);
+            renderRecentTransactions(summary ? summary.recent_transactions : []);
         } catch (transactionError) {
-            console.error('Error loading transactions:', transactionError);
+            console.error('Error rendering transactions:', transactionError);
         }
         
         try {
-            renderSpendingChart(recentTransactions);
+            renderSpendingChart(summary ? summary.spending_by_category.categories : []);
         } catch (chartError) {
             console.error('Error rendering spending chart:', chartError);
         }
@@ -112,9 +115,9 @@ async function initDashboard() {
     }
 }
 
-// Fetch accounts data
-async function fetchAccounts() {
-    console.log('Fetching accounts');
+// Fetch accounts, recent transactions, spending, trends and recommendations in one request
+async function fetchDashboardSummary(months = 6) {
+    console.log('Fetching dashboard summary');
     
     try {
         const token = getAuthToken();
@@ -123,22 +126,17 @@ async function fetchAccounts() {
         if (!token) {
             console.warn('No auth token found, redirecting to login');
             window.location.href = '/login';
-            return [];
+            return null;
         }
         
         // In development mode with isDevelopment() true, use mock data
         if (isDevelopment()) {
-            console.log('Using mock account data in development mode');
-            // Get cached mock accounts from localStorage if available
-            const cachedAccounts = localStorage.getItem('mockAccounts');
-            if (cachedAccounts) {
-                return JSON.parse(cachedAccounts);
-            }
-            return getMockAccounts();
+            console.log('Using mock dashboard data in development mode');
+            return getMockSummary();
         }
         
         // Make API request with auth token
-        const response = await fetch('/api/accounts', {
+        const response = await fetch(`/api/dashboard/summary?months=${months}`, {
             method: 'GET',
             headers: {
                 'Authorization': `Bearer ${token}`,
@@ -151,103 +149,7 @@ async function fetchAccounts() {
             if (response.status === 401) {
                 console.warn('Unauthorized, redirecting to login');
                 window.location.href = '/login';
-                return [];
-            }
-            
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        const data = await response.json();
-        console.log('Account data received:', data);
-        
-        // Normalize the data format
-        let accounts = data.accounts || [];
-        
-        // Map backend field names to frontend expected format if needed
-        accounts = accounts.map(account => ({
-            id: account.id,
-            name: account.name,
-            type: account.type || account.account_type, // Handle both formats
-            balance: account.balance,
-            institution: account.institution || "Unknown"
-        }));
-        
-        return accounts;
-    } catch (error) {
-        console.error('Error fetching accounts:', error);
-        
-        // If we're in development mode, return mock data
-        if (isDevelopment()) {
-            console.log('Using mock account data due to error');
-            return getMockAccounts();
-        }
-        
-        // Show error to user
-        showError(`Failed to load accounts: ${error.message}`);
-        return [];
-    }
-}
-
-// Fetch recent transactions
-async function fetchRecentTransactions() {
-    console.log('Fetching recent transactions');
-    
-    try {
-        // Always use mock data in development mode to prevent loading issues
-        if (isDevelopment()) {
-            console.log('Using mock transaction data in development mode');
-            return getMockTransactions();
-        }
-        
-        const response = await fetch('/api/transactions/recent', {
-            method: 'GET',
-            headers: {
-                'Authorization': `Bearer ${getAuthToken()}`,
-                'Content-Type': 'application/json'
-            }
-        });
-        
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        const data = await response.json();
-        return data.transactions;
-    } catch (error) {
-        console.error('Error fetching recent transactions:', error);
-        
-        // If we're in development mode, return mock data
-        if (isDevelopment()) {
-            console.log('Using mock transaction data due to error');
-            return getMockTransactions();
-        }
-        
-        throw error;
-    }
-}
-
-// API request functions
-
-async function fetchSpendingByCategory(period = 'month') {
-    console.log('Fetching spending by category...');
-    try {
-        const response = await fetch(`/api/analysis/spending?period=${period}`, {
-            headers: getAuthHeaders()
-        });
-        
-        console.log('Spending API response:', response.status);
-        
-        if (!response.ok) {
-            // If API returns 404, return empty data instead of error
-            if (response.status === 404) {
-                console.log('No spending data available');
-                return { categories: [], amounts: [] };
-            }
-            
-            // In development, use mock data when API fails
-            if (isDevelopment()) {
-                console.warn('Using mock spending data due to API error');
-                return getMockSpendingData();
+                return null;
             }
             
             let errorText;
@@ -257,110 +159,22 @@ async function fetchSpendingByCategory(period = 'month') {
             } catch (e) {
                 errorText = `HTTP error ${response.status}`;
             }
-            throw new Error(`Failed to fetch spending: ${errorText}`);
+            throw new Error(`Failed to fetch dashboard summary: ${errorText}`);
         }
         
         const data = await response.json();
-        console.log('Spending data received:', data);
+        console.log('Dashboard summary received:', data);
         return data;
     } catch (error) {
-        console.error('Error in fetchSpendingByCategory:', error);
-        // In development, use mock data when exception occurs
-        if (isDevelopment()) {
-            console.warn('Using mock spending data due to exception');
-            return getMockSpendingData();
-        }
-        throw error;
-    }
-}
-
-async function fetchMonthlyTrends(months = 6) {
-    console.log('Fetching monthly trends...');
-    try {
-        const response = await fetch(`/api/analysis/monthly-trends?months=${months}`, {
-            headers: getAuthHeaders()
-        });
+        console.error('Error fetching dashboard summary:', error);
         
-        console.log('Trends API response:', response.status);
-        
-        if (!response.ok) {
-            // If API returns 404, return empty data instead of error
-            if (response.status === 404) {
-                console.log('No trends data available');
-                return { months: [], income: [], expenses: [] };
-            }
-            
-            // In development, use mock data when API fails
-            if (isDevelopment()) {
-                console.warn('Using mock trends data due to API error');
-                return getMockTrendsData();
-            }
-            
-            let errorText;
-            try {
-                const errorData = await response.json();
-                errorText = errorData.error || `HTTP error ${response.status}`;
-            } catch (e) {
-                errorText = `HTTP error ${response.status}`;
-            }
-            throw new Error(`Failed to fetch trends: ${errorText}`);
-        }
-        
-        const data = await response.json();
-        console.log('Trends data received:', data);
-        return data;
-    } catch (error) {
-        console.error('Error in fetchMonthlyTrends:', error);
-        // In development, use mock data when exception occurs
+        // If we're in development mode, return mock data
         if (isDevelopment()) {
-            console.warn('Using mock trends data due to exception');
-            return getMockTrendsData();
+            console.log('Using mock dashboard data due to error');
+            return getMockSummary();
         }
-        throw error;
-    }
-}
-
-async function fetchRecommendations() {
-    console.log('Fetching recommendations...');
-    try {
-        const response = await fetch('/api/analysis/recommendations', {
-            headers: getAuthHeaders()
-        });
-        
-        console.log('Recommendations API response:', response.status);
         
-        if (!response.ok) {
-            // If API returns 404, return empty data instead of error
-            if (response.status === 404) {
-                console.log('No recommendations available');
-                return [];
-            }
-            
-            // In development, use mock data when API fails
-            if (isDevelopment()) {
-                console.warn('Using mock recommendations data due to API error');
-                return getMockRecommendations();
-            }
-            
-            let errorText;
-            try {
-                const errorData = await response.json();
-                errorText = errorData.error || `HTTP error ${response.status}`;
-            } catch (e) {
-                errorText = `HTTP error ${response.status}`;
-            }
-            throw new Error(`Failed to fetch recommendations: ${errorText}`);
-        }
-        
-        const data = await response.json();
-        console.log('Recommendations data received:', data);
-        return data;
-    } catch (error) {
-        console.error('Error in fetchRecommendations:', error);
-        // In development or production, use mock data for recommendations
-        // since they're not critical for the app to function
-        console.warn('Using mock recommendations data due to exception');
-        return getMockRecommendations();
+        throw error;
     }
 }
 
@@ -520,7 +334,7 @@ function renderRecentTransactions(transactions) {
     transactionsContainer.innerHTML = transactionsListHTML;
 }
 
-function renderSpendingChart(transactions) {
+function renderSpendingChart(categories) {
     const chartContainer = document.getElementById('spending-chart');
     
     if (!chartContainer) {
@@ -528,32 +342,8 @@ function renderSpendingChart(transactions) {
         return;
     }
     
-    // If no transactions, show empty state
-    if (!transactions || transactions.length === 0) {
-        chartContainer.innerHTML = `
-            <div class="no-data-message">
-                <i class="fas fa-chart-pie"></i>
-                <p>No spending data available yet.</p>
-            </div>
-        `;
-        return;
-    }
-    
-    // Process transactions data to get spending by category
-    const categories = {};
-    transactions.forEach(transaction => {
-        // Only include expenses (negative amounts)
-        if (parseFloat(transaction.amount) < 0) {
-            const category = transaction.category || 'Uncategorized';
-            if (!categories[category]) {
-                categories[category] = 0;
-            }
-            categories[category] += Math.abs(parseFloat(transaction.amount));
-        }
-    });
-    
     // If no spending categories, show empty state
-    if (Object.keys(categories).length === 0) {
+    if (!categories || categories.length === 0) {
         chartContainer.innerHTML = `
             <div class="no-data-message">
                 <i class="fas fa-chart-pie"></i>
@@ -565,9 +355,9 @@ function renderSpendingChart(transactions) {
     
     // Prepare data for Chart.js
     const chartData = {
-        labels: Object.keys(categories),
+        labels: categories.map(category => category.category),
         datasets: [{
-            data: Object.values(categories),
+            data: categories.map(category => category.total_amount),
             backgroundColor: [
                 '#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF', 
                 '#FF9F40', '#7D7D7D', '#C9CBCF', '#7CB9E8'
@@ -747,61 +537,74 @@ function getMockTransactions() {
 function getMockSpendingData() {
     console.log('Using mock spending data');
     return {
-        categories: ['Groceries', 'Dining', 'Transportation', 'Utilities', 'Entertainment'],
-        amounts: [350.42, 215.80, 180.25, 145.99, 95.50]
+        month: new Date().toISOString().slice(0, 7),
+        categories: [
+            { category: 'Groceries', total_amount: 350.42, percentage: 35.74 },
+            { category: 'Dining', total_amount: 215.80, percentage: 22.01 },
+            { category: 'Transportation', total_amount: 180.25, percentage: 18.38 },
+            { category: 'Utilities', total_amount: 145.99, percentage: 14.89 },
+            { category: 'Entertainment', total_amount: 95.50, percentage: 9.74 }
+        ]
     };
 }
 
 function getMockTrendsData() {
     console.log('Using mock trends data');
-    const months = [];
-    const income = [];
-    const expenses = [];
+    const trends = [];
     
     // Generate last 6 months
     const today = new Date();
     for (let i = 5; i >= 0; i--) {
         const month = new Date(today.getFullYear(), today.getMonth() - i, 1);
-        months.push(month.toLocaleString('default', { month: 'short' }));
         
         // Generate random income and expenses that make sense
-        const monthIncome = 3000 + Math.floor(Math.random() * 500);
-        income.push(monthIncome);
-        
-        const monthExpenses = 2000 + Math.floor(Math.random() * 800);
-        expenses.push(monthExpenses);
+        trends.push({
+            month: `${month.getFullYear()}-${String(month.getMonth() + 1).padStart(2, '0')}`,
+            income: 3000 + Math.floor(Math.random() * 500),
+            expenses: 2000 + Math.floor(Math.random() * 800)
+        });
     }
     
-    return { months, income, expenses };
+    return trends;
 }
 
 function getMockRecommendations() {
     console.log('Using mock recommendations data');
     return [
         {
-            id: 'mock-rec1',
-            title: 'Reduce dining expenses',
-            description: 'Your dining expenses are 15% higher than last month. Consider cooking at home more often.',
-            impact: 'medium',
-            category: 'spending'
+            type: 'high_spending',
+            category: 'Groceries',
+            message: 'Your spending on Groceries is 35.74% of your total expenses.',
+            action: 'Consider setting a budget for Groceries to reduce overall expenses.'
         },
         {
-            id: 'mock-rec2',
-            title: 'Save for emergency fund',
-            description: 'You don\'t have an emergency fund. Consider setting aside 3-6 months of expenses.',
-            impact: 'high',
-            category: 'savings'
-        },
-        {
-            id: 'mock-rec3',
-            title: 'Add your recurring bills',
-            description: 'Track your recurring bills to better forecast your monthly expenses.',
-            impact: 'low',
-            category: 'tracking'
+            type: 'increasing_trend',
+            category: 'Dining',
+            message: 'Your spending on Dining has increased by 25.0% over the past 3 months.',
+            action: 'Review your Dining expenses to identify areas for potential savings.'
         }
     ];
 }
 
+// Mock /api/dashboard/summary response built from the mocks above
+function getMockSummary() {
+    // Get cached mock accounts from localStorage if available
+    const cachedAccounts = localStorage.getItem('mockAccounts');
+    const accounts = cachedAccounts ? JSON.parse(cachedAccounts) : getMockAccounts();
+    
+    const assets = accounts.reduce((sum, account) => sum + Math.max(account.balance, 0), 0);
+    const debt = accounts.reduce((sum, account) => sum + Math.max(-account.balance, 0), 0);
+    
+    return {
+        accounts: accounts,
+        totals: { assets: assets, debt: debt, net_worth: assets - debt },
+        recent_transactions: getMockTransactions(),
+        spending_by_category: getMockSpendingData(),
+        monthly_trends: getMockTrendsData(),
+        recommendations: getMockRecommendations()
+    };
+}
+
 // Helper function to determine if running in development mode
 function isDevelopment() {
     // Check if window.location.hostname is localhost or 127.0.0.1
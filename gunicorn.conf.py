@@ -0,0 +1,68 @@
+# Gunicorn settings: gunicorn -c gunicorn.conf.py backend.wsgi:app
+import os
+import shutil
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', 8000)}"
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+
+# Threaded workers, so a request waiting on a password hash or the database
+# does not hold up the worker; password hashing is bounded separately by
+# PASSWORD_HASH_WORKERS and PASSWORD_HASH_QUEUE_SIZE, whose sum must stay
+# below threads (by default the queue is sized from GUNICORN_THREADS so
+# hashing uses at most half of them). Keep threads within
+# DB_POOL_SIZE + DB_MAX_OVERFLOW so every thread can get a connection.
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+reload = os.getenv('ENVIRONMENT') != 'production'
+
+# Directory created by on_starting for the workers' metrics when METRICS_DIR is not set
+_private_metrics_dir = None
+
+# Import the application's modules once in the master so forked workers start
+# with them loaded. Each worker still builds its own app, so per-worker threads
+# and connection pools are created after the fork. Skipped when reloading,
+# where the master would otherwise keep serving stale modules.
+if not reload:
+    import backend.app  # noqa: F401
+
+def on_starting(server):
+    """Give the workers a metrics directory and fail the import jobs a previous run left unfinished."""
+    global _private_metrics_dir
+    
+    # Workers write their metrics here so /api/internal/metrics can merge
+    # them. Without METRICS_DIR, use a fresh owner-only directory rather
+    # than a predictable path other local users could plant files in; the
+    # forked workers inherit it through the environment.
+    if not os.getenv('METRICS_DIR'):
+        _private_metrics_dir = tempfile.mkdtemp(prefix='budget-tracker-metrics-')
+        os.environ['METRICS_DIR'] = _private_metrics_dir
+    
+    from backend.app import create_app
+    from backend.models import db
+    from backend.services.jobs.import_jobs import fail_interrupted_jobs
+    from backend.services.monitoring.metrics import metrics
+    from backend.services.monitoring.request_log import request_logger
+    
+    # create_app refuses a METRICS_DIR owned by another user, so only our
+    # own files from a previous run are dropped
+    app = create_app()
+    metrics.clear_directory()
+    
+    with app.app_context():
+        try:
+            count = fail_interrupted_jobs()
+            if count:
+                server.log.warning("Marked %d interrupted import jobs as failed", count)
+        except Exception:
+            # Before init-db has created the tables, there is nothing to clean up
+            server.log.warning("Could not check for interrupted import jobs", exc_info=True)
+        finally:
+            # Workers must not inherit the master's connections or log thread
+            db.engine.dispose()
+            request_logger.stop()
+
+def on_exit(server):
+    """Remove the metrics directory created by on_starting."""
+    if _private_metrics_dir:
+        shutil.rmtree(_private_metrics_dir, ignore_errors=True)
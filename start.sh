@@ -7,9 +7,5 @@ sleep 5
 # Initialize the database
 python init_db.py
 
-# Start the application
-if [ "$ENVIRONMENT" = "production" ]; then
-    gunicorn --bind 0.0.0.0:8000 backend.app:app
-else
-    gunicorn --bind 0.0.0.0:8000 --reload backend.app:app
-fi
\ No newline at end of file
+# Start the application (gunicorn.conf.py reloads on change unless ENVIRONMENT=production)
+gunicorn -c gunicorn.conf.py backend.wsgi:app
\ No newline at end of file
@@ -0,0 +1,61 @@
+import pytest
+from backend.app import create_app
+from backend.models import db, Account, User
+from backend.api.controllers.auth_controller import generate_auth_token
+
+@pytest.fixture
+def app(tmp_path):
+    """App backed by a fresh SQLite database file."""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'ANALYSIS_CACHE_BACKEND': 'memory',
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        'COMPRESSION_ENABLED': False,
+        'LOG_FILE': None,
+        'LOG_LEVEL': 'WARNING'
+    })
+    
+    with app.app_context():
+        db.create_all()
+    
+    yield app
+    
+    with app.app_context():
+        db.drop_all()
+
+@pytest.fixture
+def app_context(app):
+    """Active app context for tests that call services directly."""
+    with app.app_context():
+        yield
+        db.session.remove()
+
+@pytest.fixture
+def user_id(app):
+    """ID of a registered user."""
+    with app.app_context():
+        user = User('tester', 'tester@example.com', 'password')
+        db.session.add(user)
+        db.session.commit()
+        return user.id
+
+@pytest.fixture
+def client(app):
+    """Test client; each request gets its own app context, as in a worker."""
+    return app.test_client()
+
+@pytest.fixture
+def auth_headers(app, user_id):
+    """Authorization header for the test user."""
+    with app.app_context():
+        return {'Authorization': f'Bearer {generate_auth_token(user_id)}'}
+
+@pytest.fixture
+def account_id(app, user_id):
+    """ID of a checking account owned by the test user."""
+    with app.app_context():
+        account = Account('Checking', 'checking', user_id)
+        db.session.add(account)
+        db.session.commit()
+        return account.id
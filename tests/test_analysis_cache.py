@@ -0,0 +1,76 @@
+import os
+import pickle
+import stat
+import pytest
+from flask import Flask
+from sqlalchemy import text
+from backend.models import db, User
+from backend.services.cache.analysis_cache import AnalysisCache, SqliteCacheBackend, analysis_cache
+
+def counting_compute():
+    """Return a compute callable whose results count how often it ran."""
+    calls = []
+    
+    def compute():
+        calls.append(None)
+        return {'calls': len(calls)}
+    
+    return compute
+
+def test_cached_result_is_reused_until_the_data_version_changes(app_context, user_id):
+    compute = counting_compute()
+    
+    assert analysis_cache.get_or_compute(user_id, 'test', {'months': 6}, compute) == {'calls': 1}
+    assert analysis_cache.get_or_compute(user_id, 'test', {'months': 6}, compute) == {'calls': 1}
+    
+    User.bump_data_version(user_id)
+    db.session.commit()
+    
+    assert analysis_cache.get_or_compute(user_id, 'test', {'months': 6}, compute) == {'calls': 2}
+
+def test_write_committed_by_another_worker_is_seen(app_context, user_id):
+    compute = counting_compute()
+    analysis_cache.get_or_compute(user_id, 'test', {}, compute)
+    
+    # Another worker's write only reaches this one through the database
+    with db.engine.begin() as connection:
+        connection.execute(
+            text('UPDATE users SET data_version = data_version + 1 WHERE id = :id'), {'id': user_id}
+        )
+    
+    assert analysis_cache.get_or_compute(user_id, 'test', {}, compute) == {'calls': 2}
+
+def test_parameters_are_cached_separately(app_context, user_id):
+    compute = counting_compute()
+    
+    analysis_cache.get_or_compute(user_id, 'test', {'months': 6}, compute)
+    assert analysis_cache.get_or_compute(user_id, 'test', {'months': 12}, compute) == {'calls': 2}
+
+def sqlite_app(tmp_path, cache_path):
+    """Bare app whose instance directory is under tmp_path."""
+    app = Flask(__name__, instance_path=str(tmp_path / 'instance'))
+    app.config.update(ANALYSIS_CACHE_BACKEND='sqlite', ANALYSIS_CACHE_PATH=cache_path)
+    return app
+
+def test_sqlite_backend_lives_in_the_instance_directory(tmp_path):
+    cache = AnalysisCache()
+    cache.init_app(sqlite_app(tmp_path, 'analysis_cache.sqlite3'))
+    
+    assert cache.backend.path == os.path.realpath(tmp_path / 'instance' / 'analysis_cache.sqlite3')
+    assert stat.S_IMODE(os.stat(cache.backend.path).st_mode) == 0o600
+
+@pytest.mark.parametrize('cache_path', [None, '../outside.sqlite3', '/tmp/budget_tracker_cache.sqlite3'])
+def test_sqlite_backend_requires_a_path_inside_the_instance_directory(tmp_path, cache_path):
+    with pytest.raises(ValueError):
+        AnalysisCache().init_app(sqlite_app(tmp_path, cache_path))
+
+def test_sqlite_backend_stores_json_and_ignores_pickles(tmp_path):
+    backend = SqliteCacheBackend(str(tmp_path / 'cache.sqlite3'))
+    
+    backend.set('key', {'categories': [{'category': 'Food', 'total_amount': 12.5}]}, ttl=60)
+    assert backend.get('key') == {'categories': [{'category': 'Food', 'total_amount': 12.5}]}
+    
+    backend._connection().execute(
+        'UPDATE cache_entries SET value = ? WHERE key = ?', (pickle.dumps({'planted': True}), 'key')
+    )
+    assert backend.get('key') is None
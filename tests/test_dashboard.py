@@ -0,0 +1,32 @@
+from backend.models import db, Category
+from backend.services.analyzers.dashboard_summary import month_keys
+
+def test_summary_recommendations_come_from_the_rollup(app, client, auth_headers, user_id, account_id):
+    with app.app_context():
+        categories = {name: Category(name, user_id) for name in ('Rent', 'Food', 'Fun')}
+        db.session.add_all(categories.values())
+        db.session.commit()
+        category_ids = {name: category.id for name, category in categories.items()}
+    
+    first_month, _, current_month = month_keys(3)
+    spending = [
+        (first_month, 'Rent', 900), (first_month, 'Food', 100), (first_month, 'Fun', 30),
+        (current_month, 'Rent', 900), (current_month, 'Food', 200), (current_month, 'Fun', 30)
+    ]
+    for month, name, amount in spending:
+        response = client.post('/api/transactions', headers=auth_headers, json={
+            'amount': -amount,
+            'account_id': account_id,
+            'transaction_date': f'{month}-01',
+            'category_id': category_ids[name],
+            'description': f'{name} {month}'
+        })
+        assert response.status_code == 201
+    
+    summary = client.get('/api/dashboard/summary', headers=auth_headers).get_json()
+    
+    assert [(row['type'], row['category']) for row in summary['recommendations']] == [
+        ('high_spending', 'Rent'), ('increasing_trend', 'Food')
+    ]
+    assert summary['recommendations'][0]['message'] == "Your spending on Rent is 83.33% of your total expenses."
+    assert summary['recommendations'][1]['message'] == "Your spending on Food has increased by 100.0% over the past 3 months."
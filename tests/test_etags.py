@@ -0,0 +1,50 @@
+from sqlalchemy import text
+from backend.models import db, Account, User
+from backend.services.cache.analysis_cache import analysis_cache
+
+SUMMARY = '/api/dashboard/summary'
+
+def add_account_elsewhere(app, user_id, name):
+    """Commit an account the way another worker would, without touching this process's cache."""
+    with app.app_context():
+        db.session.add(Account(name, 'checking', user_id, balance=100.0))
+        User.bump_data_version(user_id)
+        db.session.commit()
+
+def test_unchanged_data_is_not_modified(client, auth_headers):
+    first = client.get(SUMMARY, headers=auth_headers)
+    assert first.status_code == 200
+    
+    repeat = client.get(SUMMARY, headers={**auth_headers, 'If-None-Match': first.headers['ETag']})
+    assert repeat.status_code == 304
+    assert repeat.headers['ETag'] == first.headers['ETag']
+
+def test_write_on_another_worker_changes_etag_and_body(app, client, auth_headers, user_id):
+    first = client.get(SUMMARY, headers=auth_headers)
+    assert first.get_json()['accounts'] == []
+    
+    add_account_elsewhere(app, user_id, 'Checking')
+    
+    second = client.get(SUMMARY, headers={**auth_headers, 'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.headers['ETag'] != first.headers['ETag']
+    # The body under the new ETag is recomputed, not the entry cached for the old version
+    assert [account['name'] for account in second.get_json()['accounts']] == ['Checking']
+    
+    third = client.get(SUMMARY, headers={**auth_headers, 'If-None-Match': second.headers['ETag']})
+    assert third.status_code == 304
+
+def test_version_is_read_once_per_request(app, user_id):
+    with app.test_request_context():
+        version = analysis_cache.data_version(user_id)
+        
+        with db.engine.begin() as connection:
+            connection.execute(
+                text('UPDATE users SET data_version = data_version + 1 WHERE id = :id'), {'id': user_id}
+            )
+        
+        # The ETag and the cached body of one response must share a version
+        assert analysis_cache.data_version(user_id) == version
+    
+    with app.test_request_context():
+        assert analysis_cache.data_version(user_id) == version + 1
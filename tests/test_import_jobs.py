@@ -0,0 +1,32 @@
+import queue
+from backend.models import db, ImportJob
+from backend.services.jobs.import_jobs import fail_interrupted_jobs, parse_statement_file
+
+def write_statement(path, rows):
+    """Write a CSV statement in the generic format."""
+    lines = ['Date,Description,Amount'] + [f'01/{day + 1:02d}/2024,Coffee {day},-{day + 1}.50' for day in range(rows)]
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+def test_parse_reports_progress_per_batch_and_caps_the_preview(tmp_path):
+    file_path = write_statement(tmp_path / 'statement.csv', 5)
+    progress = queue.Queue()
+    
+    preview, total_rows, seconds = parse_statement_file(
+        file_path, 'csv', chunk_size=2, preview_rows=3, progress=progress
+    )
+    
+    assert total_rows == 5
+    assert [row['description'] for row in preview] == ['Coffee 0', 'Coffee 1', 'Coffee 2']
+    assert [progress.get_nowait() for _ in range(progress.qsize())] == [2, 4, 5]
+
+def test_unfinished_jobs_fail_on_startup(app_context, user_id):
+    jobs = {status: ImportJob('parse', user_id, status=status) for status in ['queued', 'running', 'completed']}
+    db.session.add_all(jobs.values())
+    db.session.commit()
+    
+    assert fail_interrupted_jobs() == 2
+    
+    db.session.expire_all()
+    assert [jobs[status].status for status in ['queued', 'running', 'completed']] == ['failed', 'failed', 'completed']
+    assert jobs['running'].error
@@ -0,0 +1,31 @@
+from backend.models import db, Category
+from backend.services.categorizers.merchant_rules import MerchantRuleCache
+
+def test_matcher_survives_transaction_writes_but_not_rule_changes(app, client, auth_headers, user_id, account_id):
+    with app.app_context():
+        category = Category('Coffee', user_id)
+        db.session.add(category)
+        db.session.commit()
+        category_id = category.id
+    
+    response = client.post('/api/category-rules', headers=auth_headers, json={'pattern': 'starbucks', 'category_id': category_id})
+    assert response.status_code == 201
+    rule_id = response.get_json()['id']
+    
+    cache = MerchantRuleCache()
+    with app.app_context():
+        matcher = cache.get_matcher(user_id)
+        assert matcher is not None
+    
+    response = client.post('/api/transactions', headers=auth_headers, json={
+        'amount': -4.5, 'account_id': account_id, 'transaction_date': '2024-03-01', 'description': 'Starbucks'
+    })
+    assert response.status_code == 201
+    
+    with app.app_context():
+        assert cache.get_matcher(user_id) is matcher
+    
+    assert client.delete(f'/api/category-rules/{rule_id}', headers=auth_headers).status_code == 200
+    
+    with app.app_context():
+        assert cache.get_matcher(user_id) is None
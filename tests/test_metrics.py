@@ -0,0 +1,32 @@
+import os
+import stat
+import pytest
+from flask import Flask
+from backend.services.monitoring.metrics import Metrics
+
+def metrics_app(directory):
+    """Bare app configured to merge metrics through directory."""
+    app = Flask(__name__)
+    app.config['METRICS_DIR'] = str(directory)
+    return app
+
+def test_metrics_directory_is_owner_only(tmp_path):
+    directory = tmp_path / 'metrics'
+    Metrics().init_app(metrics_app(directory))
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+    
+    # An existing directory others could write to is locked down
+    shared = tmp_path / 'shared'
+    shared.mkdir()
+    shared.chmod(0o777)
+    Metrics().init_app(metrics_app(shared))
+    assert stat.S_IMODE(os.stat(shared).st_mode) == 0o700
+
+@pytest.mark.skipif(os.geteuid() != 0, reason="needs root to give the directory away")
+def test_metrics_directory_owned_by_another_user_is_refused(tmp_path):
+    directory = tmp_path / 'metrics'
+    directory.mkdir()
+    os.chown(directory, 65534, 65534)
+    
+    with pytest.raises(ValueError):
+        Metrics().init_app(metrics_app(directory))
@@ -0,0 +1,37 @@
+import threading
+import time
+import pytest
+from backend.services.auth.password_hasher import PasswordHasher, HashingBusy
+
+def test_default_limits_leave_request_threads_free(app):
+    limit = app.config['PASSWORD_HASH_WORKERS'] + app.config['PASSWORD_HASH_QUEUE_SIZE']
+    assert limit <= 8 // 2
+
+def test_hashes_beyond_the_limit_are_turned_away(app):
+    hasher = PasswordHasher()
+    hasher.init_app(app)
+    limit = hasher.max_workers + hasher.max_queue
+    
+    release = threading.Event()
+    threads = [threading.Thread(target=hasher._run, args=(release.wait,)) for _ in range(limit)]
+    for thread in threads:
+        thread.start()
+    
+    try:
+        while hasher.stats()['in_flight'] < limit:
+            time.sleep(0.001)
+        with pytest.raises(HashingBusy):
+            hasher._run(release.wait)
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join()
+    
+    assert hasher.stats()['rejected'] == 1
+
+def test_needs_rehash_compares_against_the_configured_method(app):
+    hasher = PasswordHasher()
+    hasher.init_app(app)
+    
+    assert not hasher.needs_rehash(hasher.hash('secret'))
+    assert hasher.needs_rehash('pbkdf2:sha256:2000$salt$hash')
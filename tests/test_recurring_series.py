@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+from backend.models import RecurringSeries, Transaction
+from backend.services.recommendations.budget_recommendations import BudgetRecommendationService
+
+def post_charges(client, auth_headers, account_id, description, amount, dates, **fields):
+    """Create one expense per date through the API."""
+    for date in dates:
+        response = client.post('/api/transactions', headers=auth_headers, json={
+            'amount': -amount,
+            'account_id': account_id,
+            'transaction_date': date.strftime('%Y-%m-%d'),
+            'description': description,
+            **fields
+        })
+        assert response.status_code == 201
+
+def test_series_refresh_leaves_user_recurrence_fields_alone(app, client, auth_headers, account_id, user_id):
+    start = datetime.now() - timedelta(days=100)
+    post_charges(client, auth_headers, account_id, 'Streaming Service', 12.99,
+                 [start + timedelta(days=30 * i) for i in range(2)])
+    post_charges(client, auth_headers, account_id, 'Streaming Service', 12.99,
+                 [start + timedelta(days=60)], is_recurring=True, recurrence_pattern='quarterly')
+    
+    with app.app_context():
+        flags = {
+            (transaction.is_recurring, transaction.recurrence_pattern)
+            for transaction in Transaction.query.filter_by(description='Streaming Service')
+        }
+        assert flags == {(False, None), (True, 'quarterly')}
+        
+        patterns = BudgetRecommendationService(user_id)._identify_recurring_patterns()
+        assert [(pattern['frequency'], pattern['instances']) for pattern in patterns] == [('monthly', 3)]
+
+def test_recurring_statistics_only_cover_the_window(app, client, auth_headers, account_id, user_id):
+    now = datetime.now()
+    # A year-old run at a different price, which would fail the amount tolerance over the whole history
+    post_charges(client, auth_headers, account_id, 'Gym Membership', 50.0,
+                 [now - timedelta(days=400 - 30 * i) for i in range(3)])
+    post_charges(client, auth_headers, account_id, 'Gym Membership', 20.0,
+                 [now - timedelta(days=90 - 30 * i) for i in range(3)])
+    
+    with app.app_context():
+        series = RecurringSeries.query.filter_by(user_id=user_id).one()
+        assert (series.transaction_count, series.mean_amount, series.is_recurring) == (3, 20.0, True)
+        
+        patterns = BudgetRecommendationService(user_id)._identify_recurring_patterns()
+        assert len(patterns) == 1
+        assert patterns[0]['amount'] == 20.0
+        assert patterns[0]['instances'] == 3
+        assert patterns[0]['frequency'] == 'monthly'
+        assert patterns[0]['annual_cost'] == 240.0
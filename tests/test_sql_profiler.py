@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from backend.app import create_app
+from backend.models import db
+
+@pytest.fixture
+def profiled_app(tmp_path):
+    """App with SQL profiling on."""
+    return create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'ANALYSIS_CACHE_BACKEND': 'none',
+        'SQL_PROFILING': True,
+        'LOG_FILE': None,
+        'LOG_LEVEL': 'WARNING'
+    })
+
+def test_failed_statement_does_not_leave_its_start_time_behind(profiled_app):
+    with profiled_app.app_context():
+        connection = db.session.connection()
+        with pytest.raises(OperationalError):
+            connection.execute(text('SELECT * FROM missing_table'))
+        
+        assert not connection.info.get('sql_profiler_started_at')
+        
+        db.session.rollback()
+        connection = db.session.connection()
+        connection.execute(text('SELECT 1'))
+        assert not connection.info.get('sql_profiler_started_at')
@@ -0,0 +1,26 @@
+import datetime
+import jwt
+import pytest
+from werkzeug.exceptions import Unauthorized
+from backend.services.cache.token_cache import JWT_ALGORITHM, token_cache
+
+def test_logout_revokes_the_token_for_every_worker(app, client, auth_headers, user_id):
+    assert client.get('/api/auth/profile', headers=auth_headers).status_code == 200
+    assert client.post('/api/auth/logout', headers=auth_headers).status_code == 200
+    
+    # Another worker has the token cached as verified but must still reject it
+    token = auth_headers['Authorization'].split()[1]
+    token_cache.clear()
+    token_cache._store(token_cache._key(token), user_id, 2 ** 31)
+    
+    with app.app_context(), pytest.raises(Unauthorized):
+        token_cache.verify(token)
+
+def test_token_without_expiry_is_verified_but_not_cached(app, user_id):
+    token = jwt.encode({'sub': user_id, 'iat': datetime.datetime.utcnow()}, token_cache.secret_key, algorithm=JWT_ALGORITHM)
+    
+    with app.app_context():
+        assert token_cache.verify(token) == user_id
+        assert token_cache.verify(token) == user_id
+    
+    assert token_cache.stats()['size'] == 0
@@ -0,0 +1,118 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from backend.models import db, Account, Category, Transaction
+from backend.services.importers.transaction_importer import bulk_import_transactions
+
+@contextmanager
+def count_statements(app):
+    """Count the SQL statements executed inside the block."""
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+def add_transactions(app, user_id, account_id, count):
+    """Add transactions spread over several categories, every third one a transfer to savings."""
+    with app.app_context():
+        savings = Account('Savings', 'savings', user_id)
+        categories = [Category(f'Category {i}', user_id) for i in range(5)]
+        db.session.add_all([savings, *categories])
+        db.session.flush()
+        
+        db.session.add_all([
+            Transaction(
+                amount=-10.0 - i,
+                account_id=account_id,
+                transaction_date=datetime(2024, 1, 1) + timedelta(days=i),
+                category_id=categories[i % len(categories)].id,
+                description=f'Payment {i}',
+                transfer_account_id=savings.id if i % 3 == 0 else None
+            )
+            for i in range(count)
+        ])
+        db.session.commit()
+
+def test_transaction_list_query_count_does_not_grow_with_the_page(app, client, auth_headers, user_id, account_id):
+    add_transactions(app, user_id, account_id, 60)
+    # Warm the token cache so both requests do the same authentication work
+    client.get('/api/transactions', headers=auth_headers, query_string={'limit': 1})
+    
+    counts = {}
+    for limit in (5, 50):
+        with count_statements(app) as statements:
+            response = client.get('/api/transactions', headers=auth_headers, query_string={'limit': limit})
+        
+        page = response.get_json()['transactions']
+        assert len(page) == limit
+        assert {row['category_name'] for row in page} >= {f'Category {i}' for i in range(5)}
+        assert any(row['transfer_account_name'] == 'Savings' for row in page)
+        counts[limit] = len(statements)
+    
+    assert counts[5] == counts[50]
+    # Revoked-token check, data version for the ETag and the page itself
+    assert counts[50] <= 3
+
+def create(client, auth_headers, account_id, **fields):
+    """Create a transaction through the API and return its ID."""
+    response = client.post('/api/transactions', headers=auth_headers, json={
+        'account_id': account_id,
+        'amount': -4.5,
+        'transaction_date': '2024-03-01',
+        'description': 'Corner Coffee',
+        **fields
+    })
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['id']
+
+def test_created_transactions_are_fingerprinted_like_imports(app, client, auth_headers, user_id, account_id):
+    first = create(client, auth_headers, account_id)
+    second = create(client, auth_headers, account_id)
+    
+    with app.app_context():
+        fingerprints = {db.session.get(Transaction, transaction_id).fingerprint for transaction_id in (first, second)}
+        assert None not in fingerprints and len(fingerprints) == 2
+        
+        # The same two charges arriving in a statement are recognized as duplicates
+        result = bulk_import_transactions(user_id, account_id, [
+            {'date': '2024-03-01', 'amount': -4.5, 'description': 'corner  coffee'},
+            {'date': '2024-03-01', 'amount': -4.5, 'description': 'Corner Coffee'}
+        ], {})
+        assert result['imported_count'] == 0
+        assert result['duplicate_count'] == 2
+
+def test_edited_transactions_get_a_new_fingerprint(app, client, auth_headers, user_id, account_id):
+    transaction_id = create(client, auth_headers, account_id)
+    response = client.put(f'/api/transactions/{transaction_id}', headers=auth_headers, json={'amount': -5.25})
+    assert response.status_code == 200
+    
+    with app.app_context():
+        # The original charge is no longer stored, so importing it adds it
+        result = bulk_import_transactions(user_id, account_id, [
+            {'date': '2024-03-01', 'amount': -4.5, 'description': 'Corner Coffee'},
+            {'date': '2024-03-01', 'amount': -5.25, 'description': 'Corner Coffee'}
+        ], {})
+        assert (result['imported_count'], result['duplicate_count']) == (1, 1)
+    
+    # A notes-only edit keeps the fingerprint
+    with app.app_context():
+        fingerprint = db.session.get(Transaction, transaction_id).fingerprint
+    client.put(f'/api/transactions/{transaction_id}', headers=auth_headers, json={'notes': 'Team coffee'})
+    with app.app_context():
+        assert db.session.get(Transaction, transaction_id).fingerprint == fingerprint
+
+def test_rows_with_bad_amounts_are_skipped(app_context, user_id, account_id):
+    result = bulk_import_transactions(user_id, account_id, [
+        {'date': '2024-03-01', 'amount': 'n/a', 'description': 'Bad'},
+        {'date': '2024-03-02', 'amount': None, 'description': 'Missing'},
+        {'date': '2024-03-03', 'amount': '-12.00', 'description': 'Good'}
+    ], {})
+    assert (result['imported_count'], result['skipped_count']) == (1, 2)